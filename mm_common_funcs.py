@@ -8,7 +8,23 @@ Date:    March 25, 2021
 """
 
 # Import required modules
+from datetime import datetime
 from getpass import getpass
+import os
+import re
+import time
+from ruckus_inventory import Inventory
+from ruckus_journal import Journal, load_done
+from ruckus_planner import format_plan, plan_requests, probe_latency
+from ruckus_records import Zone
+from ruckus_selector import ZoneSelector, load_groups
+
+
+# Group rules of the site (see ruckus_selector.py); DEFAULT_GROUPS if the file is missing
+ZONE_GROUPS_FILE = 'zone_groups.json'
+
+# Compiled selectors of the zone lists seen by group_zones, reused across calls
+_selectors = {}
 
 
 # Get Credentials
@@ -28,58 +44,253 @@ def get_credentials():
     return username, password
 
 
+# Get Controller IPs
+def get_controller_ips():
+    """
+    Get one or more controller IPs (comma separated)
+
+    Parameters:
+
+    Returns:
+    controller_ips - list of strings
+    """
+    controller_ips = input('\nPlease enter the Controller IP(s) (ONLY IP addresses, comma '
+                           'separated for several controllers): ')
+
+    return [controller_ip.strip() for controller_ip in controller_ips.split(',')
+            if controller_ip.strip()]
+
+
+# Get all zones, from the local inventory when it is recent enough
+def get_all_zones(apr, db_path='ruckus_inventory.db', max_age=86400):
+    """
+    Get all zones of the controller. If the local inventory (see
+    mm_ruckus_inventory_sync.py) was synced within max_age seconds, the
+    zones are read from it instead of the controller.
+
+    Parameters:
+    apr - Ruckus object
+    db_path - path of the inventory database
+    max_age - maximum age of the inventory in seconds
+
+    Returns:
+    all_zones - list of Zone records (see ruckus_records.py); zone['name'] and
+                zone.get('id') work as on the dicts of get_zones()['list']
+    """
+
+    if os.path.exists(db_path):
+        inventory = Inventory(db_path)
+        try:
+            synced_at = inventory.last_sync(apr.controller_ip)
+            if synced_at and time.time() - synced_at < max_age:
+                print(f'\nUsing zones from the local inventory {db_path}')
+                return list(Zone.parse_list(inventory.zones(apr.controller_ip)))
+        finally:
+            inventory.close()
+
+    # The zones are kept for the whole session -- as compact records
+    return list(Zone.parse_list(apr.get_zones()['list']))
+
+
+# Write the request metrics of the run to JSON and Prometheus files
+def export_metrics(apr, name):
+    """
+    Write the per-endpoint request metrics of a Ruckus object to
+    <name>_metrics_<controller>_<time>.json and .prom
+
+    Parameters:
+    apr - Ruckus object
+    name - prefix for the file names
+
+    Returns:
+    """
+
+    modified_time = datetime.now().isoformat(timespec='seconds').replace(':', '')
+    controller = re.sub(r'[^\w.-]+', '_', apr.controller_ip)
+    filename = f'{name}_metrics_{controller}_{modified_time}'
+    apr.metrics.export_json(f'{filename}.json')
+    apr.metrics.export_prometheus(f'{filename}.prom')
+
+    print(f'\nRequest metrics are written to {filename}.json and {filename}.prom')
+
+
+# Open the checkpoint journal of a bulk run
+def open_journal(name, resume=None):
+    """
+    Open a new checkpoint journal, or the journal of an earlier run to resume it
+
+    Parameters:
+    name - start of the journal file name (e.g. 'ise_transit')
+    resume - journal file of the earlier run (None for a new run)
+
+    Returns:
+    journal - Journal
+    done - dict of (controller, zone_id) -> journal line, for the zones already
+           done in the earlier run (see skip_done)
+    """
+
+    done = {}
+    if resume:
+        done = load_done(resume)
+        filename = resume
+        print(f'\n{len(done)} zones are already done in {resume}. The ones done with '
+              f'the same settings will be skipped')
+    else:
+        modified_time = datetime.now().isoformat(timespec='seconds').replace(':', '')
+        filename = f'{name}_{modified_time}.jsonl'
+
+    return Journal(filename), done
+
+
+# Leave out the zones which are already done
+def skip_done(zones, done, **settings):
+    """
+    Remove the zones already done in an earlier run with the same settings. A
+    zone done with other settings (e.g. F5 instead of NPS, another SSID) is
+    changed again.
+
+    Parameters:
+    zones - dict of controller IP -> list of zones
+    done - dict of (controller, zone_id) -> journal line (from open_journal)
+    settings - settings of this run, as written to the journal (e.g.
+               auth_service_name='NPS-Radius-Proxy', ssid='SFUSD')
+
+    Returns:
+    zones - dict of controller IP -> list of zones still to do
+    """
+
+    if not done:
+        return zones
+
+    def same_settings(entry):
+        return all(entry.get(name) == value for name, value in settings.items())
+
+    remaining = {}
+    for controller_ip, controller_zones in zones.items():
+        remaining[controller_ip] = []
+        redo = 0
+        for site in controller_zones:
+            entry = done.get((controller_ip, site['id']))
+            if entry is None:
+                remaining[controller_ip].append(site)
+            elif not same_settings(entry):
+                remaining[controller_ip].append(site)
+                redo += 1
+        skipped = len(controller_zones) - len(remaining[controller_ip])
+        if skipped:
+            print(f'Skipping {skipped} zones of {controller_ip} already done')
+        if redo:
+            print(f'{redo} zones of {controller_ip} were done with other settings '
+                  f'and will be changed again')
+
+    return remaining
+
+
+# Dry run of a bulk run
+def print_plan(pool, zones, workflow, **options):
+    """
+    Print the requests a workflow would send to each controller and how long it
+    would take, without changing anything
+
+    Parameters:
+    pool - ControllerPool
+    zones - dict of controller IP -> list of zones
+    workflow - channelfly, auth or ap_login (see ruckus_planner.py)
+    options - options of the workflow (e.g. channel, ssid)
+
+    Returns:
+    """
+
+    def plan_controller(apr):
+        controller_zones = zones[apr.controller_ip]
+        plan = plan_requests(apr, workflow, controller_zones, **options)
+        return format_plan(plan, probe_latency(apr, controller_zones), apr.max_workers)
+
+    for report in pool.run(plan_controller):
+        print(f"\n=========== PLAN for {report['controller']} (nothing is changed) ===========")
+        print(report['result'] if report['error'] is None else f"FAILED! {report['error']}")
+
+
+# Write the header of one controller's section in the output file
+def write_controller_header(out_file, report):
+    """
+    Write which controller the following results belong to
+
+    Parameters:
+    out_file - output file
+    report - report of one controller (from ControllerPool.run)
+
+    Returns:
+    """
+    out_file.write(f"\n=========== Controller {report['controller']} ===========\n")
+    if report['error'] is not None:
+        out_file.write(f"FAILED! {report['error']}\n")
+
+
+# Write how long each controller took, at the end of the output file
+def write_controller_summary(out_file, reports):
+    """
+    Write the number of zones and the time taken per controller
+
+    Parameters:
+    out_file - output file
+    reports - reports of all controllers (from ControllerPool.run); the result
+              of each is a list of (site, result)
+
+    Returns:
+    """
+    out_file.write("\n--------------------------------------------------------\n")
+    out_file.write("{0:30} {1:>7} {2:>10}".format("CONTROLLER", "ZONES", "SECONDS"))
+    out_file.write("\n--------------------------------------------------------\n")
+    for report in reports:
+        zones = 'FAILED' if report['error'] is not None else len(report['result'])
+        out_file.write("{0:30} {1:>7} {2:>10.1f}\n".format(
+            report['controller'], zones, report['seconds']))
+
+
 # Group all zones to either CDC(EES), ES, MS, HS, Office, and/or Test Zones
+def get_zone_selector(all_zones):
+    """
+    Get the compiled ZoneSelector of a zone list (compiled on the first call only)
+
+    Parameters:
+    all_zones - all zones in the controller
+
+    Returns:
+    selector - ZoneSelector
+    """
+
+    # Keyed by the list itself, so a new zone list (e.g. another controller) gets
+    #   its own selector. The list is kept, so its id is not reused.
+    zone_list, selector = _selectors.get(id(all_zones), (None, None))
+    if zone_list is not all_zones or len(selector.zones) != len(all_zones):
+        groups = load_groups(ZONE_GROUPS_FILE) if os.path.exists(ZONE_GROUPS_FILE) else None
+        selector = ZoneSelector(all_zones, groups)
+        _selectors[id(all_zones)] = (all_zones, selector)
+
+    return selector
+
+
 def group_zones(all_zones, zone_grp):
     """
     Used to group zones in to different zone groups
 
     Parameters:
     all_zones - all zones in the controller
-    zone_grp - user choice of a zone group
+    zone_grp - user choice of a zone group; several groups can be separated by
+               commas and a group can be left out with '!' (e.g. "ES,MS" or
+               "ALL,!OFC")
 
     Returns:
-    zones - list of zones of one zone group
-    """
-
-    # Create empty lists for CDC(EES), ES, MS, HS, Office, and Test Zones
-    zones_cdc = []
-    zones_es = []
-    zones_ms = []
-    zones_hs = []
-    zones_office = []
-    zones_test = []
-
-    # Splitting all zones in to different group of zones
-    for site in all_zones:
-        zone_name = site['name']
-        if zone_name.startswith('CDC-'):
-            zones_cdc.append(site)
-        if zone_name.startswith('ES-'):
-            zones_es.append(site)
-        elif zone_name.startswith('MS-'):
-            zones_ms.append(site)
-        elif zone_name.startswith('HS-'):
-            zones_hs.append(site)
-        elif zone_name.startswith('OFC-'):
-            zones_office.append(site)
-        elif zone_name.startswith('00'):
-            zones_test.append(site)
+    zones - list of zones of the zone group(s)
+    """
 
-    # Use zone_grp provided to return zones of user choice
-    if zone_grp.upper() == 'CDC':
-        zones = zones_cdc
-    elif zone_grp.upper() == 'ES':
-        zones = zones_es
-    elif zone_grp.upper() == 'MS':
-        zones = zones_ms
-    elif zone_grp.upper() == 'HS':
-        zones = zones_hs
-    elif zone_grp.upper() == 'OFC':
-        zones = zones_office
-    elif zone_grp.upper() == 'TEST':
-        zones = zones_test
-    else:
-        zones = all_zones
+    selector = get_zone_selector(all_zones)
 
-    # Return zones
-    return zones
+    # Use zone_grp provided to return zones of user choice
+    try:
+        return selector.select(zone_grp)
+    except KeyError as err:
+        # Unknown group -- all zones, as before
+        print(f"{err.args[0]}. Working on ALL zones!")
+        return all_zones
@@ -8,28 +8,48 @@ Date:    March 22, 2021
 """
 
 # Import required modules
+import argparse
 from datetime import datetime
-from ruckus import Ruckus
-from mm_common_funcs import get_credentials, group_zones
+from ruckus_journal import fingerprint
+from ruckus_pool import ControllerPool
+from mm_common_funcs import export_metrics, get_controller_ips, get_credentials, \
+    get_all_zones, group_zones, open_journal, print_plan, skip_done, write_controller_header, \
+    write_controller_summary
 
 
 def main():
     """
     This will be the main function
     """
+    parser = argparse.ArgumentParser(description='Change the AP Login password per zone')
+    parser.add_argument('--resume', metavar='JOURNAL',
+                        help='journal (aplogin_modified_*.jsonl) of a run to finish; '
+                             'the zones already done are skipped')
+    parser.add_argument('--plan', action='store_true',
+                        help='only list the requests and estimate the time (no change)')
+    args = parser.parse_args()
+
     print('\n******* This script will change the AP Login password per zone ********\n\n')
 
     # Get username and password
     username, password = get_credentials()
 
-    # Request controller_ip and controller_port
-    controller_ip = input('\nPlease enter the Controller IP (ONLY IP address): ')
+    # Request the controller IPs (the same change is made on every controller)
+    controller_ips = get_controller_ips()
+
+    # Log in to all controllers at the same time (reusing the sessions of an
+    #   earlier run if still valid)
+    pool = ControllerPool(controller_ips, username, password, session_cache=True)
 
-    # Create a Ruckus object
-    apr = Ruckus(controller_ip, username, password)
+    # Get all zones on each controller and their info (local inventory if recently synced)
+    all_zones = {report['controller']: report['result'] or []
+                 for report in pool.run(get_all_zones)}
 
-    # Get all zones on the controller and their info
-    all_zones = apr.get_zones()['list']
+    # Every finished zone is written to the journal, so a crashed run can be resumed
+    if args.plan:
+        journal, done = None, {}
+    else:
+        journal, done = open_journal('aplogin_modified', args.resume)
 
     # Create a while loop to allow to continue working on more zone groups
     #  create a variable named 'proceed' to ask the user whether to proceed
@@ -40,15 +60,15 @@ def main():
         print('\n You can work on one group of zones at a time (to be safe). Please select \n  \
 "CDC" for CDCs (Early Education Schools),\n  "ES" for Elementary School Zones,\n  \
 "MS" for Middle School Zones,\n  "HS" for High School Zones,\n  "OFC" for Office Zones,\n  \
-"Test" for Test Zones,\n  "ALL" to work on all zones\n')
+"Test" for Test Zones,\n  "ALL" to work on all zones,\n  \
+"ES,MS" for several groups, "ALL,!OFC" to leave a group out\n')
 
         zone_grp = input('Please select which zones to modify [ CDC | ES | MS | HS | OFC | Test | \
 ALL ]: ') or 'Test'
 
-        # Call group_zones function to get zones to modify
-        zones = group_zones(all_zones, zone_grp)
-        # Print the list of zones to modify
-        print(f'\n\nThe list of zones to modify:- \n\n\n {zones}')
+        # Call group_zones function to get zones to modify on each controller
+        zones = {controller_ip: group_zones(controller_zones, zone_grp)
+                 for controller_ip, controller_zones in all_zones.items()}
 
         # Create a filename by using modified current time
         #   Get current time and modify it by replacing ":" with ""
@@ -60,23 +80,69 @@ ALL ]: ') or 'Test'
         ap_password = input('\n\nPlease enter the new password for the APs. \
             Check with Ruckus documentation on password requirements: ')
         aplogin = {'apLoginName':'admin', 'apLoginPassword':ap_password}
+        # The journal keeps a fingerprint of the password, never the password
+        ap_login = fingerprint(ap_password)
 
-        # Open the file to write the resulting output
-        with open(filename, 'w+') as out_file:
-            # Work on each site or zone
-            for site in zones:
-                # Call the function to change APs login password
-                response = apr.update_ap_login(site['id'], aplogin)
-                # If the change is successful
+        # Leave out the zones already done with the same password (--resume)
+        zones = skip_done(zones, done, ap_login=ap_login)
+        # Print the list of zones to modify
+        for controller_ip, controller_zones in zones.items():
+            print(f'\n\nThe list of zones to modify on {controller_ip}:- \n\n\n {controller_zones}')
+
+        # Dry run: list the requests and estimate the time, without changing anything
+        if args.plan:
+            print_plan(pool, zones, 'ap_login')
+            print('\nIf you want to plan more zone groups, press ANY KEY! Otherwise, press ENTER! ')
+            proceed = bool(input(' ') or None)
+            continue
+
+        def modify_controller(apr):
+            # Write each zone to the journal as soon as it finishes (204 is a success)
+            def checkpoint(site, response):
                 if response == 204:
-                    out_file.write(f"{site['name']} ---- AP Login is SUCCESSFULLY CHANGED!\n\n")
+                    journal.record(apr.controller_ip, site, 'done', ap_login=ap_login)
                 else:
-                    out_file.write(f"{site['name']} ---- Username/password change FAILED!\n\n")
+                    journal.record(apr.controller_ip, site, 'failed', response=response,
+                                   ap_login=ap_login)
+
+            return apr.run_zones(zones[apr.controller_ip],
+                                 lambda site: apr.update_ap_login(site['id'], aplogin),
+                                 on_result=checkpoint)
+
+        # Call the function to change APs login password on the zones in parallel, on all
+        #   controllers in parallel. The reports come back in controller order.
+        reports = pool.run(modify_controller)
+
+        # Open the file to write the resulting output
+        with open(filename, 'w+') as out_file:
+            for report in reports:
+                write_controller_header(out_file, report)
+                # Nothing more to write for a controller which failed
+                if report['error'] is not None:
+                    continue
+                # Write the result of each site or zone, in zone order
+                for site, response in report['result']:
+                    # If the change is successful
+                    if response == 204:
+                        out_file.write(f"{site['name']} ---- AP Login is SUCCESSFULLY CHANGED!\n\n")
+                    else:
+                        out_file.write(f"{site['name']} ---- Username/password change FAILED!\n\n")
+            # How long each controller took
+            write_controller_summary(out_file, reports)
 
 
         print('\nIf you want to work on more zone groups, press any key! Otherwise, press Enter! ')
         proceed = bool(input(' ') or None)
 
+    if journal is not None:
+        journal.close()
+        print(f'\nEvery zone is checkpointed in {journal.filename}. To finish a run which '
+              f'stopped, run this script with --resume {journal.filename}')
+
+    # Write how many requests went to each endpoint and how long they took
+    for apr in pool.clients.values():
+        export_metrics(apr, 'aplogin_modified')
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: To reboot the APs of a zone (or AP group) in waves
+Version: 1.0
+Date:    October 18, 2026
+"""
+
+# Import required modules
+from datetime import datetime
+from ruckus import Ruckus
+from ruckus_reboot import rolling_reboot, split_waves
+from mm_common_funcs import get_credentials
+
+
+def reboot_zone(apr):
+    """
+    Ask for the zone (and AP group), reboot its APs in waves and write the report
+
+    Parameters:
+    apr - Ruckus object
+    """
+
+    # Select the zone (and optionally the AP group) to reboot
+    zone = input('\nPlease enter the zone name: ')
+    zone_id = apr.get_zone_id(zone)
+    if zone_id is None:
+        return
+    apgroup = input('Please enter the AP group name (ENTER for all APs of the zone): ')
+
+    # Compact AP records -- only MAC and AP group are needed here
+    ap_list = apr.ap_records(zone_id)
+    if apgroup:
+        apgroup_ids = {group.id for group in apr.apgroup_records(zone_id)
+                       if group.name == apgroup}
+        ap_list = (ap for ap in ap_list if ap.apgroup_id in apgroup_ids)
+    ap_macs = [ap.mac for ap in ap_list]
+
+    print(f'\n{len(ap_macs)} APs will be rebooted')
+    wave_percent = float(input('Percent of the APs to reboot in each wave: [10] ') or 10)
+    timeout = int(input('Minutes to wait for each wave to come back: [15] ') or 15) * 60
+
+    if input('\nType YES to start the reboot: ') != 'YES':
+        return
+
+    report = rolling_reboot(apr, ap_macs, wave_percent=wave_percent, timeout=timeout)
+
+    # Create a filename by using modified current time
+    #   Get current time and modify it by replacing ":" with ""
+    modified_time = datetime.now().isoformat(timespec='seconds').replace(':', '')
+    filename = f'ap_reboot_{zone}_{modified_time}.txt'
+
+    # Write the per-wave report
+    with open(filename, 'w+') as out_file:
+        out_file.write("\n--------------------------------------------------------------------\n")
+        out_file.write("{0:>5} {1:>5} {2:>7} {3:>9} {4:>8} {5:>12} {6:>12}".format(
+            "WAVE", "APS", "FAILED", "NOT DOWN", "OFFLINE", "REBOOT SEC", "TOTAL SEC"))
+        out_file.write("\n--------------------------------------------------------------------\n")
+        for wave in report:
+            out_file.write("{0:>5} {1:>5} {2:>7} {3:>9} {4:>8} {5:>12} {6:>12}\n".format(
+                wave['wave'], wave['aps'], len(wave['failed']), len(wave['not_down']),
+                len(wave['offline']), wave['reboot_seconds'], wave['total_seconds']))
+            for ap_mac in wave['failed']:
+                out_file.write(f"      {ap_mac} ---- REBOOT FAILED!\n")
+            for ap_mac in wave['not_down']:
+                out_file.write(f"      {ap_mac} ---- DID NOT GO DOWN!\n")
+            for ap_mac in wave['offline']:
+                out_file.write(f"      {ap_mac} ---- DID NOT COME BACK ONLINE!\n")
+
+        # Totals of the waves which ran
+        out_file.write("\n{0:>5} {1:>5} {2:>7} {3:>9} {4:>8}\n".format(
+            "TOTAL", sum(wave['aps'] for wave in report),
+            sum(len(wave['failed']) for wave in report),
+            sum(len(wave['not_down']) for wave in report),
+            sum(len(wave['offline']) for wave in report)))
+        if len(report) < len(split_waves(ap_macs, wave_percent)):
+            out_file.write(f"\nStopped after wave {len(report)} -- the remaining APs "
+                           f"were not rebooted\n")
+
+    print(f'\nThe report is written to {filename}')
+
+
+def main():
+    """
+    This will be the main function
+    """
+    print('\n******* This script will reboot the APs of a zone in waves ********\n\n')
+
+    # Get username and password
+    username, password = get_credentials()
+
+    # Request controller_ip
+    controller_ip = input('\nPlease enter the Controller IP (ONLY IP address): ')
+
+    # Create a Ruckus object
+    apr = Ruckus(controller_ip, username, password)
+
+    # Log out on every way out of the script
+    try:
+        reboot_zone(apr)
+    finally:
+        apr.log_out()
+
+if __name__ == "__main__":
+
+    main()
+
+    input('\nPress any key to exit!')
@@ -8,25 +8,80 @@ Date:    March 25, 2021
 """
 
 # Import required modules
+import argparse
 from datetime import datetime
-from ruckus import Ruckus
-from mm_common_funcs import get_credentials, group_zones
+from ruckus_pool import ControllerPool
+from mm_common_funcs import export_metrics, get_controller_ips, get_credentials, \
+    get_all_zones, group_zones, open_journal, print_plan, skip_done, write_controller_header, \
+    write_controller_summary
+
+
+def modify_zone_auth(site, apr, auth_service_name, ssid='SFUSD'):
+    """
+    Change the Authentication Profile of an SSID for one zone
+
+    Parameters:
+    site - zone info (from get_zones)
+    apr - Ruckus object
+    auth_service_name - name of the authentication service profile
+    ssid - SSID name
+
+    Returns:
+    output - string to write to the output file
+    """
+    # Get WLAN ID for the zone (from the WLAN index)
+    wlan_id = apr.get_wlan_id(site['id'], ssid)
+    output = f"\n{site['name']} ... wlan_id = {wlan_id}"
+    # If wlan Id is '0', there is no such SSID. Escape the rest of the codes.
+    if wlan_id == '0':
+        return output
+    # Get the Authentication Profile for the site
+    auth_profile_name = apr.get_wlan_auth(site['id'], wlan_id)
+    output += f"\nBefore Change:- Auth_profile for *** {site['name']} *** is *** \
+                {auth_profile_name}"
+    # Modify the authentication profile for the SSID
+    apr.modify_wlan_auth(site['id'], wlan_id, auth_service_name)
+    # Get the Authentication Profile for the site
+    auth_profile_name = apr.get_wlan_auth(site['id'], wlan_id)
+    output += f"\nAfter Change:- Auth_profile for *** {site['name']} *** is *** \
+                    {auth_profile_name}\n"
+    # Only a zone which really has the new profile is done (see the journal)
+    if auth_profile_name != auth_service_name:
+        raise RuntimeError(f"Auth_profile is still {auth_profile_name}")
+
+    return output
 
 
 def main():
     """
     This will be the main function
     """
+    parser = argparse.ArgumentParser(description='Change the Authentication Profile of an SSID')
+    parser.add_argument('--resume', metavar='JOURNAL',
+                        help='journal (ise_transit_*.jsonl) of a run to finish; '
+                             'the zones already done are skipped')
+    parser.add_argument('--plan', action='store_true',
+                        help='only list the requests and estimate the time (no change)')
+    args = parser.parse_args()
+
     username, password = get_credentials()
 
-    # Request controller_ip
-    controller_ip = input('\nPlease enter the Controller IP (ONLY IP address): ')
+    # Request the controller IPs (the same change is made on every controller)
+    controller_ips = get_controller_ips()
 
-    # Create a Ruckus object
-    apr = Ruckus(controller_ip, username, password)
+    # Log in to all controllers at the same time (reusing the sessions of an
+    #   earlier run if still valid)
+    pool = ControllerPool(controller_ips, username, password, session_cache=True)
 
-    # Get all zones on the controller and their info
-    all_zones = apr.get_zones()['list']
+    # Get all zones on each controller and their info (local inventory if recently synced)
+    all_zones = {report['controller']: report['result'] or []
+                 for report in pool.run(get_all_zones)}
+
+    # Every finished zone is written to the journal, so a crashed run can be resumed
+    if args.plan:
+        journal, done = None, {}
+    else:
+        journal, done = open_journal('ise_transit', args.resume)
 
     # Create a while loop to allow to continue working on more zone groups
     #  create a variable named 'proceed' to ask the user whether to proceed
@@ -37,15 +92,15 @@ def main():
         print('\n You can work on one group of zones at a time (to be safe). Please select \n  \
 "CDC" for CDCs (Early Education Schools),\n  "ES" for Elementary School Zones,\n  \
 "MS" for Middle School Zones,\n  "HS" for High School Zones,\n  "OFC" for Office Zones,\n  \
-"Test" for Test Zones,\n  "ALL" to work on all zones\n')
+"Test" for Test Zones,\n  "ALL" to work on all zones,\n  \
+"ES,MS" for several groups, "ALL,!OFC" to leave a group out\n')
 
         zone_grp = input('Please select which zones to modify [ CDC | ES | MS | HS | OFC | Test | \
 ALL ]: ') or 'Test'
 
-        # Call group_zones function to get zones to modify
-        zones = group_zones(all_zones, zone_grp)
-        # Print the list of zones to modify
-        print(f'\n\nThe list of zones to modify:- \n\n\n {zones}')
+        # Call group_zones function to get zones to modify on each controller
+        zones = {controller_ip: group_zones(controller_zones, zone_grp)
+                 for controller_ip, controller_zones in all_zones.items()}
 
         # A loop to make sure the user selects either F5 or NPS
         while True:
@@ -67,36 +122,71 @@ ALL ]: ') or 'Test'
         #   Create a new output file
         filename = f'ise_transit_{zone_grp.upper()}_{modified_time}.txt'
 
+        # Select the SSID to change
+        ssid = input('\nPlease enter the SSID to change: [SFUSD] ') or 'SFUSD'
+
+        # Leave out the zones already done with the same profile and SSID (--resume)
+        zones = skip_done(zones, done, auth_service_name=auth_service_name, ssid=ssid)
+        # Print the list of zones to modify
+        for controller_ip, controller_zones in zones.items():
+            print(f'\n\nThe list of zones to modify on {controller_ip}:- \n\n\n {controller_zones}')
+
+        # Dry run: list the requests and estimate the time, without changing anything
+        if args.plan:
+            print_plan(pool, zones, 'auth', ssid=ssid)
+            print('\nIf you want to plan more zone groups, press ANY KEY! Otherwise, press ENTER! ')
+            proceed = bool(input(' ') or None)
+            continue
+
+        def modify_controller(apr):
+            controller_zones = zones[apr.controller_ip]
+
+            # Write each zone to the journal as soon as it finishes
+            def checkpoint(site, result):
+                if isinstance(result, Exception):
+                    journal.record(apr.controller_ip, site, 'failed', error=result,
+                                   auth_service_name=auth_service_name, ssid=ssid)
+                else:
+                    journal.record(apr.controller_ip, site, 'done',
+                                   auth_service_name=auth_service_name, ssid=ssid)
+
+            # Read the WLANs of all selected zones at once, so no zone is looked up twice
+            apr.build_wlan_index(controller_zones)
+            # Work on the zones in parallel. The results come back in zone order.
+            return apr.run_zones(controller_zones, modify_zone_auth, apr, auth_service_name, ssid,
+                                 on_result=checkpoint)
+
+        # Work on all controllers in parallel. The reports come back in controller order.
+        reports = pool.run(modify_controller)
+
         # Open the file to write the resulting output
         with open(filename, 'w+') as out_file:
-            # Work on each site or zone
-            for site in zones:
-                # Get WLAN ID for each zone and print zone_name with wlan_id
-                wlan_id = apr.get_wlan_id(site['id'])
-                print(f"\n{site['name']} ... wlan_id = {wlan_id}")
-                out_file.write(f"\n{site['name']} ... wlan_id = {wlan_id}")
-                # If wlan Id is '0', there is no "SFUSD" SSID. Escape the rest of the codes.
-                if wlan_id == '0':
+            for report in reports:
+                write_controller_header(out_file, report)
+                # Nothing more to write for a controller which failed
+                if report['error'] is not None:
                     continue
-                # Get and print the Authentication Profile for the site
-                auth_profile_name = apr.get_wlan_auth(site['id'], wlan_id)
-                print(f"Before Change:- Auth_profile for *** {site['name']} *** is *** \
-                {auth_profile_name}")
-                out_file.write(f"\nBefore Change:- Auth_profile for *** {site['name']} *** is *** \
-                {auth_profile_name}")
-                # Modify the authentication profile for the SSID
-                apr.modify_wlan_auth(site['id'], wlan_id, auth_service_name)
-                # Get and print the Authentication Profile for the site
-                auth_profile_name = apr.get_wlan_auth(site['id'], wlan_id)
-                print(f"After Change:- Auth_profile for *** {site['name']} *** is *** \
-                {auth_profile_name}\n")
-                out_file.write(f"\nAfter Change:- Auth_profile for *** {site['name']} *** is *** \
-                    {auth_profile_name}\n")
+                for site, result in report['result']:
+                    if isinstance(result, Exception):
+                        result = f"\n{site['name']} ... FAILED! {result}\n"
+                    print(result)
+                    out_file.write(result)
+            # How long each controller took
+            write_controller_summary(out_file, reports)
 
 
         print('\nIf you want to work on more zone groups, press ANY KEY! Otherwise, press ENTER! ')
         proceed = bool(input(' ') or None)
 
+    if journal is not None:
+        journal.close()
+        print(f'\nEvery zone is checkpointed in {journal.filename}. To finish a run which '
+              f'stopped, run this script with --resume {journal.filename}')
+
+    # Write how many requests went to each endpoint and how long they took
+    for apr in pool.clients.values():
+        export_metrics(apr, 'ise_transit')
+
 
 
 if __name__ == "__main__":
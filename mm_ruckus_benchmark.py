@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: To benchmark the auth, ChannelFly and AP login workflows against the
+         local SCG200 simulator (scg200_sim.py) at different zone counts, and
+         compare the results run over run
+Version: 1.0
+Date:    October 18, 2026
+
+Usage:
+    python mm_ruckus_benchmark.py --zones 10 100 1000 --latency 0.02 --workers 10
+"""
+
+# Import required modules
+import argparse
+import contextlib
+from datetime import datetime
+import io
+import json
+import os
+import time
+import tracemalloc
+from ruckus import Ruckus
+from scg200_sim import SCG200Simulator
+from mm_ruckus_auth_modify import modify_zone_auth
+
+
+# Workflows of the mm_ scripts, called as workflow(apr, zones)
+def auth_workflow(apr, zones):
+    """
+    mm_ruckus_auth_modify.py: WLAN index, then GET+PATCH+GET per zone
+    """
+    apr.build_wlan_index(zones)
+    return apr.run_zones(zones, modify_zone_auth, apr, 'F5-VIP-ISE-Radius')
+
+
+def channelfly_workflow(apr, zones):
+    """
+    mm_ruckus_channelfly_modify.py: ChannelFly on both radios per zone
+    """
+    return apr.run_zones(zones, lambda site: apr.channelfly(site['id'], 'N', 'both'))
+
+
+def ap_login_workflow(apr, zones):
+    """
+    mm_ruckus_ap_login_modify.py: AP login change per zone
+    """
+    aplogin = {'apLoginName': 'admin', 'apLoginPassword': 'Benchmark-1'}
+    return apr.run_zones(zones, lambda site: apr.update_ap_login(site['id'], aplogin))
+
+
+WORKFLOWS = {'auth': auth_workflow, 'channelfly': channelfly_workflow,
+             'ap_login': ap_login_workflow}
+
+
+def run_benchmark(zone_count, workflow, latency, workers, error_rate=0.0, measure_memory=True):
+    """
+    Run one workflow against a fresh simulator
+
+    Parameters:
+    zone_count - number of zones in the simulator
+    workflow - name of the workflow (see WORKFLOWS)
+    latency - seconds added by the simulator to every request
+    workers - max_workers of the Ruckus object
+    error_rate - fraction of requests the simulator answers with 503
+    measure_memory - run the workflow a second time to measure peak memory
+
+    Returns:
+    result - dict with zones, workflow, seconds, requests, requests_per_sec,
+             peak_memory_kb, failed
+    """
+
+    with SCG200Simulator(zones=zone_count, aps_per_zone=0, latency=latency,
+                         error_rate=error_rate) as sim:
+        apr = Ruckus(sim.url, 'admin', 'admin', max_workers=workers)
+        zones = apr.get_zones()['list']
+        requests_before = sim.request_count
+
+        start = time.perf_counter()
+        # The Ruckus methods print a line per zone -- keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = WORKFLOWS[workflow](apr, zones)
+        seconds = time.perf_counter() - start
+        requests = sim.request_count - requests_before
+
+        # tracemalloc slows Python down a lot, so memory is measured in a second pass
+        peak_memory = 0
+        if measure_memory:
+            tracemalloc.start()
+            with contextlib.redirect_stdout(io.StringIO()):
+                WORKFLOWS[workflow](apr, zones)
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        apr.log_out()
+
+    return {'zones': zone_count, 'workflow': workflow, 'workers': workers,
+            'latency': latency, 'seconds': round(seconds, 3), 'requests': requests,
+            'requests_per_sec': round(requests / seconds, 1),
+            'peak_memory_kb': round(peak_memory / 1024, 1),
+            'failed': sum(_failed(result) for _, result in results)}
+
+
+def _failed(result):
+    """
+    Whether the result of one zone is a failure (exception or 4xx/5xx status)
+    """
+    status = getattr(result, 'status_code', result)
+    return isinstance(result, Exception) or (isinstance(status, int) and status >= 400)
+
+
+def load_previous(filename):
+    """
+    Load the results of the last run from the results file
+
+    Parameters:
+    filename - JSON lines file with one result per line
+
+    Returns:
+    previous - dict of (workflow, zones) -> result
+    """
+
+    previous = {}
+    if os.path.exists(filename):
+        with open(filename) as results_file:
+            for line in results_file:
+                result = json.loads(line)
+                previous[(result['workflow'], result['zones'])] = result
+    return previous
+
+
+def main():
+    """
+    This will be the main function
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the mm_ workflows')
+    parser.add_argument('--zones', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--workflows', nargs='+', default=list(WORKFLOWS),
+                        choices=list(WORKFLOWS))
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help='seconds the simulator adds to every request')
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the second pass which measures peak memory')
+    parser.add_argument('--results', default='bench_results.jsonl',
+                        help='file the results are appended to, for run over run comparison')
+    args = parser.parse_args()
+
+    previous = load_previous(args.results)
+    run_at = datetime.now().isoformat(timespec='seconds')
+
+    print("\n--------------------------------------------------------------------------------")
+    print("{0:12} {1:>6} {2:>9} {3:>9} {4:>10} {5:>11} {6:>7} {7:>9}".format(
+        "WORKFLOW", "ZONES", "SECONDS", "REQUESTS", "REQ/SEC", "PEAK KB", "FAILED", "VS LAST"))
+    print("--------------------------------------------------------------------------------")
+
+    with open(args.results, 'a') as results_file:
+        for zone_count in args.zones:
+            for workflow in args.workflows:
+                result = run_benchmark(zone_count, workflow, args.latency, args.workers,
+                                       args.error_rate, not args.no_memory)
+                result['run_at'] = run_at
+                results_file.write(json.dumps(result) + '\n')
+
+                # Change of wall time against the last run of the same workflow and zone count
+                last = previous.get((workflow, zone_count))
+                change = ''
+                if last and last['seconds']:
+                    change = f"{(result['seconds'] / last['seconds'] - 1) * 100:+.0f}%"
+
+                print("{0:12} {1:>6} {2:>9} {3:>9} {4:>10} {5:>11} {6:>7} {7:>9}".format(
+                    workflow, zone_count, result['seconds'], result['requests'],
+                    result['requests_per_sec'], result['peak_memory_kb'], result['failed'],
+                    change))
+
+    print(f'\nThe results are appended to {args.results}')
+
+
+if __name__ == "__main__":
+
+    main()
@@ -8,28 +8,37 @@ Date:    March 26, 2021
 """
 
 # Import required modules
+import argparse
 from datetime import datetime
-from ruckus import Ruckus
-from mm_common_funcs import get_credentials, group_zones
+from ruckus_pool import ControllerPool
+from mm_common_funcs import export_metrics, get_controller_ips, get_credentials, \
+    get_all_zones, group_zones, print_plan, write_controller_header, write_controller_summary
 
 
 def main():
     """
     This will be the main function
     """
+    parser = argparse.ArgumentParser(description='Turn ON/OFF ChannelFly per zone')
+    parser.add_argument('--plan', action='store_true',
+                        help='only list the requests and estimate the time (no change)')
+    args = parser.parse_args()
+
     print('\n******* This script will Turn ON/OFF ChannelFly per zone ********\n\n')
 
     # Get username and password
     username, password = get_credentials()
 
-    # Request controller_ip
-    controller_ip = input('\nPlease enter the Controller IP (ONLY IP address): ')
+    # Request the controller IPs (the same change is made on every controller)
+    controller_ips = get_controller_ips()
 
-    # Create a Ruckus object
-    apr = Ruckus(controller_ip, username, password)
+    # Log in to all controllers at the same time (reusing the sessions of an
+    #   earlier run if still valid)
+    pool = ControllerPool(controller_ips, username, password, session_cache=True)
 
-    # Get all zones on the controller and their info
-    all_zones = apr.get_zones()['list']
+    # Get all zones on each controller and their info (local inventory if recently synced)
+    all_zones = {report['controller']: report['result'] or []
+                 for report in pool.run(get_all_zones)}
 
     # Create a while loop to allow to continue working on more zone groups
     #  create a variable named 'proceed' to ask the user whether to proceed
@@ -40,15 +49,18 @@ def main():
         print('\n You can work on one group of zones at a time (to be safe). Please select \n  \
 "CDC" for CDCs (Early Education Schools),\n  "ES" for Elementary School Zones,\n  \
 "MS" for Middle School Zones,\n  "HS" for High School Zones,\n  "OFC" for Office Zones,\n  \
-"Test" for Test Zones,\n  "ALL" to work on all zones\n')
+"Test" for Test Zones,\n  "ALL" to work on all zones,\n  \
+"ES,MS" for several groups, "ALL,!OFC" to leave a group out\n')
 
         zone_grp = input('Please select which zones to modify [ CDC | ES | MS | HS | OFC | Test | \
 ALL ]: ') or 'Test'
 
-        # Call group_zones function to get zones to modify
-        zones = group_zones(all_zones, zone_grp)
+        # Call group_zones function to get zones to modify on each controller
+        zones = {controller_ip: group_zones(controller_zones, zone_grp)
+                 for controller_ip, controller_zones in all_zones.items()}
         # Print the list of zones to modify
-        print(f'\n\nThe list of zones to modify:- \n\n\n {zones}')
+        for controller_ip, controller_zones in zones.items():
+            print(f'\n\nThe list of zones to modify on {controller_ip}:- \n\n\n {controller_zones}')
 
         # Create a filename by using modified current time
         #   Get current time and modify it by replacing ":" with ""
@@ -62,22 +74,45 @@ ALL ]: ') or 'Test'
         # Ask which channel to work on
         channel = input('Which channel do you want to work on (both/2.4/5.0):  ') or 'both'
 
+        # Dry run: list the requests and estimate the time, without changing anything
+        if args.plan:
+            print_plan(pool, zones, 'channelfly', turn_off=turn_off,
+                       channel=channel)
+            print('\nIf you want to plan more zone groups, press ANY KEY! Otherwise, press ENTER! ')
+            proceed = bool(input(' ') or None)
+            continue
+
+        # Call the function to TURN ON/OFF ChannelFly on the zones in parallel, on all
+        #   controllers in parallel. The reports come back in controller order.
+        reports = pool.run(lambda apr: apr.run_zones(
+            zones[apr.controller_ip], lambda site: apr.channelfly(site['id'], turn_off, channel)))
+
         # Open the file to write the resulting output
         with open(filename, 'w+') as out_file:
-            # Prepare headers for the output file
-            out_file.write("\n--------------------------------------------------------\n")
-            out_file.write("{0:40} {1:>5}".format("ZONE", "STATUS CODE"))
-            out_file.write("\n--------------------------------------------------------\n")
-            # Work on each site or zone
-            for site in zones:
-                # Call the function to TURN ON/OFF ChannelFly
-                response = apr.channelfly(site['id'], turn_off, channel)
-                out_file.write("{0:40} {1:>5}\n".format(site['name'], response.status_code))
+            for report in reports:
+                write_controller_header(out_file, report)
+                # Nothing more to write for a controller which failed
+                if report['error'] is not None:
+                    continue
+                # Prepare headers for the output file
+                out_file.write("\n--------------------------------------------------------\n")
+                out_file.write("{0:40} {1:>5}".format("ZONE", "STATUS CODE"))
+                out_file.write("\n--------------------------------------------------------\n")
+                # Write the result of each site or zone, in zone order
+                for site, response in report['result']:
+                    status = getattr(response, 'status_code', 'FAILED')
+                    out_file.write("{0:40} {1:>5}\n".format(site['name'], status))
+            # How long each controller took
+            write_controller_summary(out_file, reports)
 
 
         print('\nIf you want to work on more zone groups, press ANY KEY! Otherwise, press ENTER! ')
         proceed = bool(input(' ') or None)
 
+    # Write how many requests went to each endpoint and how long they took
+    for apr in pool.clients.values():
+        export_metrics(apr, 'channelfly_modified')
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: To copy zones, WLANs, AP groups and APs of the controller into the
+         local SQLite inventory, and look things up in it offline
+Version: 1.0
+Date:    October 18, 2026
+"""
+
+# Import required modules
+import requests
+from ruckus import Ruckus
+from ruckus_inventory import Inventory
+from mm_common_funcs import get_credentials
+
+
+def lookup(inventory, controller_ip):
+    """
+    Answer questions from the inventory until the user presses ENTER
+
+    Parameters:
+    inventory - Inventory object
+    controller_ip - controller IP used as key in the inventory
+
+    Returns:
+    """
+
+    while True:
+        print('\nLook up:  "MAC <ap mac>" for the zone of an AP,\n  '
+              '"SSID <ssid>" for the zones which carry an SSID,\n  '
+              '"AUTH <ssid>" for the auth profile of an SSID in each zone\n')
+        query = input('Query (ENTER to exit): ').strip()
+        if not query:
+            break
+
+        kind, _, value = query.partition(' ')
+        if kind.upper() == 'MAC':
+            print(inventory.zone_of_ap(value))
+        elif kind.upper() == 'SSID':
+            for zone in inventory.zones_with_ssid(value):
+                print(zone)
+        elif kind.upper() == 'AUTH':
+            for wlan in inventory.wlan_auth_profiles(controller_ip, value):
+                print(wlan)
+        else:
+            print(f'{kind} is WRONG choice. Please enter correct choice!')
+
+
+def main():
+    """
+    This will be the main function
+    """
+    print('\n******* This script will sync the controller into the local inventory ********\n\n')
+
+    # Get username and password
+    username, password = get_credentials()
+
+    # Request controller_ip
+    controller_ip = input('\nPlease enter the Controller IP (ONLY IP address): ')
+
+    # Where to keep the inventory
+    db_path = input('\nInventory file: [ruckus_inventory.db] ') or 'ruckus_inventory.db'
+
+    # Reading the auth profile of every WLAN costs one request per WLAN
+    wlan_auth = (input('\nAlso read the auth profile of each WLAN? (Y/N): [N] ') or 'N')\
+        .upper() == 'Y'
+
+    # Create a Ruckus object
+    apr = Ruckus(controller_ip, username, password)
+
+    inventory = Inventory(db_path)
+    try:
+        try:
+            changes = inventory.sync(apr, controller_ip, wlan_auth=wlan_auth)
+        except requests.exceptions.RequestException as err:
+            print(f'\nSync of {controller_ip} ... FAILED! {err}')
+            print('The inventory keeps the records of the last sync.')
+            return
+        print('\nRecords added, changed or removed:')
+        for table, count in changes.items():
+            print(f'  {table:10} {count}')
+
+        lookup(inventory, controller_ip)
+    finally:
+        inventory.close()
+        apr.log_out()
+
+
+if __name__ == "__main__":
+
+    main()
+
+    input('\nPress any key to exit!')
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: To bring zones to a desired state (auth profile, ChannelFly, AP login,
+         radio settings), changing only the zones which differ
+Version: 1.0
+Date:    October 18, 2026
+
+Usage:
+    python mm_ruckus_reconcile.py desired_state.json
+"""
+
+# Import required modules
+import argparse
+from datetime import datetime
+from ruckus_pool import ControllerPool
+from ruckus_reconcile import apply_plan, format_plan, load_desired, needs_change, plan_changes
+from mm_common_funcs import export_metrics, get_controller_ips, get_credentials, \
+    get_all_zones, group_zones, write_controller_header, write_controller_summary
+
+
+def main():
+    """
+    This will be the main function
+    """
+    parser = argparse.ArgumentParser(description='Change only the zones which differ '
+                                                 'from the desired state')
+    parser.add_argument('desired', help='JSON file of the desired state (see ruckus_reconcile.py)')
+    parser.add_argument('--yes', action='store_true', help='apply the plan without asking')
+    args = parser.parse_args()
+
+    desired = load_desired(args.desired)
+
+    print('\n******* This script will bring the zones to the desired state ********\n\n')
+
+    # Get username and password
+    username, password = get_credentials()
+
+    # Request the controller IPs and log in to all of them at the same time
+    controller_ips = get_controller_ips()
+    pool = ControllerPool(controller_ips, username, password, session_cache=True)
+
+    # Get all zones on each controller and select the zones of the desired state
+    all_zones = {report['controller']: report['result'] or []
+                 for report in pool.run(get_all_zones)}
+    zones = {controller_ip: group_zones(controller_zones, desired['zones'])
+             for controller_ip, controller_zones in all_zones.items()}
+
+    # Read the current state of the zones and compare it with the desired state
+    #   (read only -- nothing is changed yet)
+    plans = pool.run(lambda apr: plan_changes(apr, zones[apr.controller_ip], desired))
+    plan_by_controller = {report['controller']: report['result'] for report in plans
+                          if report['error'] is None}
+
+    # Create a filename by using modified current time
+    #   Get current time and modify it by replacing ":" with ""
+    modified_time = datetime.now().isoformat(timespec='seconds').replace(':', '')
+    filename = f'reconcile_{modified_time}.txt'
+
+    with open(filename, 'w+') as out_file:
+        out_file.write(f'Desired state: {args.desired}\n')
+        for report in plans:
+            write_controller_header(out_file, report)
+            # Nothing more to write for a controller which failed
+            if report['error'] is not None:
+                continue
+            text = format_plan(report['result'])
+            print(f"\n=========== Controller {report['controller']} ===========\n{text}")
+            out_file.write(f'{text}\n')
+
+        changed = sum(needs_change(entry) for plan in plan_by_controller.values()
+                      for entry in plan)
+        if not changed:
+            print('\nAll zones are already in the desired state. Nothing to change!')
+            out_file.write('\nAll zones are already in the desired state. Nothing to change!\n')
+        elif args.yes or input(f'\nType YES to change the {changed} zones: ') == 'YES':
+            # Change only the zones which differ, on all controllers in parallel
+            reports = pool.run(lambda apr: apply_plan(apr, plan_by_controller[apr.controller_ip]))
+
+            out_file.write('\n\n****************** CHANGES ******************\n')
+            for report in reports:
+                write_controller_header(out_file, report)
+                if report['error'] is not None:
+                    continue
+                for site, statuses in report['result']:
+                    if isinstance(statuses, Exception):
+                        out_file.write(f"{site['name']} ... FAILED! {statuses}\n")
+                    else:
+                        out_file.write("{0:40} {1}\n".format(site['name'], ', '.join(
+                            f'{endpoint}: {status}' for endpoint, status in statuses)))
+            # How long each controller took
+            write_controller_summary(out_file, reports)
+
+    print(f'\nThe plan and the changes are written to {filename}')
+
+    # Write how many requests went to each endpoint and how long they took
+    for apr in pool.clients.values():
+        export_metrics(apr, 'reconcile')
+
+
+if __name__ == "__main__":
+
+    main()
+
+    input('\nPress any key to exit!')
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: To back up the configuration of all zones (zone, WLANs, AP groups)
+         before the bulk modify scripts are run, and to compare backups
+Version: 1.0
+Date:    October 18, 2026
+
+Usage:
+    python mm_ruckus_snapshot.py                       take a snapshot
+    python mm_ruckus_snapshot.py --list                list the snapshots
+    python mm_ruckus_snapshot.py --diff OLD NEW        zones changed between two snapshots
+    python mm_ruckus_snapshot.py --show SNAPSHOT ZONE  configuration of a zone in a snapshot
+"""
+
+# Import required modules
+import argparse
+import json
+import time
+from ruckus_pool import ControllerPool
+from ruckus_snapshot import SnapshotStore, diff_snapshots, take_snapshot
+from mm_common_funcs import get_controller_ips, get_credentials, group_zones
+
+
+def snapshot_controller(apr, store, zone_grp):
+    """
+    Take a snapshot of the zones of one controller
+
+    Parameters:
+    apr - Ruckus object
+    store - SnapshotStore
+    zone_grp - zone group(s) to back up
+
+    Returns:
+    manifest, filename - manifest of the snapshot and its file
+    """
+
+    # Read the zone list from the controller, so new zones are backed up too
+    zones = group_zones(apr.get_zones()['list'], zone_grp)
+
+    # The last snapshot of the controller tells which zones changed
+    snapshots = store.snapshots(apr.controller_ip)
+    previous = store.load_manifest(snapshots[-1]) if snapshots else None
+
+    manifest = take_snapshot(apr, store, zones, previous)
+    return manifest, store.save_manifest(manifest)
+
+
+def main():
+    """
+    This will be the main function
+    """
+    parser = argparse.ArgumentParser(description='Back up the configuration of all zones')
+    parser.add_argument('--store', default='ruckus_snapshots', help='folder of the snapshots')
+    parser.add_argument('--list', action='store_true', help='list the snapshots')
+    parser.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'),
+                        help='zones added, removed and changed between two snapshots')
+    parser.add_argument('--show', nargs=2, metavar=('SNAPSHOT', 'ZONE'),
+                        help='configuration of a zone (name or ID) in a snapshot')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+
+    if args.list:
+        for filename in store.snapshots():
+            manifest = store.load_manifest(filename)
+            print(f"{filename}  {len(manifest['zones'])} zones, "
+                  f"{len(manifest['changed'])} changed")
+        return
+
+    if args.diff:
+        added, removed, changed = diff_snapshots(*map(store.load_manifest, args.diff))
+        for title, names in (('ADDED', added), ('REMOVED', removed), ('CHANGED', changed)):
+            print(f'\n{title} ({len(names)}):')
+            for name in names:
+                print(f'    {name}')
+        return
+
+    if args.show:
+        config = store.zone_config(store.load_manifest(args.show[0]), args.show[1])
+        print(json.dumps(config, indent=2) if config else f'{args.show[1]} is not in the snapshot')
+        return
+
+    print('\n******* This script will back up the configuration of the zones ********\n\n')
+
+    # Get username and password
+    username, password = get_credentials()
+
+    # Request the controller IPs and log in to all of them at the same time
+    controller_ips = get_controller_ips()
+    pool = ControllerPool(controller_ips, username, password, session_cache=True)
+
+    zone_grp = input('Please select which zones to back up [ CDC | ES | MS | HS | OFC | Test | \
+ALL ]: ') or 'ALL'
+
+    start = time.perf_counter()
+    reports = pool.run(snapshot_controller, store, zone_grp)
+
+    for report in reports:
+        if report['error'] is not None:
+            print(f"\n{report['controller']} ... FAILED! {report['error']}")
+            continue
+        manifest, filename = report['result']
+        print(f"\n{report['controller']}: {len(manifest['zones'])} zones in {filename} "
+              f"({report['seconds']:.1f} seconds)")
+        print(f"    {len(manifest['changed'])} zones changed since the last snapshot, "
+              f"{manifest['written']} new configurations written")
+        for name, error in manifest['failed'].items():
+            print(f'    {name} ... FAILED! {error}')
+
+    print(f'\nAll controllers took {time.perf_counter() - start:.1f} seconds')
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: To download the support logs of the APs of a zone (or of a list of AP
+         MACs) in parallel, gzip-compressed, with the size and download time of
+         each AP written to a report
+Version: 1.0
+Date:    October 18, 2026
+"""
+
+# Import required modules
+from datetime import datetime
+import os
+from ruckus import Ruckus
+from mm_common_funcs import get_credentials
+
+
+def main():
+    """
+    This will be the main function
+    """
+    print('\n******* This script will download the support logs of APs ********\n\n')
+
+    # Get username and password
+    username, password = get_credentials()
+
+    # Request controller_ip
+    controller_ip = input('\nPlease enter the Controller IP (ONLY IP address): ')
+
+    # Create a Ruckus object
+    apr = Ruckus(controller_ip, username, password)
+
+    # Either a list of AP MACs or all APs of a zone
+    ap_macs = input('\nPlease enter the AP MACs separated by commas '
+                    '(ENTER for all APs of a zone): ')
+    ap_macs = [ap_mac.strip().upper() for ap_mac in ap_macs.split(',') if ap_mac.strip()]
+    zone = zone_id = None
+    if not ap_macs:
+        zone = input('Please enter the zone name: ')
+        zone_id = apr.get_zone_id(zone)
+        if zone_id is None:
+            return
+        ap_macs = [ap.mac for ap in apr.ap_records(zone_id)]
+
+    print(f'\nDownloading the support logs of {len(ap_macs)} APs, '
+          f'{apr.max_workers} at a time\n')
+
+    # Create a folder name by using modified current time
+    #   Get current time and modify it by replacing ":" with ""
+    modified_time = datetime.now().isoformat(timespec='seconds').replace(':', '')
+    folder = f"support_logs_{zone or 'aps'}_{modified_time}"
+
+    reports = apr.collect_support_logs(ap_macs, folder=folder)
+
+    # Write the per-AP report next to the logs
+    filename = os.path.join(folder, 'report.txt')
+    with open(filename, 'w+') as out_file:
+        out_file.write("\n--------------------------------------------------------------------\n")
+        out_file.write("{0:20} {1:>12} {2:>12} {3:>8} {4}".format(
+            "AP MAC", "BYTES", "COMPRESSED", "SECONDS", "FILE"))
+        out_file.write("\n--------------------------------------------------------------------\n")
+        for report in reports:
+            if report['error'] is not None:
+                out_file.write(f"{report['mac']:20} ---- FAILED! {report['error']}\n")
+                continue
+            out_file.write("{0:20} {1:>12} {2:>12} {3:>8.1f} {4}\n".format(
+                report['mac'], report['bytes'], report['stored'], report['seconds'],
+                os.path.basename(report['file'])))
+
+        failed = sum(report['error'] is not None for report in reports)
+        out_file.write(f"\n{len(reports) - failed} logs downloaded, {failed} failed, "
+                       f"{sum(report['stored'] for report in reports)} bytes on disk\n")
+
+    print(f'\nThe logs and the report are written to {folder}')
+
+    apr.log_out()
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: To watch the APs of the controllers for a while (e.g. after a ChannelFly
+         rollout): APs online, clients and channel changes per zone, sampled at
+         a fixed interval and kept in telemetry_<controller>.json.gz
+Version: 1.0
+Date:    October 18, 2026
+
+Usage:
+    python mm_ruckus_telemetry.py [--interval 60] [--minutes 60] [--capacity 1440]
+"""
+
+# Import required modules
+import argparse
+from datetime import datetime
+import re
+import time
+from ruckus_pool import ControllerPool
+from ruckus_telemetry import TelemetryPoller, TelemetryStore
+from mm_common_funcs import get_all_zones, get_controller_ips, get_credentials, group_zones
+
+
+def write_zone_report(out_file, store, zones):
+    """
+    Write the status of the zones as of the last sample, and the changes seen
+    during the run
+
+    Parameters:
+    out_file - file object to write to
+    store - TelemetryStore
+    zones - list of zones to report
+    """
+
+    status = store.zone_status()
+    out_file.write("{0:35} {1:>6} {2:>7} {3:>8} {4:>8} {5:>10} {6:>10}\n".format(
+        "ZONE NAME", "APS", "ONLINE", "CLIENTS", "DOWN", "CH 2.4G", "CH 5G"))
+    out_file.write("--------------------------------------------------------------------"
+                   "-------------------------\n")
+
+    for site in zones:
+        zone = status.get(site['id'], {'aps': 0, 'online': 0, 'clients': 0})
+        # An AP going from online (1) to offline (0)
+        down = [change for change in store.changes('online', zone_id=site['id'])
+                if change[3] == 0]
+        out_file.write("{0:35} {1:>6} {2:>7} {3:>8} {4:>8} {5:>10} {6:>10}\n".format(
+            site['name'], zone['aps'], zone['online'], zone['clients'], len(down),
+            len(store.changes('channel24', zone_id=site['id'])),
+            len(store.changes('channel50', zone_id=site['id']))))
+
+
+def main():
+    """
+    This will be the main function
+    """
+    parser = argparse.ArgumentParser(description='Sample the AP status of the controllers')
+    parser.add_argument('--interval', type=float, default=60, help='seconds between samples')
+    parser.add_argument('--minutes', type=float, default=60, help='minutes to sample for')
+    parser.add_argument('--capacity', type=int, default=1440, help='samples kept per AP')
+    parser.add_argument('--flush-every', type=int, default=10,
+                        help='write the samples to disk every this many samples')
+    args = parser.parse_args()
+
+    print('\n******* This script will sample the status of the APs ********\n\n')
+
+    # Get username and password
+    username, password = get_credentials()
+
+    # Request the controller IPs and log in to all of them at the same time
+    controller_ips = get_controller_ips()
+    pool = ControllerPool(controller_ips, username, password, session_cache=True)
+
+    zone_grp = input('Please select which zones to watch [ CDC | ES | MS | HS | OFC | Test | \
+ALL ]: ') or 'ALL'
+
+    # One poller per controller; ALL zones are sampled with one AP query
+    pollers = {}
+    zones = {}
+    for controller_ip, apr in pool.clients.items():
+        zones[controller_ip] = group_zones(get_all_zones(apr), zone_grp)
+        zone_ids = None if zone_grp.upper() == 'ALL' else [
+            site['id'] for site in zones[controller_ip]]
+        controller = re.sub(r'[^\w.-]+', '_', controller_ip)
+        pollers[controller_ip] = TelemetryPoller(
+            apr, TelemetryStore(args.capacity), interval=args.interval, zone_ids=zone_ids,
+            flush_file=f'telemetry_{controller}.json.gz', flush_every=args.flush_every)
+
+    print(f'\nSampling every {args.interval:g} seconds for {args.minutes:g} minutes. '
+          f'Press Ctrl+C to stop early.')
+    for poller in pollers.values():
+        poller.start()
+    try:
+        time.sleep(args.minutes * 60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for poller in pollers.values():
+            poller.stop()
+
+    # Create a filename by using modified current time
+    #   Get current time and modify it by replacing ":" with ""
+    modified_time = datetime.now().isoformat(timespec='seconds').replace(':', '')
+    filename = f'telemetry_{modified_time}.txt'
+
+    with open(filename, 'w+') as out_file:
+        for controller_ip, poller in pollers.items():
+            out_file.write(f"\n{controller_ip}: {poller.samples} samples, "
+                           f"{poller.errors} failed, saved in {poller.flush_file}\n\n")
+            write_zone_report(out_file, poller.store, zones[controller_ip])
+
+    print(f'\nThe zone report is written to {filename}')
+
+    pool.log_out()
+
+
+if __name__ == "__main__":
+
+    main()
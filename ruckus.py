@@ -8,33 +8,401 @@ Reference:  Philip Siu Ruckus.py
 """
 
 # Import requests module to work on Ruckus REST API
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
 import requests
+from requests.adapters import HTTPAdapter
 import urllib3
+from ruckus_limiter import AdaptiveLimiter, retry_delay
+from ruckus_metrics import Metrics
+from ruckus_cache import ResponseCache, cached_response
+from ruckus_changeset import ZoneChangeSet
+from ruckus_records import Ap, ApGroup, Wlan, Zone
+from ruckus_stream import StreamedList
 
 # To disable HTTPs related warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Used instead of the limiter when the session has none
+_NO_LIMIT = nullcontext()
+
+
+def _close_page(future):
+    """
+    Close the response of a prefetched streamed page nobody is going to read
+    """
+    if future.exception() is None:
+        future.result()[1].response.close()
+
+
+def _not_sent(err):
+    """
+    Whether a failed request surely never reached the controller (the
+    connection could not be opened), so it is safe to send it again
+    """
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(err.args[0], 'reason', None) if err.args else None
+    return isinstance(reason, urllib3.exceptions.ConnectTimeoutError)
+
+
+def _page_error(response):
+    """
+    Exception for a list page the controller did not answer with 200, so a
+    failed read is never taken for an empty list (the response is closed)
+    """
+    body = response.text[:200]
+    response.close()
+    return requests.exceptions.HTTPError(
+        f'HTTP {response.status_code} from {response.url}: {body}', response=response)
+
+# Default folder of the on-disk session cache
+SESSION_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.ruckus_sessions')
+
+# Default folder of the on-disk response cache
+RESPONSE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.ruckus_cache')
+
+
+class RuckusSession(requests.Session):
+    """
+    requests.Session which
+      - keeps the number of requests in flight under an AdaptiveLimiter,
+      - retries throttled (429/503) and timed out requests with jittered backoff,
+      - logs in again and replays a request when the controller answers 401,
+      - answers GETs of read-only endpoints from a ResponseCache (when given)
+    """
+
+    # Status codes the controller uses when it is throttling or overloaded
+    RETRY_STATUS = (429, 502, 503, 504)
+
+    # Methods which can be sent twice without doing the change twice. Others
+    #   (a zone POST, an AP reboot PUT, the login) are only sent again when the
+    #   controller surely did not process them: a failed connect, 429, or 503
+    #   with Retry-After.
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PATCH', 'DELETE')
+
+    def __init__(self, relogin=None, limiter=None, max_retries=5, timeout=60, metrics=None,
+                 cache=None):
+        super().__init__()
+        # relogin(generation) logs in again unless someone already did since generation
+        self.relogin = relogin
+        self.generation = 0
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.metrics = metrics
+        self.cache = cache
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+
+        if self.cache is not None:
+            if method.upper() == 'GET' and not kwargs.get('stream'):
+                return self._cached_get(url, *args, **kwargs)
+            # A write makes the cached reads of the same path stale
+            self.cache.invalidate(url)
+
+        return self._replay_request(method, url, *args, **kwargs)
+
+    def _cached_get(self, url, *args, **kwargs):
+        # The cache is keyed by the full URL including the query parameters
+        full_url = requests.Request('GET', url, params=kwargs.pop('params', None)).prepare().url
+        if self.cache.ttl(full_url) is None:
+            return self._replay_request('GET', full_url, *args, **kwargs)
+
+        entry = self.cache.get(full_url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return cached_response(entry)
+
+        # Ask the controller whether the stale entry is still good
+        if entry is not None:
+            headers = dict(kwargs.pop('headers', None) or {})
+            if 'ETag' in entry['headers']:
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if 'Last-Modified' in entry['headers']:
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+            kwargs['headers'] = headers
+
+        response = self._replay_request('GET', full_url, *args, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(full_url, entry, response)
+            return cached_response(entry)
+        if response.status_code == 200:
+            self.cache.put(full_url, response)
+        return response
+
+    def _replay_request(self, method, url, *args, **kwargs):
+        generation = self.generation
+        response = self._send(method, url, *args, **kwargs)
+
+        # The login request itself is never replayed
+        if response.status_code == 401 and self.relogin is not None \
+                and not url.endswith('/v5_0/session'):
+            self.relogin(generation)
+            response = self._send(method, url, *args, **kwargs)
+
+        return response
+
+    def _send(self, method, url, *args, **kwargs):
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS
+        for attempt in range(self.max_retries + 1):
+            response = None
+            with self.limiter or _NO_LIMIT:
+                start = time.monotonic()
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as err:
+                    # A request which may have reached the controller is only
+                    #   sent again when it is idempotent
+                    if attempt == self.max_retries or not (idempotent or _not_sent(err)):
+                        if self.limiter is not None:
+                            self.limiter.on_throttle()
+                        raise
+                latency = time.monotonic() - start
+            if self.metrics is not None:
+                self._record(method, url, response, latency, kwargs.get('stream'))
+
+            if response is not None and not self._should_retry(response, idempotent):
+                if self.limiter is not None:
+                    if response.status_code in self.RETRY_STATUS:
+                        self.limiter.on_throttle()
+                    elif response.status_code >= 400 and response.status_code != 401:
+                        # Counted in the error rate (401 is a session expiry, see relogin)
+                        self.limiter.on_error()
+                    else:
+                        self.limiter.on_success(latency)
+                return response
+
+            # Throttled or timed out -- slow down, wait and try again
+            if self.limiter is not None:
+                self.limiter.on_throttle()
+            if attempt == self.max_retries:
+                break
+            retry_after = response.headers.get('Retry-After') if response is not None else None
+            delay = retry_delay(attempt, retry_after)
+            print(f'{method} {url} -- '
+                  f'{response.status_code if response is not None else "timed out"}, '
+                  f'retrying in {delay:.1f} seconds')
+            if response is not None:
+                # Give the connection of a streamed response back before the retry
+                response.close()
+            time.sleep(delay)
+
+        return response
+
+    def _should_retry(self, response, idempotent):
+        status = response.status_code
+        # 429, and 503 with Retry-After, mean the controller did not process the request
+        if status == 429 or (status == 503 and 'Retry-After' in response.headers):
+            return True
+        return idempotent and status in self.RETRY_STATUS
+
+    def _record(self, method, url, response, latency, stream):
+        if response is None:
+            self.metrics.record(method, url, 'error', latency)
+            return
+
+        body = response.request.body or b''
+        # A streamed body is not read here; its size is taken from the header
+        if stream:
+            received = int(response.headers.get('Content-Length') or 0)
+        else:
+            received = len(response.content)
+        self.metrics.record(method, url, response.status_code, latency, len(body), received)
+
+
 class Ruckus:
     """
     Ruckus class to instantiate a Ruckus object
     """
 
     # Initialize the object -- take username, password during initialization
-    def __init__(self, controller_ip, username, password):
+    #   max_workers - how many zones to work on in parallel on this controller
+    #   zone_cache_ttl - seconds to keep the zone name/id index before re-reading it
+    #   wlan_cache_ttl - seconds to keep the WLANs of a zone in the WLAN index
+    #   session_cache - reuse the login across runs: True for ~/.ruckus_sessions,
+    #                   or the folder to keep the sessions in (default off)
+    #   adaptive - adapt the number of requests in flight (up to max_workers) to
+    #              how fast the controller answers, and retry throttled requests
+    #   response_cache - keep read-only responses (system summary, AP models, zones)
+    #                    on disk: True for ~/.ruckus_cache, the folder, or a
+    #                    ResponseCache with its own TTLs and size (default off)
+    def __init__(self, controller_ip, username, password, max_workers=10, zone_cache_ttl=300,
+                 session_cache=None, adaptive=True, response_cache=None, wlan_cache_ttl=300):
 
         # URI for SCG 200 to connect to and user_info
-        self.scg200_uri = f'https://{controller_ip}:8443/wsg/api/public'
-        user_info = {'username': username, 'password': password}
+        self.controller_ip = controller_ip
+        #   A full base URL (e.g. http://127.0.0.1:8080 for scg200_sim.py) is used as is
+        if '://' in controller_ip:
+            self.scg200_uri = f"{controller_ip.rstrip('/')}/wsg/api/public"
+        else:
+            self.scg200_uri = f'https://{controller_ip}:8443/wsg/api/public'
+        self.user_info = {'username': username, 'password': password}
+        self.max_workers = max_workers
+
+        # File of the on-disk session cache, one per controller and user
+        if session_cache is True:
+            session_cache = SESSION_CACHE_DIR
+        self.session_file = None
+        if session_cache:
+            key = hashlib.sha256(f'{controller_ip}|{username}'.encode()).hexdigest()[:32]
+            self.session_file = os.path.join(session_cache, f'{key}.json')
+
+        # Zone index (zone name -> zone_id and zone_id -> zone), filled on first use
+        self.zone_cache_ttl = zone_cache_ttl
+        self._zones_by_name = None
+        self._zones_by_id = None
+        self._zone_index_time = 0
+        self._zone_lock = threading.Lock()
+
+        # WLAN index ((zone_id, ssid) -> wlan) and when each zone was put in it
+        self.wlan_cache_ttl = wlan_cache_ttl
+        self._wlan_index = {}
+        self._wlan_zones = {}
+        self._wlan_lock = threading.Lock()
 
         # Create session and initiate connection
-        self.session = requests.Session()
+        #   The connection pool is sized to max_workers so parallel zone work
+        #   reuses connections instead of opening (and dropping) new ones
+        limiter = AdaptiveLimiter(initial=min(4, max_workers), maximum=max_workers) \
+            if adaptive else None
+        # Per-endpoint call counts, bytes, status codes and latencies
+        self.metrics = Metrics()
+
+        # On-disk cache of read-only responses, kept apart per user
+        if response_cache is True:
+            response_cache = RESPONSE_CACHE_DIR
+        if isinstance(response_cache, str):
+            response_cache = ResponseCache(response_cache, namespace=username)
+
+        self.session = RuckusSession(relogin=self._relogin, limiter=limiter,
+                                     metrics=self.metrics, cache=response_cache)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._login_lock = threading.Lock()
+
+        # Reuse the cached session if it is still valid, otherwise log in
+        if not self._load_session():
+            self._log_in()
+
+
+
+    #-------------------------------------------------------------------------
+    #   The METHODS below log in and keep the session!
+    #-------------------------------------------------------------------------
+
+    @property
+    def concurrency_limit(self):
+        """
+        Number of requests the adaptive limiter currently allows in flight
+        (max_workers when adaptive is off)
+        """
+        if self.session.limiter is None:
+            return self.max_workers
+        return self.session.limiter.limit
+
+
+
+
+    def _log_in(self):
+        """
+        Log in to the SCG200 API and save the session in the session cache
+
+        Parameters:
+
+        Returns:
+        """
+
+        self.session.cookies.clear()
         self.session.post(f'{self.scg200_uri}/v5_0/session', verify=False, \
-                          json=user_info)
+                          json=self.user_info)
 
         # Get session info, domain_id and zone_id
         self.session_info = self.session.get(f'{self.scg200_uri}/v5_0/session').json()
         self.domain_id = self.session_info['domainId']
 
+        self._save_session()
+
+
+
+    def _relogin(self, generation):
+        """
+        Log in again after the controller answered 401. When many requests fail
+        at the same time, only the first one logs in.
+
+        Parameters:
+        generation - session generation the failed request was sent with
+
+        Returns:
+        """
+
+        with self._login_lock:
+            if self.session.generation != generation:
+                return
+            print('\nThe session expired. Logging in again!\n')
+            self._log_in()
+            self.session.generation += 1
+
+
+
+    def _load_session(self):
+        """
+        Load the session from the session cache and check that it is still valid
+
+        Parameters:
+
+        Returns:
+        True if the cached session can be used
+        """
+
+        if self.session_file is None or not os.path.exists(self.session_file):
+            return False
+
+        try:
+            with open(self.session_file) as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return False
+
+        self.session.cookies.update(cached['cookies'])
+        session_info = self.session.get(f'{self.scg200_uri}/v5_0/session')
+        if session_info.status_code != 200:
+            return False
+
+        self.session_info = session_info.json()
+        self.domain_id = self.session_info['domainId']
+        return True
+
+
+
+    def _save_session(self):
+        """
+        Save the session cookies in the session cache (readable only by the user)
+
+        Parameters:
+
+        Returns:
+        """
+
+        if self.session_file is None:
+            return
+
+        os.makedirs(os.path.dirname(self.session_file), mode=0o700, exist_ok=True)
+        cached = {'controller': self.controller_ip, 'username': self.user_info['username'],
+                  'cookies': self.session.cookies.get_dict(), 'saved_at': time.time()}
+
+        # Create the file with 0600 permissions before anything is written to it
+        descriptor = os.open(self.session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w') as cache_file:
+            json.dump(cached, cache_file)
+
 
 
     #-------------------------------------------------------------------------
@@ -73,6 +441,258 @@ class Ruckus:
 
 
 
+    #----------------------------------------------------------------------
+    #  The METHODS below page through the lists on the controller!
+    #----------------------------------------------------------------------
+
+    def _iter_pages(self, path, params=None, list_size=200, fields=None, query=None):
+        """
+        Go over every item of a list endpoint, one page at a time
+
+        Each page is decoded from the socket one item at a time (unless the
+        response cache keeps the endpoint), and the next page is requested in
+        the background while the caller works on the current one, so memory
+        stays bounded by about one item per page in flight.
+
+        Parameters:
+        path - path under the public API URI (e.g. /v5_0/rkszones)
+        params - extra query parameters
+        list_size - number of items to ask for in each page
+        fields - keys to keep of each item (default all keys)
+        query - body of a query endpoint (e.g. /v5_0/query/ap), which is POSTed
+                with page and limit in the body instead of index and listSize
+
+        Returns:
+        generator of list items (dict); requests.exceptions.HTTPError is raised
+        when a page is not answered with 200
+        """
+
+        url = f'{self.scg200_uri}{path}'
+        params = dict(params or {})
+        cache = self.session.cache
+        stream = query is not None or cache is None or cache.ttl(url) is None
+
+        def get_page(index, page):
+            if query is not None:
+                body = dict(query, page=page, limit=list_size)
+                response = self.session.post(url, params=params, json=body, stream=True)
+            else:
+                page_params = dict(params, index=index, listSize=list_size)
+                response = self.session.get(url, params=page_params, stream=stream)
+            # An error body has no list -- it must not look like an empty page
+            if response.status_code != 200:
+                raise _page_error(response)
+            if stream:
+                items = StreamedList(response, fields=fields)
+                return items.start(), items
+
+            meta = response.json()
+            items = meta.pop('list', []) if isinstance(meta, dict) else []
+            if fields is not None:
+                items = [{key: item[key] for key in fields if key in item} for item in items]
+            return meta, items
+
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            index, page = 0, 1
+            meta, items = get_page(index, page)
+
+            while True:
+                # hasMore normally comes before the list, so the next page can be
+                # asked for before this one is read -- assuming this page is full
+                next_page = None
+                if meta.get('hasMore'):
+                    next_page = prefetch.submit(get_page, index + list_size, page + 1)
+
+                count = 0
+                try:
+                    for item in items:
+                        count += 1
+                        yield item
+                except GeneratorExit:
+                    # The caller stopped early -- give the prefetched page's connection back
+                    if stream and next_page is not None:
+                        next_page.add_done_callback(_close_page)
+                    raise
+
+                # The controller capped the page below list_size: the prefetched
+                #   page starts too far on, ask again right after this page's items.
+                #   (Query pages are numbered, so page + 1 is right either way.)
+                if next_page is not None and query is None and count != list_size:
+                    if stream:
+                        next_page.add_done_callback(_close_page)
+                    next_page = None
+
+                # hasMore came after the list (or the prefetch was dropped)
+                if next_page is None and meta.get('hasMore') and count:
+                    next_page = prefetch.submit(get_page, index + count, page + 1)
+
+                if next_page is None:
+                    break
+                index, page = index + count, page + 1
+                meta, items = next_page.result()
+
+
+
+    def iter_zones(self, list_size=200, fields=None):
+        """
+        Go over all zones in the controller, page by page
+
+        Parameters:
+        list_size - number of zones in each page
+        fields - keys to keep of each zone (e.g. ('id', 'name')), default all keys
+
+        Returns:
+        generator of zones (dict)
+        """
+
+        return self._iter_pages('/v5_0/rkszones', list_size=list_size, fields=fields)
+
+
+
+    def iter_wlans(self, zone_id, list_size=200, fields=None):
+        """
+        Go over all WLANs of a zone, page by page
+
+        Parameters:
+        zone_id - zone ID value
+        list_size - number of WLANs in each page
+        fields - keys to keep of each WLAN (e.g. ('id', 'name')), default all keys
+
+        Returns:
+        generator of WLANs (dict)
+        """
+
+        return self._iter_pages(f'/v5_0/rkszones/{zone_id}/wlans', list_size=list_size,
+                                fields=fields)
+
+
+
+    def iter_apgroups(self, zone_id, list_size=200, fields=None):
+        """
+        Go over all AP groups of a zone, page by page
+
+        Parameters:
+        zone_id - zone ID value
+        list_size - number of AP groups in each page
+        fields - keys to keep of each AP group (e.g. ('id', 'name')), default all keys
+
+        Returns:
+        generator of AP groups (dict)
+        """
+
+        return self._iter_pages(f'/v5_0/rkszones/{zone_id}/apgroups', list_size=list_size,
+                                fields=fields)
+
+
+
+    def iter_aps(self, zone_id=None, list_size=1000, fields=None):
+        """
+        Go over all APs in the controller (or in one zone), page by page
+
+        Parameters:
+        zone_id - only the APs of this zone (default all APs)
+        list_size - number of APs in each page
+        fields - keys to keep of each AP (e.g. ('id', 'name')), default all keys
+
+        Returns:
+        generator of APs (dict)
+        """
+
+        params = {'domainId': self.domain_id}
+        if zone_id is not None:
+            params['zoneId'] = zone_id
+
+        return self._iter_pages('/v5_0/aps', params=params, list_size=list_size,
+                                fields=fields)
+
+
+
+    def iter_ap_status(self, zone_id=None, list_size=1000, fields=None):
+        """
+        Go over the status of all APs in the controller (or in one zone), page
+        by page, with the AP query (status, numClients, channel24G, channel50G
+        ... of every AP in one request per page)
+
+        Parameters:
+        zone_id - only the APs of this zone (default all APs)
+        list_size - number of APs in each page
+        fields - keys to keep of each AP (e.g. ('apMac', 'status')), default all keys
+
+        Returns:
+        generator of AP status (dict)
+        """
+
+        query = {'filters': [{'type': 'DOMAIN', 'value': self.domain_id}]}
+        if zone_id is not None:
+            query['filters'] = [{'type': 'ZONE', 'value': zone_id}]
+
+        return self._iter_pages('/v5_0/query/ap', list_size=list_size, fields=fields,
+                                query=query)
+
+
+
+    def zone_records(self, keep_raw=False):
+        """
+        Go over all zones as Zone records (see ruckus_records.py)
+
+        Parameters:
+        keep_raw - keep the rest of each zone's payload (record.raw)
+
+        Returns:
+        generator of Zone
+        """
+        # Without keep_raw, only the keys of the record are decoded from the response
+        fields = None if keep_raw else tuple(Zone.KEYS)
+        return Zone.parse_list(self.iter_zones(fields=fields), keep_raw)
+
+
+    def wlan_records(self, zone_id, keep_raw=False):
+        """
+        Go over all WLANs of a zone as Wlan records
+
+        Parameters:
+        zone_id - zone ID value
+        keep_raw - keep the rest of each WLAN's payload (record.raw)
+
+        Returns:
+        generator of Wlan
+        """
+        fields = None if keep_raw else tuple(Wlan.KEYS)
+        return Wlan.parse_list(self.iter_wlans(zone_id, fields=fields), keep_raw)
+
+
+    def apgroup_records(self, zone_id, keep_raw=False):
+        """
+        Go over all AP groups of a zone as ApGroup records
+
+        Parameters:
+        zone_id - zone ID value
+        keep_raw - keep the rest of each AP group's payload (record.raw)
+
+        Returns:
+        generator of ApGroup
+        """
+        fields = None if keep_raw else tuple(ApGroup.KEYS)
+        return ApGroup.parse_list(self.iter_apgroups(zone_id, fields=fields), keep_raw)
+
+
+    def ap_records(self, zone_id=None, keep_raw=False):
+        """
+        Go over all APs in the controller (or in one zone) as Ap records
+
+        Parameters:
+        zone_id - only the APs of this zone (default all APs)
+        keep_raw - keep the rest of each AP's payload (record.raw)
+
+        Returns:
+        generator of Ap
+        """
+        fields = None if keep_raw else tuple(Ap.KEYS)
+        return Ap.parse_list(self.iter_aps(zone_id, fields=fields), keep_raw)
+
+
+
+
     #----------------------------------------------------------------------
     #  The METHODS below are for ZONE based activities!
     #----------------------------------------------------------------------
@@ -89,9 +709,12 @@ class Ruckus:
         """
 
         if zone_id is None:
-            # Retrieve the list of AP zones that belong to a domain
-            zones = self.session.get(f'{self.scg200_uri}/v5_0/rkszones',\
-                                      params={'listSize':200}).json()
+            # Retrieve the list of AP zones that belong to a domain (all pages)
+            zone_list = list(self.iter_zones())
+            zones = {'totalCount': len(zone_list), 'hasMore': False, 'list': zone_list}
+            # The full list was just read, so keep the zone index up to date
+            with self._zone_lock:
+                self._set_zone_index(zone_list)
         else:
             # Retrieve the AP zone configuration
             zones = self.session.get(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}').json()
@@ -102,31 +725,99 @@ class Ruckus:
 
     def get_zone_id(self, zone):
         """
-        Get zone_id for a specific zone
+        Get zone_id for a specific zone from the zone index
 
         Parameters:
-        zone - zone name
+        zone - zone name (a zone_id is returned as is)
 
         Returns:
         zone_id - string
         """
 
-        # Get all zones info from the controller
-        zones = self.get_zones()
+        zones_by_name, zones_by_id = self.zone_index()
 
-        try:
-            for site in zones['list']:
-                if site['name']==zone:
-                    zone_id = site['id']
+        # A zone_id is accepted as well, so callers can pass either one
+        if zone in zones_by_id:
+            return zone
 
-        except ValueError:
-            print('Incorrect zone information!')
+        zone_id = zones_by_name.get(zone)
+        if zone_id is None:
+            print(f'Incorrect zone information! {zone} is not on the controller.')
 
         # Return zone_id
         return zone_id
 
 
 
+    def zone_index(self, refresh=False):
+        """
+        Get the zone index, reading all zones from the controller only when the
+        index is empty, older than zone_cache_ttl, or refresh is requested
+
+        Parameters:
+        refresh - re-read all zones from the controller
+
+        Returns:
+        zones_by_name - dict of zone name -> zone_id
+        zones_by_id - dict of zone_id -> zone
+        """
+
+        with self._zone_lock:
+            expired = time.monotonic() - self._zone_index_time > self.zone_cache_ttl
+            if refresh or self._zones_by_id is None or expired:
+                self._set_zone_index(list(self.iter_zones()))
+
+            return self._zones_by_name, self._zones_by_id
+
+
+
+    def refresh_zones(self):
+        """
+        Re-read all zones from the controller into the zone index
+
+        Parameters:
+
+        Returns:
+        zones_by_name - dict of zone name -> zone_id
+        zones_by_id - dict of zone_id -> zone
+        """
+
+        return self.zone_index(refresh=True)
+
+
+
+    def invalidate_zones(self):
+        """
+        Drop the zone index, so the next lookup reads all zones again
+
+        Parameters:
+
+        Returns:
+        """
+
+        with self._zone_lock:
+            self._zones_by_name = None
+            self._zones_by_id = None
+            self._zone_index_time = 0
+
+
+
+    def _set_zone_index(self, zone_list):
+        """
+        Build the zone index from a full list of zones
+
+        Parameters:
+        zone_list - list of zones (as returned by get_zones()['list'])
+
+        Returns:
+        """
+
+        self._zones_by_name = {site['name']: site['id'] for site in zone_list}
+        self._zones_by_id = {site['id']: site for site in zone_list}
+        self._zone_index_time = time.monotonic()
+
+
+
 
     def create_zone(self, zone_name, ap_login, domain_id=None, description='Test'):
         """
@@ -153,6 +844,9 @@ class Ruckus:
                            'login': ap_login, 'description': description, \
                            'version': version, 'countryCode': 'US'}).json()
 
+        # The zone list changed on the controller
+        self.invalidate_zones()
+
         print(f'Zone {zone_name} --> created successfully!')
 
 
@@ -169,9 +863,15 @@ class Ruckus:
 
         # Get zone_id from the zone name
         zone_id = self.get_zone_id(zone)
+        if zone_id is None:
+            return
 
         del_zone = self.session.delete(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}')
 
+        # The zone list changed on the controller
+        self.invalidate_zones()
+        self.invalidate_wlans(zone_id)
+
         # Print to the user whether the deletion was successful
         if del_zone.status_code==200:
             print(f'Response: {del_zone.status_code}. SUCCESSFULLY DELETED!')
@@ -192,6 +892,8 @@ class Ruckus:
 
         # Get zone Id
         zone_id = self.get_zone_id(zone)
+        if zone_id is None:
+            return
 
         mod_zone = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}', \
                                           json={'dfsChannelEnabled': True})
@@ -229,15 +931,13 @@ class Ruckus:
         # Check whether the user wants to change on Channel 2.4G, 5G, or both
         if channel=='both':
             print('Modifying channelfly on both 2.4GHz and 5GHz')
-            ch24 = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/'
-                f'autoChannelSelection24', json=channelfly)
-            ch50 = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/'
-                f'autoChannelSelection50', json=channelfly)
-            print('Channel 2.4G Response: ' + str(ch24.status_code))
-            print('Channel 5.0G Response: ' + str(ch50.status_code))
+            # Both radios go out in a single zone PATCH
+            (_, response), = self.zone_changes(zone_id).channel_selection(
+                channelfly, 'both').flush()
+            print('Channel 2.4G/5.0G Response: ' + str(response.status_code))
             print('\nThe expected response for both Channels is 204!\n')
 
-            return ch24
+            return response
 
         elif channel=='2.4':
             print('Modifying channelfly on 2.4GHz')
@@ -276,8 +976,8 @@ class Ruckus:
 
         print('\n\nApplying username/password change for AP Login!\n')
 
-        response = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/\
-            {zone_id}/login', json=aplogin)
+        response = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/'
+            f'{zone_id}/login', json=aplogin)
 
         # Compare response code and print out SUCCESS or FAILED
         if response.status_code == 204:
@@ -297,60 +997,62 @@ class Ruckus:
         channel - channel to update radio signals
 
         Returns:
+        responses - list of (endpoint, Response) sent
         """
 
         # Get zone Id
         zone_id = self.get_zone_id(zone)
+        if zone_id is None:
+            return []
 
         # Channels range to work on
         channel_range24 = [1, 6, 11]
         channel_range50 = [36, 44, 52, 60, 100, 108, 132, 149, 157]
         channel_range50_outdoor = [36, 44, 149, 157]
 
+        if channel not in ('both', '2.4', '5.0'):
+            print('You did not enter correct value!')
+            return []
+
         print('\nThe Acceptable TX Power values for both 2.4GHz and 5GHz are:-')
         print('Full, -1dB, -2dB, -3dB(1/2), -4dB, -5dB, -6dB(1/4), -7dB, -8dB, -9dB(1/8),\
          -10dB, Min\n\n')
 
+        # Collect the radio changes, so the zone gets them in a single PATCH
+        changes = self.zone_changes(zone_id)
 
-        if channel=='both':
+        if channel in ('both', '2.4'):
             # Ask the user to enter the TX power in dB - the list is provided in the previous print
             tx_power24 = input('Enter TX Power for 2.4GHz:  ')
-            tx_power50 = input('Enter TX Power for 5.0GHz:  ')
-
-            wifi24 = {'txPower':tx_power24, 'channelRange':channel_range24}
-            wifi50 = {'txPower':tx_power50, 'indoorChannelRange':channel_range50, \
-                              'outdoorChannelRange':channel_range50_outdoor}
+            changes.update('wifi24', txPower=tx_power24, channelRange=channel_range24)
 
+        if channel in ('both', '5.0'):
+            tx_power50 = input('Enter TX Power for 5.0GHz:  ')
+            changes.update('wifi50', txPower=tx_power50, indoorChannelRange=channel_range50,
+                           outdoorChannelRange=channel_range50_outdoor)
             # Enable DFS Channels to get 9 usable channels
-            self.modify_zone(zone_id)
+            changes.set(dfsChannelEnabled=True)
 
-            ch24 = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/wifi24', \
-                json=wifi24)
-            ch50 = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/wifi50', \
-                json=wifi50)
-            print('Channel 2.4G Response: ' + str(ch24.status_code))
-            print('Channel 5.0G Response: ' + str(ch50.status_code))
+        responses = changes.flush()
+        for endpoint, response in responses:
+            print(f'{endpoint} Response: {response.status_code}')
 
-        elif channel=='2.4':
-            tx_power24 = input('Enter TX power for 2.4GHz:  ')
-            wifi24 = {'txPower':tx_power24, 'channelRange':channel_range24}
-            ch24 = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/wifi24', \
-                json=wifi24)
-            print('Channel 2.4G Response: ' + str(ch24.status_code))
+        return responses
 
-        elif channel=='5.0':
-            tx_power50 = input('Enter TX Power for 5.0GHz:  ')
-            wifi50 = {'txPower':tx_power50, 'indoorChannelRange':channel_range50, \
-                              'outdoorChannelRange':channel_range50_outdoor}
 
-            # Enable DFS Channels to get 9 usable channels
-            self.modify_zone(zone_id)
+    def zone_changes(self, zone_id, coalesce=True):
+        """
+        Start a change set of a zone, to send the changes of several zone settings
+        (radios, channel selection, AP login, DFS) in one request
 
-            ch50 = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/wifi50', \
-                json=wifi50)
-            print('Channel 5.0G Response: ' + str(ch50.status_code))
-        else:
-            print('You did not enter correct value!')
+        Parameters:
+        zone_id - zone ID
+        coalesce - send all settings in one zone PATCH (False: one PATCH per setting)
+
+        Returns:
+        changes - ZoneChangeSet (call flush() to send)
+        """
+        return ZoneChangeSet(self, zone_id, coalesce)
 
 
 
@@ -358,73 +1060,210 @@ class Ruckus:
     # The METHODS below are for WLAN based activities!
     #-----------------------------------------------------------
 
-    def get_wlan_id(self, zone_id):
+    def build_wlan_index(self, zones=None, max_workers=None):
+        """
+        Read the WLANs of many zones in one parallel sweep and keep them in the
+        WLAN index, so later WLAN lookups of those zones need no request
+
+        Parameters:
+        zones - list of zones (default all zones in the controller)
+        max_workers - number of zones to read in parallel (default self.max_workers)
+
+        Returns:
+        wlan_index - dict of (zone_id, ssid) -> wlan
+        """
+
+        if zones is None:
+            zones = self.get_zones()['list']
+
+        results = self.run_zones(zones, lambda site: list(self.iter_wlans(site['id'])),
+                                 max_workers=max_workers)
+
+        for site, wlans in results:
+            if isinstance(wlans, Exception):
+                print(f"Failed to read WLANs of {site['name']}: {wlans}")
+                continue
+            self._index_wlans(site['id'], wlans)
+
+        return self._wlan_index
+
+
+
+    def _index_wlans(self, zone_id, wlans):
+        """
+        Put the WLANs of one zone in the WLAN index
+
+        Parameters:
+        zone_id - zone ID value
+        wlans - list of WLANs of the zone
+
+        Returns:
+        """
+
+        with self._wlan_lock:
+            # The new list replaces the zone's old one (WLANs may have been removed)
+            for key in [key for key in self._wlan_index if key[0] == zone_id]:
+                del self._wlan_index[key]
+            for wlan in wlans:
+                self._wlan_index[(zone_id, wlan['ssid'])] = wlan
+            self._wlan_zones[zone_id] = time.monotonic()
+
+
+
+    def find_wlan(self, zone_id, ssid='SFUSD', refresh=False):
+        """
+        Find the WLAN of an SSID in a zone. The zone's WLANs are read from the
+        controller only if the zone is not in the WLAN index, is older than
+        wlan_cache_ttl, or refresh is requested.
+
+        Parameters:
+        zone_id - zone ID value
+        ssid - SSID name
+        refresh - re-read the zone's WLANs from the controller
+
+        Returns:
+        wlan - dict (None if the zone has no such SSID)
+        """
+
+        indexed_at = self._wlan_zones.get(zone_id)
+        if refresh or indexed_at is None or \
+                time.monotonic() - indexed_at > self.wlan_cache_ttl:
+            self._index_wlans(zone_id, list(self.iter_wlans(zone_id)))
+
+        return self._wlan_index.get((zone_id, ssid))
+
+
+
+    def refresh_wlans(self, zone_id=None):
+        """
+        Re-read the WLANs of a zone (or of every zone in the WLAN index) from
+        the controller into the WLAN index
+
+        Parameters:
+        zone_id - zone ID value (default all zones in the WLAN index)
+
+        Returns:
+        count - number of zones re-read
+        """
+
+        if zone_id is not None:
+            self.find_wlan(zone_id, refresh=True)
+            return 1
+
+        _, zones_by_id = self.zone_index()
+        zones = [zones_by_id[zone] for zone in list(self._wlan_zones) if zone in zones_by_id]
+        # Zones no longer on the controller leave the index
+        self.invalidate_wlans()
+        self.build_wlan_index(zones)
+        return len(zones)
+
+
+
+    def invalidate_wlans(self, zone_id=None):
+        """
+        Drop the WLANs of a zone (or all WLANs) from the WLAN index, so the next
+        lookup reads them again
+
+        Parameters:
+        zone_id - zone ID value (default all zones)
+
+        Returns:
+        """
+
+        with self._wlan_lock:
+            if zone_id is None:
+                self._wlan_index.clear()
+                self._wlan_zones.clear()
+                return
+            for key in [key for key in self._wlan_index if key[0] == zone_id]:
+                del self._wlan_index[key]
+            self._wlan_zones.pop(zone_id, None)
+
+
+
+    def get_wlan_id(self, zone_id, ssid='SFUSD'):
         """
         Get wlan ID for SSIDs
 
         Parameters:
         zone_id - zone Id value
+        ssid - SSID name
 
         Returns:
-        wlan_id - string
+        wlan_id - string ('0' if the zone has no such SSID)
         """
 
-        # Get wlan List for the selected zone
-        wlan_list = self. session.get(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/wlans').json()
-        # Get the list of SSIDs and their related info
-        wlan_info = wlan_list['list']
-        # Initialize wlan_id with 0
-        wlan_id = '0'
-        # Go over each list until you find "SFUSD" SSID and grab "wlan_id"
-        for i in range(0,wlan_list['totalCount']):
-            # Return wlan_id if the SSID is 'SFUSD'
-            if wlan_info[i]['ssid'] == 'SFUSD':
-                wlan_id = wlan_info[i]['id']
-                break
+        wlan = self.find_wlan(zone_id, ssid)
+
         # Return wlan_id
-        return wlan_id
+        return wlan['id'] if wlan else '0'
 
 
 
-    def modify_wlan_auth(self, zone_id, wlan_id, \
-        auth_service_name ='F5-VIP-ISE-Radius'):
+    def modify_wlan_auth(self, zone_id, wlan_id=None, \
+        auth_service_name ='F5-VIP-ISE-Radius', ssid='SFUSD'):
         """
         Use to change the authentication service profile
 
         Parameters:
         zone_id - zone ID value
-        wlan_id - WLAN ID value
+        wlan_id - WLAN ID value (default: looked up from ssid in the WLAN index)
         auth_service_name - Name and UUID for the authentication service profile
                         --> '0df5e802-ab59-11ea-a492-94f6652af50d' for "F5-VIP-ISE-Radius"
                         --> 'd6b860c0-37a4-11e5-a220-94f6652af50d' for "NPS-Radius-Proxy"
+        ssid - SSID name, used when wlan_id is not given
 
         Returns:
+        status_code - return status_code to the calling function
         """
 
-        mod_wlan = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/wlans\
-            /{wlan_id}/authServiceOrProfile', json = {'name': auth_service_name})
+        looked_up = wlan_id is None
+        if looked_up:
+            wlan_id = self.get_wlan_id(zone_id, ssid)
+
+        mod_wlan = self.session.patch(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/wlans/'
+            f'{wlan_id}/authServiceOrProfile', json = {'name': auth_service_name})
+        # The WLAN was removed (or recreated) since it was indexed -- look it up again
+        if looked_up and mod_wlan.status_code == 404:
+            wlan = self.find_wlan(zone_id, ssid, refresh=True)
+            if wlan is not None and wlan['id'] != wlan_id:
+                mod_wlan = self.session.patch(f"{self.scg200_uri}/v5_0/rkszones/{zone_id}/"
+                    f"wlans/{wlan['id']}/authServiceOrProfile", json={'name': auth_service_name})
         # Print to the user whether the change was successful
         if mod_wlan.status_code == 204:
             print(f'Response: {mod_wlan.status_code}. SUCCESS!')
         else:
             print(f'Response: {mod_wlan.status_code}. CHANGE FAILED!')
 
+        return mod_wlan.status_code
+
 
 
-    def get_wlan_auth(self, zone_id, wlan_id):
+    def get_wlan_auth(self, zone_id, wlan_id=None, ssid='SFUSD'):
         """
         Use to retrieve wlan authentication profile info
 
         Parameters:
         zone_id - zone ID value
-        wlan_id - WLAN ID value
+        wlan_id - WLAN ID value (default: looked up from ssid in the WLAN index)
+        ssid - SSID name, used when wlan_id is not given
 
         Returns:
         auth_profile_name - string
         """
 
-        wlan_info = self.session.get(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/\
-            wlans/{wlan_id}').json()
+        looked_up = wlan_id is None
+        if looked_up:
+            wlan_id = self.get_wlan_id(zone_id, ssid)
+
+        response = self.session.get(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/wlans/{wlan_id}')
+        # The WLAN was removed (or recreated) since it was indexed -- look it up again
+        if looked_up and response.status_code == 404:
+            wlan = self.find_wlan(zone_id, ssid, refresh=True)
+            if wlan is not None:
+                response = self.session.get(
+                    f"{self.scg200_uri}/v5_0/rkszones/{zone_id}/wlans/{wlan['id']}")
+        wlan_info = response.json()
         auth_profile_name = wlan_info['authServiceOrProfile']['name']
         # Return authentication profile name
         return auth_profile_name
@@ -435,28 +1274,66 @@ class Ruckus:
     # The METHODS below are for AP based activities!
     #-----------------------------------------------------------
 
-    def apgroup_info(self, zone):
+    def apgroup_info(self, zone=None, max_workers=None):
         """
-        Info for an apgroup associated with the requested zone
+        Detailed info of the AP groups of one zone, or of all zones. The AP group
+        lists and then the AP group details are read in parallel.
 
         Parameters:
-        zone - zone name
+        zone - zone name or ID (default all zones in the controller)
+        max_workers - number of requests in parallel (default self.max_workers)
 
         Returns:
+        apgroups - list of AP group details (dicts), in zone order, each with
+                   zoneId and zoneName added
         """
 
-        # Get zone_id
-        zone_id = self.get_zone_id(zone)
-        apgroup = self.session.get(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/apgroups').json()
-
-        # Go over all AP Group lists
-        for i in range(0,len(apgroup['list'])):
-            # Get apgroup Id for each apgroup
-            apgroup_id = apgroup['list'][i]['id']
+        if max_workers is None:
+            max_workers = self.max_workers
 
-            # Print apgroup detailed info
-            print(self.session.get(f'{self.scg200_uri}/v5_0/rkszones/{zone_id}/apgroups\
-                /{apgroup_id}').json())
+        _, zones_by_id = self.zone_index()
+        if zone is None:
+            zones = list(zones_by_id.values())
+        else:
+            # Get zone_id (from the zone index)
+            zone_id = self.get_zone_id(zone)
+            if zone_id is None:
+                return []
+            zones = [zones_by_id[zone_id]]
+
+        # Go over the AP Group lists of all zones in one parallel sweep
+        groups = []
+        for site, apgroups in self.run_zones(
+                zones, lambda site: list(self.iter_apgroups(site['id'], fields=('id',))),
+                max_workers=max_workers):
+            if isinstance(apgroups, Exception):
+                print(f"Failed to read AP groups of {site['name']}: {apgroups}")
+                continue
+            groups.extend((site, apgroup['id']) for apgroup in apgroups)
+
+        def get_detail(group):
+            site, apgroup_id = group
+            response = self.session.get(f"{self.scg200_uri}/v5_0/rkszones/{site['id']}/"
+                                        f"apgroups/{apgroup_id}")
+            # An error body is not an AP group -- report it for this group instead
+            response.raise_for_status()
+            detail = response.json()
+            detail.setdefault('zoneId', site['id'])
+            detail['zoneName'] = site['name']
+            return detail
+
+        # Get the details of all AP Groups at the same time
+        apgroups = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [executor.submit(get_detail, group) for group in groups]
+            for (site, apgroup_id), future in zip(groups, futures):
+                if future.exception() is not None:
+                    print(f"Failed to read AP group {apgroup_id} of {site['name']}: "
+                          f"{future.exception()}")
+                    continue
+                apgroups.append(future.result())
+
+        return apgroups
 
 
 
@@ -475,37 +1352,151 @@ class Ruckus:
 
 
 
+    def ap_summary(self, ap_mac):
+        """
+        Get the operational summary of an AP (status, uptime, clients, ...)
+
+        Parameters:
+        ap_mac - MAC address of the AP
+
+        Returns:
+        summary - dict (None if the controller did not answer it)
+        """
+
+        summary = self.session.get(f'{self.scg200_uri}/v5_0/aps/{ap_mac}/operational/summary')
+        if summary.status_code != 200:
+            return None
+        return summary.json()
+
+
+
+    def ap_status(self, ap_mac):
+        """
+        Get the connection status of an AP (e.g. Online, Offline, Flagged)
+
+        Parameters:
+        ap_mac - MAC address of the AP
+
+        Returns:
+        status - string (None if the controller did not report it)
+        """
+
+        summary = self.ap_summary(ap_mac)
+        if summary is None:
+            return None
+        return summary.get('status') or summary.get('connectionState')
+
+
+
     def ap_reboot(self, ap_macs):
         """
-        Reboot a list of APs
+        Reboot a list of APs (in parallel, max_workers at a time)
 
         Parameters:
         ap_macs - list of APs MAC addresses
 
         Returns:
+        status_codes - dict of AP MAC -> response status_code
         """
 
-        for ap_mac in ap_macs:
-            ap_reboot = self.session.put(f'{self.scg200_uri}/v5_0/aps/{ap_mac}/reboot')
+        def reboot(ap_mac):
+            return self.session.put(f'{self.scg200_uri}/v5_0/aps/{ap_mac}/reboot').status_code
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            status_codes = dict(zip(ap_macs, executor.map(reboot, ap_macs)))
+
+        for ap_mac, status_code in status_codes.items():
+            print(f'{ap_mac} Reboot Response: {status_code}')
 
-            print(ap_reboot)
+        return status_codes
 
 
 
-    def ap_support_log(self, ap_mac):
+    def ap_support_log(self, ap_mac, folder='support_logs', chunk_size=64 * 1024):
         """
-        Get support log info for an AP
+        Download the support log of an AP to <folder>/<AP MAC>.log.gz. The body
+        is read from the socket chunk by chunk and gzip-compressed on the way to
+        the file, so the log is never held in memory as a whole.
 
         Parameters:
         ap_mac - MAC address of the AP of interest
+        folder - folder to write the log to
+        chunk_size - bytes to read from the socket at a time
 
         Returns:
-        supportLog - string
+        report - dict with mac, file, status_code, bytes (downloaded), stored
+                 (bytes on disk), seconds and error (None when it worked)
         """
 
-        # NOT WORKING YET!!
+        filename = os.path.join(folder, f"{ap_mac.replace(':', '')}.log.gz")
+        # Written to a .part file first, so a broken download never looks complete
+        temp = f'{filename}.part'
+        report = {'mac': ap_mac, 'file': None, 'status_code': None, 'bytes': 0, 'stored': 0,
+                  'seconds': 0.0, 'error': None}
 
-        return self.session.get(f'{self.scg200_uri}/v5_0/aps/{ap_mac}/supportLog')
+        start = time.perf_counter()
+        try:
+            with self.session.get(f'{self.scg200_uri}/v5_0/aps/{ap_mac}/supportLog',
+                                  stream=True) as response:
+                report['status_code'] = response.status_code
+                if response.status_code != 200:
+                    report['error'] = f'HTTP {response.status_code} {response.text[:200]}'
+                    return report
+
+                with gzip.open(temp, 'wb') as out_file:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        out_file.write(chunk)
+                        report['bytes'] += len(chunk)
+
+            os.replace(temp, filename)
+            report['file'] = filename
+            report['stored'] = os.path.getsize(filename)
+        except (requests.exceptions.RequestException, OSError) as err:
+            report['error'] = f'{type(err).__name__}: {err}'
+            if os.path.exists(temp):
+                os.remove(temp)
+        finally:
+            report['seconds'] = time.perf_counter() - start
+
+        return report
+
+
+
+    def collect_support_logs(self, ap_macs=None, zone_id=None, folder='support_logs',
+                             max_workers=None):
+        """
+        Download the support logs of a list of APs (or of all APs of a zone) in
+        parallel, max_workers at a time (see ap_support_log)
+
+        Parameters:
+        ap_macs - list of APs MAC addresses
+        zone_id - all APs of this zone (when ap_macs is not given)
+        folder - folder to write the logs to
+        max_workers - downloads in parallel (default self.max_workers)
+
+        Returns:
+        reports - list of ap_support_log reports, in the order of the APs
+        """
+
+        if ap_macs is None:
+            ap_macs = [ap.mac for ap in self.ap_records(zone_id)]
+        os.makedirs(folder, exist_ok=True)
+
+        reports = {}
+        workers = max(1, max_workers or self.max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.ap_support_log, ap_mac, folder)
+                       for ap_mac in ap_macs]
+            for future in as_completed(futures):
+                report = future.result()
+                reports[report['mac']] = report
+                if report['error'] is None:
+                    print(f"{report['mac']} Support Log: {report['bytes']} bytes "
+                          f"({report['stored']} compressed) in {report['seconds']:.1f} seconds")
+                else:
+                    print(f"{report['mac']} Support Log ... FAILED! {report['error']}")
+
+        return [reports[ap_mac] for ap_mac in ap_macs]
 
 
 
@@ -524,6 +1515,51 @@ class Ruckus:
 
 
 
+    #-----------------------------------------------------------
+    # The METHOD below runs zone based activities in bulk!
+    #-----------------------------------------------------------
+
+    def run_zones(self, zones, operation, *args, max_workers=None, on_result=None):
+        """
+        Run an operation on each zone using a bounded pool of workers
+
+        Parameters:
+        zones - list of zones (as returned by get_zones()['list'])
+        operation - function called as operation(site, *args) for each zone
+        args - extra arguments passed to operation
+        max_workers - number of zones to work on in parallel (default self.max_workers)
+        on_result - function called as on_result(site, result) as soon as each
+                    zone finishes (e.g. to checkpoint it), in the calling thread
+
+        Returns:
+        results - list of (site, result) in the same order as zones. If the
+                  operation raised an exception, result is the exception.
+        """
+
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        def run_one(site):
+            # Keep one failing zone from stopping the rest of the zones
+            try:
+                return operation(site, *args)
+            except Exception as err:      # pylint: disable=broad-except
+                return err
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [executor.submit(run_one, site) for site in zones]
+            if on_result is not None:
+                # Report each zone in the order they finish
+                positions = {future: position for position, future in enumerate(futures)}
+                for future in as_completed(futures):
+                    on_result(zones[positions[future]], future.result())
+
+        # The results are returned in the order the zones were given
+        return [(site, future.result()) for site, future in zip(zones, futures)]
+
+
+
+
     #----------------------------------------------------------------------------------------
     # The METHOD below closes the Session you opened when you instantiate the Ruckus Object!
     #----------------------------------------------------------------------------------------
@@ -538,3 +1574,7 @@ class Ruckus:
         """
 
         self.session.delete(f'{self.scg200_uri}/v5_0/session', verify=False)
+
+        # The cached session is no longer valid
+        if self.session_file is not None and os.path.exists(self.session_file):
+            os.remove(self.session_file)
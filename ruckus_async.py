@@ -0,0 +1,814 @@
+"""
+asyncio version of the Ruckus class to interact with Ruckus SCG200.
+
+It has the same methods as the Ruckus class in ruckus.py, but each method is a
+coroutine, so hundreds of controller requests can be in flight from a single
+thread (e.g. when touching every zone or every AP).
+
+Usage:
+    async with AsyncRuckus(controller_ip, username, password) as apr:
+        zones = (await apr.get_zones())['list']
+        results = await apr.run_zones(zones, lambda site: apr.get_wlan_id(site['id']))
+
+Author:     Meheretab Mengistu
+Version:    1.0
+Requires:   aiohttp
+"""
+
+# Import asyncio and aiohttp to work on Ruckus REST API asynchronously
+import asyncio
+from collections import namedtuple
+import gzip
+import os
+import time
+import aiohttp
+from ruckus_changeset import ZoneChangeSet
+
+
+# Response returned by methods which return the Response object in Ruckus.
+#   The body is already read, so it can be used after the request is closed.
+Response = namedtuple('Response', ['status_code', 'text'])
+
+
+class AsyncRuckus:
+    """
+    AsyncRuckus class to instantiate an asyncio based Ruckus object
+    """
+
+    # Initialize the object -- take username, password during initialization
+    #   max_connections - how many requests can be in flight to the controller
+    #   zone_cache_ttl - seconds to keep the zone name/id index before re-reading it
+    def __init__(self, controller_ip, username, password, max_connections=100,
+                 zone_cache_ttl=300):
+
+        # URI for SCG 200 to connect to and user_info
+        #   A full base URL (e.g. http://127.0.0.1:8080 for scg200_sim.py) is used as is
+        if '://' in controller_ip:
+            self.scg200_uri = f"{controller_ip.rstrip('/')}/wsg/api/public"
+        else:
+            self.scg200_uri = f'https://{controller_ip}:8443/wsg/api/public'
+        self.user_info = {'username': username, 'password': password}
+        self.max_connections = max_connections
+
+        self.session = None
+        self.session_info = None
+        self.domain_id = None
+
+        # Zone index (zone name -> zone_id and zone_id -> zone), filled on first use
+        self.zone_cache_ttl = zone_cache_ttl
+        self._zones_by_name = None
+        self._zones_by_id = None
+        self._zone_index_time = 0
+        self._zone_lock = None
+
+
+    async def __aenter__(self):
+        await self.log_in()
+        return self
+
+
+    async def __aexit__(self, *exc_info):
+        await self.log_out()
+
+
+
+    #-------------------------------------------------------------------------
+    #   The METHODS below open the Session and send the requests!
+    #-------------------------------------------------------------------------
+
+    async def log_in(self):
+        """
+        Create the session and log in to the SCG200 API
+
+        Parameters:
+
+        Returns:
+        """
+
+        # Created here, inside the event loop which will use it
+        self._zone_lock = asyncio.Lock()
+
+        # The controller uses a self-signed certificate (verify=False in Ruckus)
+        connector = aiohttp.TCPConnector(ssl=False, limit=self.max_connections)
+        # unsafe=True keeps the session cookie when the controller is an IP address
+        self.session = aiohttp.ClientSession(connector=connector,
+                                             cookie_jar=aiohttp.CookieJar(unsafe=True))
+
+        await self._request('POST', '/v5_0/session', json=self.user_info)
+
+        # Get session info and domain_id
+        self.session_info = await self._get_json('/v5_0/session')
+        self.domain_id = self.session_info['domainId']
+
+
+    async def _request(self, method, path, **kwargs):
+        """
+        Send one request to the controller and read the whole body
+
+        Parameters:
+        method - HTTP method
+        path - path under the public API URI (e.g. /v5_0/rkszones)
+        kwargs - passed to aiohttp (json, params ...)
+
+        Returns:
+        response - Response (status_code, text)
+        """
+
+        async with self.session.request(method, f'{self.scg200_uri}{path}', **kwargs) as resp:
+            return Response(resp.status, await resp.text())
+
+
+    async def _get_json(self, path, **kwargs):
+        """
+        GET a path and decode the JSON body
+
+        Parameters:
+        path - path under the public API URI
+        kwargs - passed to aiohttp (params ...)
+
+        Returns:
+        data - decoded JSON
+        """
+
+        async with self.session.get(f'{self.scg200_uri}{path}', **kwargs) as resp:
+            return await resp.json(content_type=None)
+
+
+    async def _iter_pages(self, path, params=None, list_size=200):
+        """
+        Go over every item of a list endpoint, one page at a time (async generator)
+
+        Parameters:
+        path - path under the public API URI (e.g. /v5_0/rkszones)
+        params - extra query parameters
+        list_size - number of items to ask for in each page
+
+        Returns:
+        async generator of list items (dict); aiohttp.ClientResponseError is
+        raised when a page is not answered with 200
+        """
+
+        index = 0
+        while True:
+            page_params = dict(params or {}, index=index, listSize=list_size)
+            async with self.session.get(f'{self.scg200_uri}{path}', params=page_params) as resp:
+                # A failed page must not look like the end of the list
+                resp.raise_for_status()
+                page = await resp.json(content_type=None)
+
+            items = page.get('list', [])
+            for item in items:
+                yield item
+
+            if not page.get('hasMore') or not items:
+                return
+            index += len(items)
+
+
+    def iter_zones(self, list_size=200):
+        """
+        Go over all zones in the controller, page by page (async generator)
+        """
+        return self._iter_pages('/v5_0/rkszones', list_size=list_size)
+
+
+    def iter_wlans(self, zone_id, list_size=200):
+        """
+        Go over all WLANs of a zone, page by page (async generator)
+        """
+        return self._iter_pages(f'/v5_0/rkszones/{zone_id}/wlans', list_size=list_size)
+
+
+    def iter_apgroups(self, zone_id, list_size=200):
+        """
+        Go over all AP groups of a zone, page by page (async generator)
+        """
+        return self._iter_pages(f'/v5_0/rkszones/{zone_id}/apgroups', list_size=list_size)
+
+
+    def iter_aps(self, zone_id=None, list_size=1000):
+        """
+        Go over all APs in the controller (or in one zone), page by page (async generator)
+        """
+        params = {'domainId': self.domain_id}
+        if zone_id is not None:
+            params['zoneId'] = zone_id
+        return self._iter_pages('/v5_0/aps', params=params, list_size=list_size)
+
+
+
+    #-------------------------------------------------------------------------
+    #   The METHODS below are for general Controller related information!
+    #-------------------------------------------------------------------------
+
+    async def system_summary(self):
+        """
+        Retrieve the system summary
+        """
+        return await self._get_json('/v5_0/controller')
+
+
+    async def get_ap_count(self):
+        """
+        Get the total number of APs in the Controller
+        """
+        return await self._get_json('/v5_0/aps/totalCount',
+                                    params={'domain_id': self.domain_id})
+
+
+    async def ap_models(self):
+        """
+        Retrieve all AP Models in the system
+        """
+        apmodels = await self._request('GET', '/v5_0/system/apmodels')
+
+        if apmodels.status_code == 200:
+            print('All AP Models on the controller are reported correctly!')
+            print('\n\n' + apmodels.text + '\n\n')
+        else:
+            print('Something went wrong!')
+
+
+
+    #----------------------------------------------------------------------
+    #  The METHODS below are for ZONE based activities!
+    #----------------------------------------------------------------------
+
+    async def get_zones(self, zone_id=None):
+        """
+        Get zone information from the controller
+
+        Parameters:
+        zone_id - zone ID number
+
+        Returns:
+        zones - json file
+        """
+
+        if zone_id is None:
+            # Retrieve the list of AP zones that belong to a domain (all pages)
+            zone_list = [site async for site in self.iter_zones()]
+            # The full list was just read, so keep the zone index up to date
+            self._set_zone_index(zone_list)
+            return {'totalCount': len(zone_list), 'hasMore': False, 'list': zone_list}
+
+        # Retrieve the AP zone configuration
+        return await self._get_json(f'/v5_0/rkszones/{zone_id}')
+
+
+    async def get_zone_id(self, zone):
+        """
+        Get zone_id for a specific zone from the zone index
+
+        Parameters:
+        zone - zone name (a zone_id is returned as is)
+
+        Returns:
+        zone_id - string (None if the zone is not on the controller)
+        """
+
+        zones_by_name, zones_by_id = await self.zone_index()
+
+        # A zone_id is accepted as well, so callers can pass either one
+        if zone in zones_by_id:
+            return zone
+
+        zone_id = zones_by_name.get(zone)
+        if zone_id is None:
+            print(f'Incorrect zone information! {zone} is not on the controller.')
+
+        return zone_id
+
+
+    async def zone_index(self, refresh=False):
+        """
+        Get the zone index, reading all zones from the controller only when the
+        index is empty, older than zone_cache_ttl, or refresh is requested
+
+        Parameters:
+        refresh - re-read all zones from the controller
+
+        Returns:
+        zones_by_name - dict of zone name -> zone_id
+        zones_by_id - dict of zone_id -> zone
+        """
+
+        # One coroutine reads the zones; the others wait for its index
+        async with self._zone_lock:
+            expired = time.monotonic() - self._zone_index_time > self.zone_cache_ttl
+            if refresh or self._zones_by_id is None or expired:
+                self._set_zone_index([site async for site in self.iter_zones()])
+
+            return self._zones_by_name, self._zones_by_id
+
+
+    async def refresh_zones(self):
+        """
+        Re-read all zones from the controller into the zone index
+        """
+        return await self.zone_index(refresh=True)
+
+
+    def invalidate_zones(self):
+        """
+        Drop the zone index, so the next lookup reads all zones again
+        """
+        self._zones_by_name = None
+        self._zones_by_id = None
+        self._zone_index_time = 0
+
+
+    def _set_zone_index(self, zone_list):
+        """
+        Build the zone index from a full list of zones
+        """
+        self._zones_by_name = {site['name']: site['id'] for site in zone_list}
+        self._zones_by_id = {site['id']: site for site in zone_list}
+        self._zone_index_time = time.monotonic()
+
+
+    async def create_zone(self, zone_name, ap_login, domain_id=None, description='Test'):
+        """
+        Create a new zone on the controller
+
+        Parameters:
+        zone_name - name for the zone to be created
+        ap_login - login credential for the APs
+        domain_id - domain Id for the controller
+        description - description for the zone
+
+        Returns:
+        """
+
+        # Controller Version
+        version = '3.5.1.0.1026'
+
+        # If no new domain_id info is passed, use the system domain_id
+        if domain_id is None:
+            domain_id = self.domain_id
+
+        await self._request('POST', '/v5_0/rkszones', json={
+            'domain_id': domain_id, 'name': zone_name, 'login': ap_login,
+            'description': description, 'version': version, 'countryCode': 'US'})
+
+        # The zone list changed on the controller
+        self.invalidate_zones()
+
+        print(f'Zone {zone_name} --> created successfully!')
+
+
+    async def delete_zone(self, zone):
+        """
+        Delete a zone
+
+        Parameters:
+        zone - zone to delete from the controller
+
+        Returns:
+        """
+
+        zone_id = await self.get_zone_id(zone)
+        if zone_id is None:
+            return
+
+        del_zone = await self._request('DELETE', f'/v5_0/rkszones/{zone_id}')
+
+        # The zone list changed on the controller
+        self.invalidate_zones()
+
+        # Print to the user whether the deletion was successful
+        if del_zone.status_code == 200:
+            print(f'Response: {del_zone.status_code}. SUCCESSFULLY DELETED!')
+        else:
+            print(f'Response: {del_zone.status_code}. FAILED TO DELETE!')
+
+
+    async def modify_zone(self, zone):
+        """
+        Modify basic information of a zone - specifically DFS Channels
+
+        Parameters:
+        zone - zone name
+
+        Returns:
+        """
+
+        zone_id = await self.get_zone_id(zone)
+        if zone_id is None:
+            return
+
+        mod_zone = await self._request('PATCH', f'/v5_0/rkszones/{zone_id}',
+                                       json={'dfsChannelEnabled': True})
+
+        # Print to the user whether the modification is successful
+        if mod_zone.status_code == 204:
+            print(f'Response: {mod_zone.status_code}. SUCCESS!')
+        else:
+            print(f'Response: {mod_zone.status_code}. CHANGE FAILED!')
+
+
+    async def channelfly(self, zone_id, turn_off, channel):
+        """
+        Turn ON/OFF channelfly for a zone
+
+        Parameters:
+        Zone_id - zone ID
+        Turn_off - whether to turn_off Channelfly
+        Channel - channel to work on (2.4, 5.0, both)
+
+        Returns:
+        Output:    Response status_code (204)
+        """
+
+        # Check whether the user wants to Turn ON ChannelFly, BackgroundScanning, or Not
+        if turn_off.upper() == 'N':
+            channelfly = {'channelSelectMode': 'ChannelFly', 'channelFlyMtbc': 480}
+        elif turn_off.upper() == 'B':
+            channelfly = {'channelSelectMode': 'BackgroundScanning', 'channelFlyMtbc': 480}
+        else:
+            channelfly = {'channelSelectMode': 'None'}
+
+        path = f'/v5_0/rkszones/{zone_id}/autoChannelSelection'
+
+        # Check whether the user wants to change on Channel 2.4G, 5G, or both
+        if channel == 'both':
+            # Both radios go out in a single zone PATCH
+            (_, response), = await self.flush_changes(
+                ZoneChangeSet(self, zone_id).channel_selection(channelfly, 'both'))
+            print(f'{zone_id} Channel 2.4G/5.0G Response: {response.status_code}')
+            return response
+
+        if channel == '2.4':
+            ch24 = await self._request('PATCH', f'{path}24', json=channelfly)
+            print(f'{zone_id} Channel 2.4G Response: {ch24.status_code}')
+            return ch24
+
+        if channel == '5.0':
+            ch50 = await self._request('PATCH', f'{path}50', json=channelfly)
+            print(f'{zone_id} Channel 5.0G Response: {ch50.status_code}')
+            return ch50
+
+        print('You have entered wrong channel information!')
+        return None
+
+
+    async def update_ap_login(self, zone_id, aplogin):
+        """
+        Change AP Login username/password for a zone
+
+        Parameters:
+        zone_id - zone ID
+        aplogin - login credentials for the APs
+
+        Returns:
+        status_code - return status_code to the calling function
+        """
+
+        response = await self._request('PATCH', f'/v5_0/rkszones/{zone_id}/login', json=aplogin)
+
+        # Compare response code and print out SUCCESS or FAILED
+        if response.status_code == 204:
+            print(f'{zone_id} Username/password for AP Login is SUCCESSFULLY CHANGED!')
+        else:
+            print(f'{zone_id} Username/password change FAILED!')
+
+        return response.status_code
+
+
+    async def update_radio(self, zone, channel='both', tx_power24=None, tx_power50=None):
+        """
+        To modify 2.4G & 5G radio configuration for APs that belong to a zone
+
+        Parameters:
+        zone - zone name
+        channel - channel to update radio signals
+        tx_power24 - TX power for 2.4GHz (asked from the user if not given)
+        tx_power50 - TX power for 5.0GHz (asked from the user if not given)
+
+        Returns:
+        """
+
+        zone_id = await self.get_zone_id(zone)
+        if zone_id is None:
+            return
+
+        # Channels range to work on
+        channel_range24 = [1, 6, 11]
+        channel_range50 = [36, 44, 52, 60, 100, 108, 132, 149, 157]
+        channel_range50_outdoor = [36, 44, 149, 157]
+
+        if channel not in ('both', '2.4', '5.0'):
+            print('You did not enter correct value!')
+            return
+
+        # Collect the radio changes, so the zone gets them in a single PATCH
+        changes = ZoneChangeSet(self, zone_id)
+
+        if channel in ('both', '2.4'):
+            tx_power24 = tx_power24 or input('Enter TX Power for 2.4GHz:  ')
+            changes.update('wifi24', txPower=tx_power24, channelRange=channel_range24)
+
+        if channel in ('both', '5.0'):
+            tx_power50 = tx_power50 or input('Enter TX Power for 5.0GHz:  ')
+            changes.update('wifi50', txPower=tx_power50, indoorChannelRange=channel_range50,
+                           outdoorChannelRange=channel_range50_outdoor)
+            # Enable DFS Channels to get 9 usable channels
+            changes.set(dfsChannelEnabled=True)
+
+        for endpoint, response in await self.flush_changes(changes):
+            print(f'{zone} {endpoint} Response: {response.status_code}')
+
+
+
+    async def flush_changes(self, changes):
+        """
+        Send the changes collected in a ZoneChangeSet (see ruckus_changeset.py)
+
+        Parameters:
+        changes - ZoneChangeSet of a zone
+
+        Returns:
+        responses - list of (endpoint, Response)
+        """
+
+        plan = changes.plan()
+        changes.clear()
+        # When the changes cannot go together, the requests are sent at the same time
+        responses = await asyncio.gather(*[
+            self._request('PATCH', f'/v5_0/rkszones/{changes.zone_id}{path}', json=body)
+            for _, path, body in plan])
+        return [(endpoint, response) for (endpoint, _, _), response in zip(plan, responses)]
+
+
+
+    #-----------------------------------------------------------
+    # The METHODS below are for WLAN based activities!
+    #-----------------------------------------------------------
+
+    async def get_wlan_id(self, zone_id):
+        """
+        Get wlan ID for SSIDs
+
+        Parameters:
+        zone_id - zone Id value
+
+        Returns:
+        wlan_id - string
+        """
+
+        # Go over each list until you find "SFUSD" SSID and grab "wlan_id"
+        async for wlan in self.iter_wlans(zone_id):
+            if wlan['ssid'] == 'SFUSD':
+                return wlan['id']
+
+        return '0'
+
+
+    async def modify_wlan_auth(self, zone_id, wlan_id, auth_service_name='F5-VIP-ISE-Radius'):
+        """
+        Use to change the authentication service profile
+
+        Parameters:
+        zone_id - zone ID value
+        wlan_id - WLAN ID value
+        auth_service_name - Name for the authentication service profile
+
+        Returns:
+        """
+
+        mod_wlan = await self._request(
+            'PATCH', f'/v5_0/rkszones/{zone_id}/wlans/{wlan_id}/authServiceOrProfile',
+            json={'name': auth_service_name})
+
+        # Print to the user whether the change was successful
+        if mod_wlan.status_code == 204:
+            print(f'Response: {mod_wlan.status_code}. SUCCESS!')
+        else:
+            print(f'Response: {mod_wlan.status_code}. CHANGE FAILED!')
+
+
+    async def get_wlan_auth(self, zone_id, wlan_id):
+        """
+        Use to retrieve wlan authentication profile info
+
+        Parameters:
+        zone_id - zone ID value
+        wlan_id - WLAN ID value
+
+        Returns:
+        auth_profile_name - string
+        """
+
+        wlan_info = await self._get_json(f'/v5_0/rkszones/{zone_id}/wlans/{wlan_id}')
+        return wlan_info['authServiceOrProfile']['name']
+
+
+
+    #-----------------------------------------------------------
+    # The METHODS below are for AP based activities!
+    #-----------------------------------------------------------
+
+    async def apgroup_info(self, zone):
+        """
+        Info for an apgroup associated with the requested zone
+
+        Parameters:
+        zone - zone name
+
+        Returns:
+        apgroups - list of AP group details (dicts)
+        """
+
+        zone_id = await self.get_zone_id(zone)
+        if zone_id is None:
+            return []
+        apgroups = [group async for group in self.iter_apgroups(zone_id)]
+
+        # Get all AP Group details at the same time
+        return await asyncio.gather(*[
+            self._get_json(f'/v5_0/rkszones/{zone_id}/apgroups/{group["id"]}')
+            for group in apgroups])
+
+
+    async def ap_info(self, ap_mac):
+        """
+        Provide AP information
+
+        Parameters:
+        ap_mac - MAC address of the AP
+
+        Returns:
+        apinfo - string
+        """
+
+        return await self._get_json(f'/v5_0/aps/{ap_mac}')
+
+
+    async def ap_reboot(self, ap_macs):
+        """
+        Reboot a list of APs
+
+        Parameters:
+        ap_macs - list of APs MAC addresses
+
+        Returns:
+        """
+
+        responses = await asyncio.gather(*[
+            self._request('PUT', f'/v5_0/aps/{ap_mac}/reboot') for ap_mac in ap_macs])
+
+        for ap_mac, response in zip(ap_macs, responses):
+            print(f'{ap_mac} Reboot Response: {response.status_code}')
+
+
+    async def ap_support_log(self, ap_mac, folder='support_logs', chunk_size=64 * 1024):
+        """
+        Download the support log of an AP to <folder>/<AP MAC>.log.gz, streamed
+        and gzip-compressed chunk by chunk (see Ruckus.ap_support_log)
+
+        Parameters:
+        ap_mac - MAC address of the AP of interest
+        folder - folder to write the log to
+        chunk_size - bytes to read from the socket at a time
+
+        Returns:
+        report - dict with mac, file, status_code, bytes (downloaded), stored
+                 (bytes on disk), seconds and error (None when it worked)
+        """
+
+        filename = os.path.join(folder, f"{ap_mac.replace(':', '')}.log.gz")
+        temp = f'{filename}.part'
+        report = {'mac': ap_mac, 'file': None, 'status_code': None, 'bytes': 0, 'stored': 0,
+                  'seconds': 0.0, 'error': None}
+
+        start = time.perf_counter()
+        try:
+            async with self.session.get(
+                    f'{self.scg200_uri}/v5_0/aps/{ap_mac}/supportLog') as resp:
+                report['status_code'] = resp.status
+                if resp.status != 200:
+                    report['error'] = f'HTTP {resp.status} {(await resp.text())[:200]}'
+                    return report
+
+                with gzip.open(temp, 'wb') as out_file:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        out_file.write(chunk)
+                        report['bytes'] += len(chunk)
+
+            os.replace(temp, filename)
+            report['file'] = filename
+            report['stored'] = os.path.getsize(filename)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
+            report['error'] = f'{type(err).__name__}: {err}'
+            if os.path.exists(temp):
+                os.remove(temp)
+        finally:
+            report['seconds'] = time.perf_counter() - start
+
+        return report
+
+
+    async def collect_support_logs(self, ap_macs=None, zone_id=None, folder='support_logs',
+                                   max_workers=None):
+        """
+        Download the support logs of a list of APs (or of all APs of a zone),
+        max_workers at a time
+
+        Parameters:
+        ap_macs - list of APs MAC addresses
+        zone_id - all APs of this zone (when ap_macs is not given)
+        folder - folder to write the logs to
+        max_workers - downloads in flight (default max_connections)
+
+        Returns:
+        reports - list of ap_support_log reports, in the order of the APs
+        """
+
+        if ap_macs is None:
+            ap_macs = [ap['mac'] async for ap in self.iter_aps(zone_id)]
+        os.makedirs(folder, exist_ok=True)
+
+        semaphore = asyncio.Semaphore(max_workers or self.max_connections)
+
+        async def collect(ap_mac):
+            async with semaphore:
+                report = await self.ap_support_log(ap_mac, folder)
+            if report['error'] is None:
+                print(f"{ap_mac} Support Log: {report['bytes']} bytes "
+                      f"({report['stored']} compressed) in {report['seconds']:.1f} seconds")
+            else:
+                print(f"{ap_mac} Support Log ... FAILED! {report['error']}")
+            return report
+
+        return await asyncio.gather(*[collect(ap_mac) for ap_mac in ap_macs])
+
+
+    async def ap_blink_led(self, ap_mac):
+        """
+        Blink LED to identify an AP from a group of APs installed
+
+        Parameters:
+        ap_mac - MAC address of the AP
+
+        Returns:
+        """
+
+        await self._request('POST', f'/v5_0/aps/{ap_mac}/operational/blinkLed')
+
+
+
+    #-----------------------------------------------------------
+    # The METHOD below runs zone based activities in bulk!
+    #-----------------------------------------------------------
+
+    async def run_zones(self, zones, operation, *args, max_workers=None):
+        """
+        Run a coroutine on each zone, with at most max_workers zones in flight
+
+        Parameters:
+        zones - list of zones (as returned by get_zones()['list'])
+        operation - coroutine function called as operation(site, *args)
+        args - extra arguments passed to operation
+        max_workers - number of zones to work on at the same time
+                      (default max_connections)
+
+        Returns:
+        results - list of (site, result) in the same order as zones. If the
+                  operation raised an exception, result is the exception.
+        """
+
+        semaphore = asyncio.Semaphore(max_workers or self.max_connections)
+
+        async def run_one(site):
+            async with semaphore:
+                return await operation(site, *args)
+
+        # gather returns the results in the order the zones were given
+        results = await asyncio.gather(*[run_one(site) for site in zones],
+                                       return_exceptions=True)
+
+        return list(zip(zones, results))
+
+
+
+    #----------------------------------------------------------------------------------------
+    # The METHOD below closes the Session you opened when you log in!
+    #----------------------------------------------------------------------------------------
+
+    async def log_out(self):
+        """
+        Log out of the SCG200 API and close the session
+
+        Parameters:
+
+        Returns:
+        """
+
+        if self.session is None:
+            return
+
+        try:
+            await self._request('DELETE', '/v5_0/session')
+        finally:
+            await self.session.close()
+            self.session = None
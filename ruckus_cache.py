@@ -0,0 +1,254 @@
+"""
+Opt-in on-disk cache for the read-only endpoints of the controller.
+
+GET responses of the endpoints listed in the TTL table are kept on disk, keyed
+by URL and query parameters. A fresh entry is answered without a request; a
+stale entry is revalidated with If-None-Match / If-Modified-Since when the
+controller sent an ETag / Last-Modified, so an unchanged body is not downloaded
+again. The least recently used entries are evicted when the cache grows past
+max_bytes, and a write (PATCH/POST/PUT/DELETE) drops the cached entries under
+the written path.
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from ruckus_metrics import template_path
+
+
+# Seconds to keep each read-only endpoint (templated path, see ruckus_metrics)
+DEFAULT_TTLS = {
+    '/v5_0/controller': 3600,
+    '/v5_0/system/apmodels': 86400,
+    '/v5_0/rkszones': 600,
+    '/v5_0/rkszones/{id}': 600,
+}
+
+# Response headers kept with the body
+_KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class ResponseCache:
+    """
+    ResponseCache class to keep GET responses on disk
+    """
+
+    def __init__(self, cache_dir, ttls=None, max_bytes=50 * 1024 * 1024, namespace=''):
+        """
+        Parameters:
+        cache_dir - folder to keep the cached responses in
+        ttls - dict of templated path -> seconds (default DEFAULT_TTLS)
+        max_bytes - size of the cache before the least recently used entries go
+        namespace - added to every key (e.g. the username), so users who may
+                    see different data do not share entries
+        """
+
+        self.cache_dir = cache_dir
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+        # key -> URL path of every entry, so invalidate() does not read every file
+        self._paths_by_key = {}
+        for name in os.listdir(cache_dir):
+            if name.endswith('.meta'):
+                try:
+                    with open(os.path.join(cache_dir, name)) as meta_file:
+                        self._paths_by_key[name[:-len('.meta')]] = json.load(meta_file)['path']
+                except (OSError, ValueError, KeyError):
+                    continue
+
+
+    def ttl(self, url):
+        """
+        Seconds to keep the responses of a URL (None if it is not cached)
+        """
+        return self.ttls.get(template_path(url))
+
+
+    def _key(self, url):
+        return hashlib.sha256(f'{self.namespace}|{url}'.encode()).hexdigest()
+
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return f'{base}.meta', f'{base}.body'
+
+
+    def get(self, url):
+        """
+        Get the cached entry of a URL
+
+        Parameters:
+        url - full URL including the query string
+
+        Returns:
+        entry - dict with url, path, status, headers, stored_at, body (None if not cached)
+        """
+
+        meta_path, body_path = self._paths(self._key(url))
+        try:
+            with open(meta_path) as meta_file:
+                entry = json.load(meta_file)
+            with open(body_path, 'rb') as body_file:
+                entry['body'] = body_file.read()
+        except (OSError, ValueError):
+            return None
+
+        # Mark the entry as recently used for the LRU eviction
+        os.utime(body_path)
+        return entry
+
+
+    def is_fresh(self, entry):
+        """
+        Whether a cached entry is younger than the TTL of its endpoint
+        """
+        ttl = self.ttl(entry['url'])
+        return ttl is not None and time.time() - entry['stored_at'] < ttl
+
+
+    def put(self, url, response):
+        """
+        Store a 200 response of a URL
+
+        Parameters:
+        url - full URL including the query string
+        response - requests Response
+
+        Returns:
+        """
+
+        headers = {name: response.headers[name] for name in _KEPT_HEADERS
+                   if name in response.headers}
+        entry = {'url': url, 'path': requests.utils.urlparse(url).path,
+                 'status': response.status_code, 'headers': headers, 'stored_at': time.time()}
+        self._write(self._key(url), entry, response.content)
+        self._evict()
+
+
+    def refresh(self, url, entry, response):
+        """
+        Mark a cached entry as fresh again after a 304 Not Modified
+
+        Parameters:
+        url - full URL including the query string
+        entry - cached entry
+        response - the 304 response (may carry a new ETag / Last-Modified)
+
+        Returns:
+        """
+
+        entry = dict(entry)
+        body = entry.pop('body')
+        for name in _KEPT_HEADERS:
+            if name in response.headers:
+                entry['headers'][name] = response.headers[name]
+        entry['stored_at'] = time.time()
+        self._write(self._key(url), entry, body)
+
+
+    def _write(self, key, entry, body):
+        meta_path, body_path = self._paths(key)
+        # Write to temporary files and rename, so readers never see half an entry
+        for path, data, mode in ((body_path, body, 'wb'), (meta_path, json.dumps(entry), 'w')):
+            temp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(temp_path, mode) as out_file:
+                out_file.write(data)
+            os.replace(temp_path, path)
+
+        with self._lock:
+            self._paths_by_key[key] = entry['path']
+
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until the cache fits in max_bytes
+        """
+
+        with self._lock:
+            bodies = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.body'):
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                    bodies.append((stat.st_mtime, stat.st_size, name[:-len('.body')]))
+                    total += stat.st_size
+
+            for _, size, key in sorted(bodies):
+                if total <= self.max_bytes:
+                    break
+                self._remove(key)
+                total -= size
+
+
+    def invalidate(self, url):
+        """
+        Drop the cached entries of a URL path, of the paths under it and of the
+        paths above it (e.g. a PATCH of /rkszones/{id}/login drops the cached
+        /rkszones/{id} and /rkszones)
+
+        Parameters:
+        url - URL that was written to
+
+        Returns:
+        """
+
+        path = requests.utils.urlparse(url).path.rstrip('/')
+
+        with self._lock:
+            for key, cached_path in list(self._paths_by_key.items()):
+                cached_path = cached_path.rstrip('/')
+                if path == cached_path or path.startswith(f'{cached_path}/') \
+                        or cached_path.startswith(f'{path}/'):
+                    self._remove(key)
+
+
+    def clear(self):
+        """
+        Drop every cached entry
+        """
+        with self._lock:
+            for key in list(self._paths_by_key):
+                self._remove(key)
+
+
+    def _remove(self, key):
+        self._paths_by_key.pop(key, None)
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def cached_response(entry):
+    """
+    Build a requests Response from a cached entry
+
+    Parameters:
+    entry - cached entry
+
+    Returns:
+    response - requests Response
+    """
+
+    response = requests.Response()
+    response.status_code = entry['status']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response._content = entry['body']          # pylint: disable=protected-access
+    response.encoding = 'utf-8'
+    response.url = entry['url']
+    response.request = requests.Request('GET', entry['url']).prepare()
+    return response
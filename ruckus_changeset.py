@@ -0,0 +1,151 @@
+"""
+Change set of one zone: collects the field changes of several zone settings
+(radios, channel selection, AP login, DFS, ...) and sends them in as few
+requests as possible.
+
+The SCG200 zone PATCH (/rkszones/{id}) takes the nested settings which also have
+their own endpoints (wifi24, wifi50, autoChannelSelection24/50, login), so the
+changes of several settings go out as a single PATCH instead of one per setting.
+A change set of one setting uses that setting's own endpoint, as before.
+
+Usage:
+    changes = ZoneChangeSet(apr, zone_id)
+    changes.set(dfsChannelEnabled=True)
+    changes.update('wifi24', txPower='Full', channelRange=[1, 6, 11])
+    changes.update('wifi50', txPower='-3dB(1/2)')
+    responses = changes.flush()             # one PATCH /rkszones/{id}
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+
+# Zone settings which are part of the zone PATCH and also have their own endpoint
+#   /rkszones/{id}/<setting>
+ZONE_SETTINGS = ('wifi24', 'wifi50', 'autoChannelSelection24', 'autoChannelSelection50',
+                 'login')
+
+# Channel selection settings of each radio (as used by channelfly)
+CHANNEL_SELECTION = {'2.4': ('autoChannelSelection24',),
+                     '5.0': ('autoChannelSelection50',),
+                     'both': ('autoChannelSelection24', 'autoChannelSelection50')}
+
+
+class ZoneChangeSet:
+    """
+    ZoneChangeSet class to collect the changes of one zone and send them together
+    """
+
+    def __init__(self, apr, zone_id, coalesce=True):
+        """
+        Parameters:
+        apr - Ruckus object (AsyncRuckus sends the changes with flush_changes)
+        zone_id - zone ID
+        coalesce - send all settings in one zone PATCH (False: one PATCH per setting)
+        """
+
+        self.apr = apr
+        self.zone_id = zone_id
+        self.coalesce = coalesce
+
+        # Top-level zone fields (e.g. dfsChannelEnabled) and nested settings
+        self.fields = {}
+        self.settings = {}
+
+
+    def set(self, **fields):
+        """
+        Change top-level fields of the zone (e.g. dfsChannelEnabled=True)
+        """
+        self.fields.update(fields)
+        return self
+
+
+    def update(self, setting, **fields):
+        """
+        Change fields of one zone setting (wifi24, wifi50, autoChannelSelection24,
+        autoChannelSelection50, login). Later changes of a field win.
+        """
+        if setting not in ZONE_SETTINGS:
+            raise ValueError(f'Unknown zone setting {setting}')
+        self.settings.setdefault(setting, {}).update(fields)
+        return self
+
+
+    def channel_selection(self, mode, channel='both'):
+        """
+        Change the channel selection (ChannelFly, BackgroundScanning, None) of
+        one or both radios
+
+        Parameters:
+        mode - dict of channel selection fields (e.g. {'channelSelectMode': 'ChannelFly'})
+        channel - radio to work on (2.4, 5.0, both)
+        """
+        for setting in CHANNEL_SELECTION[channel]:
+            self.update(setting, **mode)
+        return self
+
+
+    @property
+    def body(self):
+        """
+        Body of the single zone PATCH
+        """
+        body = dict(self.fields)
+        body.update(self.settings)
+        return body
+
+
+    def __len__(self):
+        return len(self.fields) + len(self.settings)
+
+
+    def plan(self):
+        """
+        Requests needed to send the collected changes
+
+        Parameters:
+
+        Returns:
+        plan - list of (endpoint, path under /rkszones/{id}, body); one entry
+               when the changes can go together, empty when there is nothing to send
+        """
+
+        if len(self.settings) == 1 and not self.fields:
+            # A single setting goes to its own endpoint
+            (setting, fields), = self.settings.items()
+            return [(setting, f'/{setting}', fields)]
+
+        if self.coalesce:
+            return [('zone', '', self.body)] if self else []
+
+        plan = [('zone', '', dict(self.fields))] if self.fields else []
+        plan.extend((setting, f'/{setting}', fields) for setting, fields in self.settings.items())
+        return plan
+
+
+    def clear(self):
+        """
+        Forget the collected changes (after they were sent)
+        """
+        self.fields = {}
+        self.settings = {}
+
+
+    def flush(self):
+        """
+        Send the collected changes and start over
+
+        Parameters:
+
+        Returns:
+        responses - list of (endpoint, Response); one entry when the changes
+                    were sent together, empty when there was nothing to send
+        """
+
+        zone_uri = f'{self.apr.scg200_uri}/v5_0/rkszones/{self.zone_id}'
+        responses = [(endpoint, self.apr.session.patch(f'{zone_uri}{path}', json=body))
+                     for endpoint, path, body in self.plan()]
+
+        self.clear()
+        return responses
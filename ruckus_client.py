@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: Thin, fast-starting client of ruckus_daemon.py. It only imports the
+         standard library; the Ruckus class (and requests) is imported only
+         when no daemon is running and the call is made directly.
+Version: 1.0
+Date:    October 18, 2026
+
+Usage:
+    python ruckus_client.py get_wlan_auth ES-Zone0001
+    python ruckus_client.py --controller 10.1.1.1 channelfly ES-Zone0001 N both
+    python ruckus_client.py modify_wlan_auth ES-Zone0001 auth_service_name=NPS-Radius-Proxy
+
+Arguments are passed as strings (2.4, 5.0 and numeric zone names stay strings);
+name=value arguments are passed as keyword arguments. Prefix a value with json:
+to pass it as JSON instead, e.g. list_size=json:1000 or json:["A", "B"].
+The exit status is 1 when the call fails (an error, nothing returned, or an
+HTTP error status from the controller).
+"""
+
+# Import required modules (standard library only, to start fast)
+import json
+import os
+import socket
+import sys
+
+
+# Default Unix socket of the daemon (same as ruckus_daemon.SOCKET_PATH)
+SOCKET_PATH = os.path.join(os.path.expanduser('~'), '.ruckus_daemon.sock')
+
+
+class DaemonClient:
+    """
+    DaemonClient class to send requests to ruckus_daemon.py
+    """
+
+    def __init__(self, socket_path=SOCKET_PATH, timeout=300):
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self._reader = self.sock.makefile('rb')
+
+
+    def call(self, method, *args, controller=None, **kwargs):
+        """
+        Call a Ruckus method in the daemon
+
+        Parameters:
+        method - name of the method (see ruckus_daemon.METHODS)
+        args - positional arguments
+        controller - controller IP (may be left out if the daemon has only one)
+        kwargs - keyword arguments
+
+        Returns:
+        result - result of the method (Responses come back as status codes)
+        """
+
+        request = {'controller': controller, 'method': method, 'args': args, 'kwargs': kwargs}
+        self.sock.sendall(json.dumps(request).encode() + b'\n')
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError('The daemon closed the connection')
+
+        response = json.loads(line)
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        return response['result']
+
+
+    def close(self):
+        self._reader.close()
+        self.sock.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def call_direct(controller, method, args, kwargs):
+    """
+    Make the call without a daemon: log in, call, log out (slow path)
+    """
+    # Imported only here, so the daemon path never loads requests
+    from ruckus import Ruckus
+    from ruckus_daemon import call
+    from mm_common_funcs import get_credentials
+
+    username, password = get_credentials()
+    if controller is None:
+        controller = input('\nPlease enter the Controller IP (ONLY IP address): ')
+    apr = Ruckus(controller, username, password, session_cache=True)
+    return call(apr, method, args, kwargs)
+
+
+def parse_arguments(argv):
+    """
+    Split the command line into controller, socket, method, args and kwargs
+    """
+
+    controller = None
+    socket_path = SOCKET_PATH
+    while argv and argv[0] in ('--controller', '--socket'):
+        if argv[0] == '--controller':
+            controller = argv[1]
+        else:
+            socket_path = argv[1]
+        argv = argv[2:]
+
+    if not argv:
+        raise SystemExit(__doc__)
+
+    def value(text):
+        # Plain strings unless JSON is asked for
+        if text.startswith('json:'):
+            try:
+                return json.loads(text[len('json:'):])
+            except ValueError as err:
+                raise SystemExit(f'{text} is not valid JSON: {err}')
+        return text
+
+    args = []
+    kwargs = {}
+    for argument in argv[1:]:
+        name, equals, text = argument.partition('=')
+        if equals and name.isidentifier():
+            kwargs[name] = value(text)
+        else:
+            args.append(value(argument))
+
+    return controller, socket_path, argv[0], args, kwargs
+
+
+def main():
+    """
+    This will be the main function
+    """
+    controller, socket_path, method, args, kwargs = parse_arguments(sys.argv[1:])
+
+    try:
+        with DaemonClient(socket_path) as client:
+            result = client.call(method, *args, controller=controller, **kwargs)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f'No daemon on {socket_path} (start it with "python ruckus_daemon.py"). '
+              f'Calling the controller directly.', file=sys.stderr)
+        try:
+            result = call_direct(controller, method, args, kwargs)
+        except (RuntimeError, ValueError) as err:
+            print(err, file=sys.stderr)
+            sys.exit(1)
+    except RuntimeError as err:
+        print(err, file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+
+"""
+Author:  Meheretab Mengistu
+Purpose: Long-lived local daemon which keeps logged-in Ruckus objects (with warm
+         zone and WLAN indexes) and answers ruckus_client.py over a Unix socket,
+         so a one-off change does not pay for the imports, the login and the
+         zone list download every time
+Version: 1.0
+Date:    October 18, 2026
+
+Protocol: one JSON object per line in each direction.
+    request:  {"controller": "10.1.1.1", "method": "get_wlan_auth", "args": ["ES-Zone0001"],
+               "kwargs": {"ssid": "SFUSD"}}
+    response: {"ok": true, "result": "F5-VIP-ISE-Radius"}  or  {"ok": false, "error": "..."}
+
+A method which returns nothing or an HTTP error status is answered with ok false.
+
+Only the methods in METHODS can be called. The socket is readable only by the
+user who started the daemon, as it acts with the daemon's controller login. The
+zone and WLAN indexes are re-read when older than their TTL; refresh_zones and
+refresh_wlans re-read them right away (e.g. after a WLAN was recreated).
+
+Usage:
+    python ruckus_daemon.py [--socket ~/.ruckus_daemon.sock]
+"""
+
+# Import required modules
+import argparse
+import json
+import os
+import socketserver
+import threading
+from ruckus import Ruckus
+
+
+# Default Unix socket of the daemon
+SOCKET_PATH = os.path.join(os.path.expanduser('~'), '.ruckus_daemon.sock')
+
+# Ruckus methods the clients can call. For the ones marked True, the first
+# argument is a zone and may be given as a name -- it is turned into the zone_id.
+METHODS = {
+    'system_summary': False,
+    'get_ap_count': False,
+    'get_zone_id': False,
+    'refresh_zones': False,
+    'refresh_wlans': True,
+    'get_wlan_id': True,
+    'get_wlan_auth': True,
+    'modify_wlan_auth': True,
+    'channelfly': True,
+    'update_ap_login': True,
+    'apgroup_info': False,
+    'ap_info': False,
+    'ap_summary': False,
+    'ap_status': False,
+    'ap_reboot': False,
+}
+
+# Methods which return HTTP status codes (a dict of MAC -> status code for ap_reboot)
+STATUS_METHODS = ('modify_wlan_auth', 'update_ap_login', 'ap_reboot')
+
+
+def to_json(result):
+    """
+    Turn the result of a Ruckus method into something JSON can carry
+    (Response objects become their status code)
+    """
+    if hasattr(result, 'status_code'):
+        return result.status_code
+    if isinstance(result, tuple):
+        return list(result)
+    return result
+
+
+def failed(method, result):
+    """
+    Whether the result of a Ruckus method means the call failed: nothing came
+    back (e.g. an unknown zone or a rejected value), or the controller answered
+    with an HTTP error
+    """
+    if result is None:
+        return True
+    if hasattr(result, 'status_code'):
+        return result.status_code >= 400
+    if method in STATUS_METHODS:
+        codes = result.values() if isinstance(result, dict) else [result]
+        return any(code >= 400 for code in codes)
+    return False
+
+
+def call(apr, method, args=(), kwargs=None):
+    """
+    Call one of the allowed methods of a Ruckus object
+
+    Parameters:
+    apr - Ruckus object
+    method - name of the method (see METHODS)
+    args - positional arguments
+    kwargs - keyword arguments
+
+    Returns:
+    result - JSON-serialisable result; RuntimeError is raised when the method
+             reports a failure (see failed())
+    """
+
+    if method == 'zones':
+        # The zone list from the warm zone index
+        _, zones_by_id = apr.zone_index()
+        return [{'id': zone_id, 'name': site['name']} for zone_id, site in zones_by_id.items()]
+    if method not in METHODS:
+        raise ValueError(f'{method} cannot be called through the daemon')
+
+    args = list(args)
+    if METHODS[method] and args:
+        zone_id = apr.get_zone_id(args[0])
+        if zone_id is None:
+            raise ValueError(f'{args[0]} is not on the controller')
+        args[0] = zone_id
+
+    result = getattr(apr, method)(*args, **(kwargs or {}))
+    if failed(method, result):
+        raise RuntimeError(f'{method} failed: {json.dumps(to_json(result), default=str)}')
+    return to_json(result)
+
+
+class RuckusDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    RuckusDaemon class to serve the clients of several controllers
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, clients):
+        """
+        Parameters:
+        socket_path - Unix socket to listen on
+        clients - dict of controller IP -> logged-in Ruckus object
+        """
+
+        self.clients = clients
+
+        # A socket left behind by a daemon which was killed is removed
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+        # Only the user who started the daemon may connect
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+
+
+    def answer(self, request):
+        """
+        Answer one request
+
+        Parameters:
+        request - dict with controller, method, args, kwargs
+
+        Returns:
+        response - dict with ok and result (or error)
+        """
+
+        try:
+            if request.get('method') == 'controllers':
+                return {'ok': True, 'result': list(self.clients)}
+
+            controller = request.get('controller')
+            if controller is None and len(self.clients) == 1:
+                controller = next(iter(self.clients))
+            if controller not in self.clients:
+                raise ValueError(f'The daemon is not logged in to {controller}')
+
+            result = call(self.clients[controller], request['method'],
+                          request.get('args', ()), request.get('kwargs'))
+            return {'ok': True, 'result': result}
+        except Exception as err:      # pylint: disable=broad-except
+            return {'ok': False, 'error': f'{type(err).__name__}: {err}'}
+
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """
+    One client connection -- any number of requests, one per line
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.answer(json.loads(line))
+            except ValueError as err:
+                response = {'ok': False, 'error': f'Bad request: {err}'}
+            self.wfile.write(json.dumps(response, default=str).encode() + b'\n')
+            self.wfile.flush()
+
+
+def warm_up(apr):
+    """
+    Fill the zone and WLAN indexes of a Ruckus object, so the first client
+    request is as fast as the rest
+    """
+    apr.zone_index(refresh=True)
+    apr.build_wlan_index()
+
+
+def main():
+    """
+    This will be the main function
+    """
+    # Imported here, as the daemon shares the prompts of the mm_ scripts
+    from mm_common_funcs import get_controller_ips, get_credentials
+
+    parser = argparse.ArgumentParser(description='Keep controller sessions for ruckus_client.py')
+    parser.add_argument('--socket', default=SOCKET_PATH, help='Unix socket to listen on')
+    parser.add_argument('--workers', type=int, default=10,
+                        help='max_workers of each Ruckus object')
+    args = parser.parse_args()
+
+    username, password = get_credentials()
+    controller_ips = get_controller_ips()
+
+    clients = {}
+    for controller_ip in controller_ips:
+        clients[controller_ip] = Ruckus(controller_ip, username, password,
+                                        max_workers=args.workers, session_cache=True)
+
+    # Warm up the indexes of all controllers at the same time
+    warmers = [threading.Thread(target=warm_up, args=(apr,)) for apr in clients.values()]
+    for warmer in warmers:
+        warmer.start()
+    for warmer in warmers:
+        warmer.join()
+
+    server = RuckusDaemon(args.socket, clients)
+    print(f'\nListening on {args.socket} for {", ".join(clients)}. Press Ctrl+C to stop.')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,410 @@
+"""
+Local SQLite inventory of the zones, WLANs, AP groups and APs of Ruckus SCG200
+controllers.
+
+The inventory is filled by Inventory.sync() (see mm_ruckus_inventory_sync.py)
+and answers questions like "which zone is this AP in" or "which zones carry
+SSID X" offline, without calling the controller.
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import hashlib
+import json
+import sqlite3
+import time
+
+
+# Tables and indexes of the inventory database
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS controllers (
+    controller  TEXT PRIMARY KEY,
+    synced_at   REAL
+);
+CREATE TABLE IF NOT EXISTS zones (
+    controller  TEXT,
+    id          TEXT,
+    name        TEXT,
+    hash        TEXT,
+    data        TEXT,
+    PRIMARY KEY (controller, id)
+);
+CREATE INDEX IF NOT EXISTS zones_name ON zones (name);
+CREATE TABLE IF NOT EXISTS wlans (
+    controller      TEXT,
+    zone_id         TEXT,
+    id              TEXT,
+    name            TEXT,
+    ssid            TEXT,
+    auth_profile    TEXT,
+    hash            TEXT,
+    data            TEXT,
+    PRIMARY KEY (controller, zone_id, id)
+);
+CREATE INDEX IF NOT EXISTS wlans_ssid ON wlans (ssid);
+CREATE TABLE IF NOT EXISTS apgroups (
+    controller  TEXT,
+    zone_id     TEXT,
+    id          TEXT,
+    name        TEXT,
+    hash        TEXT,
+    data        TEXT,
+    PRIMARY KEY (controller, zone_id, id)
+);
+CREATE INDEX IF NOT EXISTS apgroups_name ON apgroups (name);
+CREATE TABLE IF NOT EXISTS aps (
+    controller  TEXT,
+    mac         TEXT,
+    zone_id     TEXT,
+    apgroup_id  TEXT,
+    name        TEXT,
+    model       TEXT,
+    hash        TEXT,
+    data        TEXT,
+    PRIMARY KEY (controller, mac)
+);
+CREATE INDEX IF NOT EXISTS aps_mac ON aps (mac);
+CREATE INDEX IF NOT EXISTS aps_zone ON aps (controller, zone_id);
+CREATE INDEX IF NOT EXISTS aps_apgroup ON aps (controller, apgroup_id);
+'''
+
+# Columns (besides controller, hash and data) of each table, in insert order,
+# and how to read them from a record returned by the controller
+COLUMNS = {
+    'zones': (('id', lambda rec: rec['id']),
+              ('name', lambda rec: rec.get('name'))),
+    'wlans': (('zone_id', lambda rec: rec['zoneId']),
+              ('id', lambda rec: rec['id']),
+              ('name', lambda rec: rec.get('name')),
+              ('ssid', lambda rec: rec.get('ssid')),
+              ('auth_profile',
+               lambda rec: (rec.get('authServiceOrProfile') or {}).get('name'))),
+    'apgroups': (('zone_id', lambda rec: rec['zoneId']),
+                 ('id', lambda rec: rec['id']),
+                 ('name', lambda rec: rec.get('name'))),
+    'aps': (('mac', lambda rec: normalize_mac(rec['mac'])),
+            ('zone_id', lambda rec: rec.get('zoneId')),
+            ('apgroup_id', lambda rec: rec.get('apGroupId')),
+            ('name', lambda rec: rec.get('name')),
+            ('model', lambda rec: rec.get('model'))),
+}
+
+# Primary key columns (besides controller) of each table
+KEYS = {'zones': ('id',), 'wlans': ('zone_id', 'id'), 'apgroups': ('zone_id', 'id'),
+        'aps': ('mac',)}
+
+
+def normalize_mac(ap_mac):
+    """
+    Write a MAC address the way the inventory stores it (AA:BB:CC:DD:EE:FF)
+
+    Parameters:
+    ap_mac - MAC address in any common notation
+
+    Returns:
+    mac - string
+    """
+    digits = ''.join(c for c in ap_mac.upper() if c in '0123456789ABCDEF')
+    return ':'.join(digits[i:i + 2] for i in range(0, len(digits), 2))
+
+
+class Inventory:
+    """
+    Inventory class to instantiate a local SQLite inventory
+    """
+
+    def __init__(self, db_path='ruckus_inventory.db'):
+
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+
+
+    #-----------------------------------------------------------
+    # The METHODS below copy the controller into the inventory!
+    #-----------------------------------------------------------
+
+    def sync(self, apr, controller, wlan_auth=False, aps=True):
+        """
+        Copy zones, WLANs, AP groups and APs of a controller into the inventory.
+
+        Only records that changed since the last sync are written, and records
+        which are no longer on the controller are removed. If the zone list or
+        the AP list cannot be read, the sync stops with the error: nothing of
+        that list is removed and the sync time is not updated. The WLANs and AP
+        groups of a zone which cannot be read are kept as they were, and so are
+        the WLAN auth profiles when wlan_auth is False.
+
+        Parameters:
+        apr - Ruckus object logged in to the controller
+        controller - controller name or IP, used as key in the inventory
+        wlan_auth - also read the auth profile of each WLAN (one request per WLAN)
+        aps - also read all APs
+
+        Returns:
+        changes - dict of table -> number of records added, changed or removed
+        """
+
+        changes = {}
+
+        # Zones first, the other lists are read per zone. A failed read raises
+        #   here, before anything is written.
+        zones = apr.get_zones()['list']
+        changes['zones'] = self._sync_table('zones', controller, zones)
+
+        # Read the WLANs and AP groups of all zones in parallel
+        def read_zone(site):
+            wlans = list(apr.iter_wlans(site['id']))
+            for wlan in wlans:
+                wlan['zoneId'] = site['id']
+                if wlan_auth:
+                    wlan['authServiceOrProfile'] = {'name': apr.get_wlan_auth(site['id'], wlan['id'])}
+            apgroups = list(apr.iter_apgroups(site['id']))
+            for apgroup in apgroups:
+                apgroup['zoneId'] = site['id']
+            return wlans, apgroups
+
+        all_wlans = []
+        all_apgroups = []
+        for site, result in apr.run_zones(zones, read_zone):
+            if isinstance(result, Exception):
+                # Keep the old records of this zone rather than dropping them
+                print(f"Failed to read {site['name']}: {result}")
+                all_wlans.extend(self._records('wlans', controller, zone_id=site['id']))
+                all_apgroups.extend(self._records('apgroups', controller, zone_id=site['id']))
+                continue
+            all_wlans.extend(result[0])
+            all_apgroups.extend(result[1])
+
+        # Without wlan_auth the auth profiles were not read -- keep the stored ones
+        changes['wlans'] = self._sync_table('wlans', controller, all_wlans,
+                                            keep=() if wlan_auth else ('auth_profile',))
+        changes['apgroups'] = self._sync_table('apgroups', controller, all_apgroups)
+
+        if aps:
+            # The APs are written while they are read -- a failed page raises
+            #   inside the transaction, which rolls back the whole AP table
+            changes['aps'] = self._sync_table('aps', controller, apr.iter_aps())
+
+        # Only a sync which read every list is recorded
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO controllers VALUES (?, ?)',
+                              (controller, time.time()))
+
+        return changes
+
+
+
+    def _sync_table(self, table, controller, records, keep=()):
+        """
+        Write the changed records of one table and remove the missing ones
+
+        Parameters:
+        table - table name
+        controller - controller name or IP
+        records - iterable of records from the controller
+        keep - columns which were not read this time: a stored value is kept
+               instead of being overwritten with NULL
+
+        Returns:
+        changes - number of records added, changed or removed
+        """
+
+        keys = KEYS[table]
+        columns = COLUMNS[table]
+
+        # Hashes of the records currently in the inventory
+        old_hashes = {tuple(row[:-1]): row[-1] for row in self.conn.execute(
+            f"SELECT {', '.join(keys)}, hash FROM {table} WHERE controller = ?", (controller,))}
+
+        names = ['controller'] + [name for name, _ in columns] + ['hash', 'data']
+        updates = [f'{name} = COALESCE(excluded.{name}, {table}.{name})' if name in keep
+                   else f'{name} = excluded.{name}' for name in names[1:] if name not in keys]
+        insert = (f"INSERT INTO {table} ({', '.join(names)}) "
+                  f"VALUES ({', '.join('?' * len(names))}) "
+                  f"ON CONFLICT (controller, {', '.join(keys)}) DO UPDATE SET {', '.join(updates)}")
+
+        changes = 0
+        with self.conn:
+            for record in records:
+                data = json.dumps(record, sort_keys=True)
+                digest = hashlib.sha1(data.encode()).hexdigest()
+                values = [read(record) for _, read in columns]
+                key = tuple(values[[name for name, _ in columns].index(k)] for k in keys)
+
+                # Unchanged records are not written again
+                if old_hashes.pop(key, None) == digest:
+                    continue
+                self.conn.execute(insert, [controller] + values + [digest, data])
+                changes += 1
+
+            # Whatever is left is no longer on the controller
+            where = ' AND '.join(f'{k} = ?' for k in keys)
+            for key in old_hashes:
+                self.conn.execute(f'DELETE FROM {table} WHERE controller = ? AND {where}',
+                                  (controller,) + key)
+                changes += 1
+
+        return changes
+
+
+
+    #-----------------------------------------------------------
+    # The METHODS below answer questions from the inventory!
+    #-----------------------------------------------------------
+
+    def _records(self, table, controller, **where):
+        """
+        Get the records of a table as they were returned by the controller
+
+        Parameters:
+        table - table name
+        controller - controller name or IP
+        where - column=value filters
+
+        Returns:
+        records - list of dict
+        """
+
+        sql = f'SELECT data FROM {table} WHERE controller = ?'
+        for column in where:
+            sql += f' AND {column} = ?'
+
+        return [json.loads(row['data']) for row in
+                self.conn.execute(sql, (controller,) + tuple(where.values()))]
+
+
+    def last_sync(self, controller):
+        """
+        Get the time of the last sync of a controller
+
+        Parameters:
+        controller - controller name or IP
+
+        Returns:
+        synced_at - seconds since the epoch (None if never synced)
+        """
+
+        row = self.conn.execute('SELECT synced_at FROM controllers WHERE controller = ?',
+                                (controller,)).fetchone()
+        return row['synced_at'] if row else None
+
+
+    def zones(self, controller):
+        """
+        Get all zones of a controller (same format as get_zones()['list'])
+
+        Parameters:
+        controller - controller name or IP
+
+        Returns:
+        zones - list of dict
+        """
+
+        return self._records('zones', controller)
+
+
+    def zone_of_ap(self, ap_mac):
+        """
+        Find the zone an AP is in
+
+        Parameters:
+        ap_mac - MAC address of the AP
+
+        Returns:
+        zone - dict with controller, zone_id, zone_name, ap_name (None if not found)
+        """
+
+        row = self.conn.execute(
+            'SELECT aps.controller, aps.zone_id, zones.name AS zone_name, aps.name AS ap_name '
+            'FROM aps LEFT JOIN zones ON zones.controller = aps.controller '
+            'AND zones.id = aps.zone_id WHERE aps.mac = ?', (normalize_mac(ap_mac),)).fetchone()
+        return dict(row) if row else None
+
+
+    def zones_with_ssid(self, ssid):
+        """
+        Find the zones which carry an SSID
+
+        Parameters:
+        ssid - SSID name
+
+        Returns:
+        zones - list of dict with controller, zone_id, zone_name, wlan_id
+        """
+
+        return [dict(row) for row in self.conn.execute(
+            'SELECT wlans.controller, wlans.zone_id, zones.name AS zone_name, '
+            'wlans.id AS wlan_id FROM wlans LEFT JOIN zones ON zones.controller = '
+            'wlans.controller AND zones.id = wlans.zone_id WHERE wlans.ssid = ? '
+            'ORDER BY zones.name', (ssid,))]
+
+
+    def wlan_auth_profiles(self, controller, ssid=None):
+        """
+        Get the auth profile of each WLAN (needs a sync with wlan_auth=True)
+
+        Parameters:
+        controller - controller name or IP
+        ssid - only WLANs of this SSID
+
+        Returns:
+        wlans - list of dict with zone_name, ssid, auth_profile
+        """
+
+        sql = ('SELECT zones.name AS zone_name, wlans.ssid, wlans.auth_profile FROM wlans '
+               'LEFT JOIN zones ON zones.controller = wlans.controller AND zones.id = '
+               'wlans.zone_id WHERE wlans.controller = ?')
+        params = [controller]
+        if ssid is not None:
+            sql += ' AND wlans.ssid = ?'
+            params.append(ssid)
+
+        return [dict(row) for row in self.conn.execute(sql + ' ORDER BY zones.name', params)]
+
+
+    def aps_in_zone(self, controller, zone_name):
+        """
+        Get all APs of a zone
+
+        Parameters:
+        controller - controller name or IP
+        zone_name - zone name
+
+        Returns:
+        aps - list of dict (as returned by the controller)
+        """
+
+        return [json.loads(row['data']) for row in self.conn.execute(
+            'SELECT aps.data FROM aps JOIN zones ON zones.controller = aps.controller '
+            'AND zones.id = aps.zone_id WHERE aps.controller = ? AND zones.name = ?',
+            (controller, zone_name))]
+
+
+    def aps_in_apgroup(self, controller, apgroup_name):
+        """
+        Get all APs of an AP group
+
+        Parameters:
+        controller - controller name or IP
+        apgroup_name - AP group name
+
+        Returns:
+        aps - list of dict (as returned by the controller)
+        """
+
+        return [json.loads(row['data']) for row in self.conn.execute(
+            'SELECT aps.data FROM aps JOIN apgroups ON apgroups.controller = aps.controller '
+            'AND apgroups.id = aps.apgroup_id WHERE aps.controller = ? AND apgroups.name = ?',
+            (controller, apgroup_name))]
+
+
+    def close(self):
+        """
+        Close the inventory database
+        """
+        self.conn.close()
@@ -0,0 +1,148 @@
+"""
+Append-only checkpoint journal of the bulk runs.
+
+Each zone is written to a JSON lines file as soon as it finishes, so a run
+which crashes (or loses its session) at zone 400 can be resumed with only the
+remaining zones. The lines are flushed right away and fsync'd in batches, so a
+crash of the script loses nothing and a crash of the machine loses at most one
+batch.
+
+The lines carry the settings of the change (e.g. auth_service_name and ssid),
+so a resumed run only skips the zones done with the same settings.
+
+Usage:
+    done = load_done('ise_transit_2026-10-18T120000.jsonl')
+    with Journal('ise_transit_2026-10-18T120000.jsonl') as journal:
+        journal.record(controller_ip, site, 'done', auth_service_name='NPS-Radius-Proxy')
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class Journal:
+    """
+    Journal class to append one JSON line per finished zone
+    """
+
+    def __init__(self, filename, batch_size=20, sync_interval=2.0):
+        """
+        Parameters:
+        filename - JSON lines file (appended to, so a resumed run adds to it)
+        batch_size - lines written between two fsyncs
+        sync_interval - seconds between two fsyncs, whatever the batch size
+        """
+
+        self.filename = filename
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+
+        self._file = open(filename, 'a')
+        # A line cut short by a crash is ended, so the next line is not glued to it
+        if self._file.tell() > 0:
+            with open(filename, 'rb') as journal_file:
+                journal_file.seek(-1, os.SEEK_END)
+                if journal_file.read(1) != b'\n':
+                    self._file.write('\n')
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+
+    def record(self, controller, site, status, **details):
+        """
+        Append the result of one zone
+
+        Parameters:
+        controller - controller IP of the zone
+        site - zone info (from get_zones)
+        status - 'done' for a zone which needs no more work, anything else otherwise
+        details - extra keys written with the line (e.g. wlan_id, error)
+
+        Returns:
+        """
+
+        line = {'time': time.time(), 'controller': controller, 'zone_id': site['id'],
+                'zone': site.get('name'), 'status': status}
+        line.update(details)
+
+        with self._lock:
+            self._file.write(json.dumps(line, default=str) + '\n')
+            # Hand the line to the OS right away, so a crash of the script loses nothing
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.batch_size or \
+                    time.monotonic() - self._synced_at >= self.sync_interval:
+                self._sync()
+
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+
+    def close(self):
+        """
+        Write the last batch to disk and close the journal
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._sync()
+                self._file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_done(filename):
+    """
+    Zones confirmed done in a journal
+
+    Parameters:
+    filename - JSON lines file written by Journal
+
+    Returns:
+    done - dict of (controller, zone_id) -> last line of the zone, for the zones
+           whose last line is 'done' (the line tells with which settings)
+    """
+
+    last_line = {}
+    with open(filename) as journal_file:
+        for line in journal_file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The last line may be cut short by a crash
+                continue
+            last_line[(entry['controller'], entry['zone_id'])] = entry
+
+    return {zone: entry for zone, entry in last_line.items() if entry['status'] == 'done'}
+
+
+def fingerprint(secret):
+    """
+    Fingerprint of a secret (e.g. the new AP login password) to write to the
+    journal instead of the secret, so a resumed run can tell whether the same
+    secret was set. A slow hash, as the journal is a plain text file.
+
+    Parameters:
+    secret - string
+
+    Returns:
+    fingerprint - hex string
+    """
+    return hashlib.pbkdf2_hmac('sha256', secret.encode(), b'ruckus_journal', 200000).hex()[:32]
@@ -0,0 +1,172 @@
+"""
+Adaptive (AIMD) concurrency limiter for the requests sent to the controller.
+
+The limit grows by about one request per round of successful requests while
+the latency stays under the target and few requests fail, and is cut in half
+when the controller throttles (429/503), times out, gets slow, or answers more
+than error_threshold of the last error_window requests with an error. Bulk jobs then run at the fastest
+rate the controller tolerates without tuning max_workers by hand.
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+from collections import deque
+import random
+import threading
+import time
+
+
+class AdaptiveLimiter:
+    """
+    AdaptiveLimiter class to limit the number of requests in flight
+
+    Usage:
+        with limiter:
+            response = send_request()
+        limiter.on_success(latency)   or   limiter.on_error()   or   limiter.on_throttle()
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=64, latency_target=2.0, backoff=0.5,
+                 error_window=20, error_threshold=0.25):
+
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.error_threshold = error_threshold
+
+        # True for each of the last error_window requests which failed
+        self._outcomes = deque(maxlen=error_window)
+
+        self._limit = float(min(max(initial, minimum), self.maximum))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+
+    @property
+    def limit(self):
+        """
+        Current number of requests allowed in flight
+        """
+        return int(self._limit)
+
+
+    @property
+    def error_rate(self):
+        """
+        Share of the last error_window requests which failed
+        """
+        outcomes = list(self._outcomes)
+        return sum(outcomes) / len(outcomes) if outcomes else 0.0
+
+
+    def _too_many_errors(self):
+        # Judged only once half of the window is filled, so one early 404 is not a trend
+        return len(self._outcomes) >= (self._outcomes.maxlen or 0) // 2 and \
+            self.error_rate > self.error_threshold
+
+
+    @property
+    def in_flight(self):
+        """
+        Number of requests in flight right now
+        """
+        return self._in_flight
+
+
+    def __enter__(self):
+        # Wait for a free slot under the current limit
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+        return self
+
+
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+
+    def on_success(self, latency):
+        """
+        Record a successful request. Grow the limit by 1/limit (about one more
+        request per round) when the latency is healthy.
+
+        Parameters:
+        latency - seconds the request took
+
+        Returns:
+        """
+
+        self._outcomes.append(False)
+        if latency > self.latency_target:
+            self.on_throttle()
+            return
+
+        with self._condition:
+            # No growth while too many of the recent requests fail
+            if self._limit < self.maximum and not self._too_many_errors():
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                self._condition.notify_all()
+
+
+    def on_error(self):
+        """
+        Record a request the controller answered with an error (other than
+        throttling). Cut the limit when the error rate is over error_threshold.
+
+        Parameters:
+
+        Returns:
+        """
+
+        self._outcomes.append(True)
+        if self._too_many_errors():
+            self.on_throttle()
+
+
+    def on_throttle(self):
+        """
+        Record a throttled, failed or slow request. Cut the limit, at most once
+        per latency_target so a burst of failures counts as one.
+
+        Parameters:
+
+        Returns:
+        """
+
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease < self.latency_target:
+                return
+            self._last_decrease = now
+            self._limit = max(self.minimum, self._limit * self.backoff)
+
+
+def retry_delay(attempt, retry_after=None, base=0.5, cap=30.0):
+    """
+    Seconds to wait before retrying a request: exponential backoff with full
+    jitter, or the controller's Retry-After when it sends one
+
+    Parameters:
+    attempt - number of the failed attempt (0 for the first one)
+    retry_after - value of the Retry-After header (seconds)
+    base - delay of the first retry
+    cap - longest delay
+
+    Returns:
+    delay - seconds
+    """
+
+    if retry_after is not None:
+        try:
+            return min(cap, float(retry_after))
+        except ValueError:
+            pass
+
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,221 @@
+"""
+Per-endpoint instrumentation of the requests sent to the controller.
+
+Each request is recorded under its templated path (e.g. GET
+/v5_0/rkszones/{id}/wlans) with call count, bytes, status codes and a latency
+histogram. The numbers can be exported as JSON or in the Prometheus text format,
+and custom collectors can be hooked in with Metrics.add_collector().
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import json
+import re
+import threading
+from urllib.parse import urlsplit
+
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments which are IDs rather than endpoint names
+_ID = re.compile(r'^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+                 r'[0-9a-fA-F]{12}|\d+)$')
+_MAC = re.compile(r'^([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}$')
+
+
+def template_path(url):
+    """
+    Replace the IDs and MAC addresses in a URL path with {id} and {mac}
+
+    Parameters:
+    url - request URL
+
+    Returns:
+    path - templated path starting at the API version (e.g. /v5_0/rkszones/{id})
+    """
+
+    path = urlsplit(url).path
+    if '/wsg/api/public' in path:
+        path = path.split('/wsg/api/public', 1)[1]
+
+    segments = []
+    for segment in path.split('/'):
+        if _MAC.match(segment):
+            segment = '{mac}'
+        elif _ID.match(segment):
+            segment = '{id}'
+        segments.append(segment)
+
+    return '/'.join(segments)
+
+
+class Metrics:
+    """
+    Metrics class to record the requests sent to the controller
+    """
+
+    def __init__(self):
+
+        self.endpoints = {}
+        self.collectors = []
+        # Exceptions raised by the collectors (they never fail the request)
+        self.collector_errors = 0
+        self._lock = threading.Lock()
+
+
+    def add_collector(self, collector):
+        """
+        Call a function for every recorded request
+
+        Parameters:
+        collector - function called as collector(event), where event is a dict
+                    with method, url, endpoint, status, latency, bytes_sent,
+                    bytes_received. An exception raised by the collector is
+                    counted in collector_errors (and the first one printed);
+                    it does not fail the request.
+
+        Returns:
+        """
+
+        self.collectors.append(collector)
+
+
+    def record(self, method, url, status, latency, bytes_sent=0, bytes_received=0):
+        """
+        Record one request
+
+        Parameters:
+        method - HTTP method
+        url - request URL
+        status - response status code ('error' if no response was received)
+        latency - seconds the request took
+        bytes_sent - size of the request body
+        bytes_received - size of the response body
+
+        Returns:
+        """
+
+        endpoint = template_path(url)
+
+        with self._lock:
+            stats = self.endpoints.setdefault((method, endpoint), {
+                'count': 0, 'bytes_sent': 0, 'bytes_received': 0, 'status': {},
+                'latency_sum': 0.0, 'latency_max': 0.0,
+                'buckets': [0] * (len(LATENCY_BUCKETS) + 1)})
+
+            stats['count'] += 1
+            stats['bytes_sent'] += bytes_sent
+            stats['bytes_received'] += bytes_received
+            stats['status'][str(status)] = stats['status'].get(str(status), 0) + 1
+            stats['latency_sum'] += latency
+            stats['latency_max'] = max(stats['latency_max'], latency)
+
+            # The last bucket counts the requests slower than every bound (+Inf)
+            bucket = len(LATENCY_BUCKETS)
+            for number, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    bucket = number
+                    break
+            stats['buckets'][bucket] += 1
+
+        event = {'method': method, 'url': url, 'endpoint': endpoint, 'status': status,
+                 'latency': latency, 'bytes_sent': bytes_sent, 'bytes_received': bytes_received}
+        for collector in self.collectors:
+            try:
+                collector(event)
+            except Exception as err:      # pylint: disable=broad-except
+                with self._lock:
+                    self.collector_errors += 1
+                    first = self.collector_errors == 1
+                if first:
+                    print(f'Metrics collector {collector!r} failed: {err} '
+                          f'(further failures are only counted)')
+
+
+    def to_dict(self):
+        """
+        Get the recorded numbers
+
+        Parameters:
+
+        Returns:
+        metrics - list of dicts, one per method and endpoint
+        """
+
+        with self._lock:
+            return [dict(stats, method=method, endpoint=endpoint,
+                         latency_avg=stats['latency_sum'] / stats['count'],
+                         buckets=dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'],
+                                          stats['buckets'])))
+                    for (method, endpoint), stats in sorted(self.endpoints.items())]
+
+
+    def export_json(self, filename):
+        """
+        Write the recorded numbers to a JSON file
+
+        Parameters:
+        filename - file to write
+
+        Returns:
+        """
+
+        with open(filename, 'w') as out_file:
+            json.dump(self.to_dict(), out_file, indent=2)
+
+
+    def export_prometheus(self, filename):
+        """
+        Write the recorded numbers to a file in the Prometheus text format
+
+        Parameters:
+        filename - file to write
+
+        Returns:
+        """
+
+        lines = ['# HELP ruckus_requests_total Requests sent to the controller.',
+                 '# TYPE ruckus_requests_total counter']
+        metrics = self.to_dict()
+
+        for stats in metrics:
+            for status, count in sorted(stats['status'].items()):
+                lines.append(f'ruckus_requests_total{{{_labels(stats)},status="{status}"}} '
+                             f'{count}')
+
+        for name, key, text in (('ruckus_request_bytes_sent_total', 'bytes_sent',
+                                 'Bytes sent in request bodies.'),
+                                ('ruckus_request_bytes_received_total', 'bytes_received',
+                                 'Bytes received in response bodies.')):
+            lines += [f'# HELP {name} {text}', f'# TYPE {name} counter']
+            lines += [f'{name}{{{_labels(stats)}}} {stats[key]}' for stats in metrics]
+
+        lines += ['# HELP ruckus_request_latency_seconds Latency of the requests.',
+                  '# TYPE ruckus_request_latency_seconds histogram']
+        for stats in metrics:
+            cumulative = 0
+            for bound, count in stats['buckets'].items():
+                cumulative += count
+                lines.append(f'ruckus_request_latency_seconds_bucket{{{_labels(stats)},'
+                             f'le="{bound}"}} {cumulative}')
+            lines.append(f'ruckus_request_latency_seconds_sum{{{_labels(stats)}}} '
+                         f'{stats["latency_sum"]:.6f}')
+            lines.append(f'ruckus_request_latency_seconds_count{{{_labels(stats)}}} '
+                         f'{stats["count"]}')
+
+        lines += ['# HELP ruckus_collector_errors_total Exceptions raised by custom collectors.',
+                  '# TYPE ruckus_collector_errors_total counter',
+                  f'ruckus_collector_errors_total {self.collector_errors}']
+
+        with open(filename, 'w') as out_file:
+            out_file.write('\n'.join(lines) + '\n')
+
+
+def _labels(stats):
+    """
+    Prometheus labels of one method and endpoint
+    """
+    return f'method="{stats["method"]}",endpoint="{stats["endpoint"]}"'
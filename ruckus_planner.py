@@ -0,0 +1,180 @@
+"""
+Dry-run planner of the bulk workflows.
+
+Lists every request a workflow would send to the selected zones and estimates
+how long the run would take, from the latency of a short read-only probe at the
+chosen concurrency. Nothing is changed on the controller: the planner only
+sends GETs (the probe, and for auth the WLAN lists the real run reads too).
+
+Usage:
+    plan = plan_requests(apr, 'channelfly', zones, turn_off='N', channel='both')
+    probe = probe_latency(apr, zones)
+    print(format_plan(plan, probe, apr.max_workers))
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import math
+import random
+import statistics
+import time
+from ruckus_changeset import ZoneChangeSet
+from ruckus_metrics import template_path
+
+
+def _channelfly_requests(apr, site, turn_off='N', channel='both', **_):
+    # The same change set as Ruckus.channelfly, without sending it
+    mode = {'channelSelectMode': {'N': 'ChannelFly', 'B': 'BackgroundScanning'}.get(
+        turn_off.upper(), 'None')}
+    changes = ZoneChangeSet(apr, site['id']).channel_selection(mode, channel)
+    return [('PATCH', f"/v5_0/rkszones/{site['id']}{path}") for _, path, _ in changes.plan()]
+
+
+def _auth_requests(apr, site, ssid='SFUSD', **_):
+    # WLAN list (build_wlan_index), then GET + PATCH + GET of the SSID's WLAN
+    zone_path = f"/v5_0/rkszones/{site['id']}"
+    requests = [('GET', f'{zone_path}/wlans')]
+    wlan = apr.find_wlan(site['id'], ssid)
+    if wlan is not None:
+        wlan_path = f"{zone_path}/wlans/{wlan['id']}"
+        requests += [('GET', wlan_path), ('PATCH', f'{wlan_path}/authServiceOrProfile'),
+                     ('GET', wlan_path)]
+    return requests
+
+
+def _ap_login_requests(apr, site, **_):
+    return [('PATCH', f"/v5_0/rkszones/{site['id']}/login")]
+
+
+# Requests of each workflow for one zone, called as function(apr, site, **options)
+WORKFLOWS = {'channelfly': _channelfly_requests, 'auth': _auth_requests,
+             'ap_login': _ap_login_requests}
+
+
+def plan_requests(apr, workflow, zones, **options):
+    """
+    List the requests a workflow would send to each zone
+
+    Parameters:
+    apr - Ruckus object
+    workflow - channelfly, auth or ap_login
+    zones - list of zones
+    options - options of the workflow (turn_off and channel for channelfly,
+              ssid for auth)
+
+    Returns:
+    plan - list of (site, list of (method, path)) in zone order
+    """
+
+    # auth only changes the zones which have the SSID -- read the WLAN lists
+    #   (read only) to know which ones
+    if workflow == 'auth':
+        apr.build_wlan_index(zones)
+
+    return [(site, WORKFLOWS[workflow](apr, site, **options)) for site in zones]
+
+
+def probe_latency(apr, zones, samples=20, max_workers=None):
+    """
+    Measure the latency of the controller with read-only requests, sent at the
+    same concurrency as the real run
+
+    Parameters:
+    apr - Ruckus object
+    zones - zones to sample (GET of the zone configuration)
+    samples - number of requests to send
+    max_workers - requests in parallel (default apr.max_workers)
+
+    Returns:
+    probe - dict with samples, mean, p50, p90 (seconds), per_second (requests
+            finished per second at this concurrency) and failed
+    """
+
+    if not zones:
+        return {'samples': 0, 'mean': 0.0, 'p50': 0.0, 'p90': 0.0, 'per_second': 0.0,
+                'failed': 0}
+
+    sample = random.sample(zones, min(samples, len(zones)))
+
+    def timed_get(site):
+        start = time.perf_counter()
+        response = apr.session.get(f"{apr.scg200_uri}/v5_0/rkszones/{site['id']}")
+        return time.perf_counter() - start, response.status_code
+
+    # The throughput includes the effect of the concurrency limit of the session
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers or apr.max_workers)) as executor:
+        results = list(executor.map(timed_get, sample))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    return {'samples': len(latencies), 'mean': statistics.mean(latencies),
+            'p50': latencies[len(latencies) // 2],
+            'p90': latencies[min(len(latencies) - 1, math.ceil(len(latencies) * 0.9) - 1)],
+            'per_second': len(latencies) / elapsed if elapsed else 0.0,
+            'failed': sum(status >= 400 for _, status in results)}
+
+
+def estimate_seconds(plan, probe, max_workers, latency='p50'):
+    """
+    Estimate the wall time of a plan. The requests of one zone are sent one
+    after the other and up to max_workers zones are worked on at the same time,
+    at the throughput seen by the probe.
+
+    Parameters:
+    plan - list of (site, requests) (from plan_requests)
+    probe - latency probe (from probe_latency)
+    max_workers - zones worked on in parallel
+    latency - latency of the probe to use (p50 or p90)
+
+    Returns:
+    seconds - float
+    """
+
+    chains = [len(requests) * probe[latency] for _, requests in plan]
+    if not chains:
+        return 0.0
+
+    # Requests in flight is limited by max_workers and by the throughput of the probe
+    total = sum(len(requests) for _, requests in plan)
+    by_workers = sum(chains) / max(1, max_workers)
+    by_throughput = total / probe['per_second'] if probe['per_second'] else 0.0
+    if latency == 'p90' and probe['p50']:
+        by_throughput *= probe['p90'] / probe['p50']
+    return max(by_workers, by_throughput, max(chains))
+
+
+def format_plan(plan, probe, max_workers):
+    """
+    Text of the plan: requests per endpoint and the estimated wall time
+
+    Parameters:
+    plan - list of (site, requests) (from plan_requests)
+    probe - latency probe (from probe_latency)
+    max_workers - zones worked on in parallel
+
+    Returns:
+    text - string
+    """
+
+    endpoints = Counter((method, template_path(path)) for _, requests in plan
+                        for method, path in requests)
+    total = sum(endpoints.values())
+    changed = sum(any(method != 'GET' for method, _ in requests) for _, requests in plan)
+
+    lines = ["{0:8} {1:60} {2:>8}".format("METHOD", "ENDPOINT", "REQUESTS")]
+    for (method, endpoint), count in sorted(endpoints.items()):
+        lines.append("{0:8} {1:60} {2:>8}".format(method, endpoint, count))
+
+    lines.append(f"\n{total} requests to {len(plan)} zones ({changed} zones changed), "
+                 f"{max_workers} zones at a time")
+    lines.append(f"Probe: {probe['samples']} requests, p50 {probe['p50'] * 1000:.0f} ms, "
+                 f"p90 {probe['p90'] * 1000:.0f} ms, {probe['per_second']:.0f} requests/s, "
+                 f"{probe['failed']} failed")
+    lines.append(f"Estimated time: {estimate_seconds(plan, probe, max_workers):.1f} s "
+                 f"(up to {estimate_seconds(plan, probe, max_workers, 'p90'):.1f} s)")
+    return '\n'.join(lines)
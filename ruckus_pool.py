@@ -0,0 +1,94 @@
+"""
+Pool of Ruckus objects, one per SCG200 controller cluster, to run the same job
+against several controllers in parallel.
+
+Usage:
+    pool = ControllerPool(['10.1.1.1', '10.2.2.2'], username, password)
+    reports = pool.run(lambda apr: apr.get_ap_count())
+    for report in reports:
+        print(report['controller'], report['seconds'], report['result'])
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+from concurrent.futures import ThreadPoolExecutor
+import time
+from ruckus import Ruckus
+
+
+class ControllerPool:
+    """
+    ControllerPool class to log in to several controllers and run jobs on all of them
+    """
+
+    # Log in to all controllers at the same time
+    #   ruckus_kwargs - passed to each Ruckus object (max_workers, session_cache ...)
+    def __init__(self, controller_ips, username, password, **ruckus_kwargs):
+
+        self.controller_ips = list(controller_ips)
+        self.clients = {}
+        self.errors = {}
+        self.login_seconds = {}
+
+        def log_in(controller_ip):
+            start = time.perf_counter()
+            try:
+                return Ruckus(controller_ip, username, password, **ruckus_kwargs), None, \
+                    time.perf_counter() - start
+            except Exception as err:      # pylint: disable=broad-except
+                return None, err, time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.controller_ips))) as executor:
+            logins = list(executor.map(log_in, self.controller_ips))
+
+        for controller_ip, (apr, error, seconds) in zip(self.controller_ips, logins):
+            self.login_seconds[controller_ip] = seconds
+            if error is None:
+                self.clients[controller_ip] = apr
+            else:
+                self.errors[controller_ip] = error
+                print(f'Failed to log in to {controller_ip}: {error}')
+
+
+
+    def run(self, job, *args):
+        """
+        Run a job against every controller which is logged in, in parallel
+
+        Parameters:
+        job - function called as job(apr, *args) for each controller
+        args - extra arguments passed to job
+
+        Returns:
+        reports - list of dicts in controller order: controller, result, error,
+                  seconds. Controllers which failed to log in are reported
+                  with their login error.
+        """
+
+        def run_one(controller_ip):
+            start = time.perf_counter()
+            try:
+                result, error = job(self.clients[controller_ip], *args), None
+            except Exception as err:      # pylint: disable=broad-except
+                result, error = None, err
+            return {'controller': controller_ip, 'result': result, 'error': error,
+                    'seconds': time.perf_counter() - start}
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.clients))) as executor:
+            finished = dict(zip(self.clients, executor.map(run_one, self.clients)))
+
+        return [finished.get(controller_ip) or
+                {'controller': controller_ip, 'result': None,
+                 'error': self.errors[controller_ip], 'seconds': 0.0}
+                for controller_ip in self.controller_ips]
+
+
+
+    def log_out(self):
+        """
+        Log out of every controller
+        """
+        for apr in self.clients.values():
+            apr.log_out()
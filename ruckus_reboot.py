@@ -0,0 +1,161 @@
+"""
+Rolling reboot of APs in waves, waiting for each wave to go down and come back
+online before the next one is rebooted.
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+from concurrent.futures import ThreadPoolExecutor
+import math
+import time
+
+
+def split_waves(ap_macs, wave_percent=10, wave_size=None):
+    """
+    Split a list of APs into reboot waves
+
+    Parameters:
+    ap_macs - list of APs MAC addresses
+    wave_percent - percent of the APs to reboot in each wave
+    wave_size - number of APs in each wave (overrides wave_percent)
+
+    Returns:
+    waves - list of lists of AP MAC addresses
+    """
+
+    if wave_size is None:
+        wave_size = math.ceil(len(ap_macs) * wave_percent / 100)
+    wave_size = max(1, wave_size)
+
+    return [ap_macs[i:i + wave_size] for i in range(0, len(ap_macs), wave_size)]
+
+
+def summary_status(summary):
+    """
+    Connection status in an AP summary (None if the controller did not answer)
+    """
+    if summary is None:
+        return None
+    return summary.get('status') or summary.get('connectionState')
+
+
+def rebooted_since(summary, seconds, online='Online'):
+    """
+    Whether an AP summary shows the AP went down after the reboot request: the
+    controller reports it not online, or its uptime is shorter than the time
+    since the request (it rebooted while nobody was polling)
+
+    Parameters:
+    summary - AP operational summary (None if the controller did not answer)
+    seconds - seconds since the reboot request
+    online - status reported by the controller for an AP which is up
+
+    Returns:
+    True or False
+    """
+
+    if summary is None:
+        return False
+    status = summary_status(summary)
+    if status is not None and status != online:
+        return True
+    uptime = summary.get('uptime')
+    return uptime is not None and uptime < seconds
+
+
+def wait_rebooted(apr, ap_macs, rebooted_at, poll_interval=15, timeout=900, online='Online'):
+    """
+    Poll APs until each of them was seen going down after the reboot request
+    and then online again, or the timeout passes. An AP still reporting online
+    right after the request has not rebooted yet and is not counted as back.
+
+    Parameters:
+    apr - Ruckus object
+    ap_macs - list of APs MAC addresses
+    rebooted_at - time.monotonic() of the reboot request
+    poll_interval - seconds between two polls
+    timeout - seconds to wait for the APs
+    online - status reported by the controller for an AP which is up
+
+    Returns:
+    (not_down, offline) - APs never seen going down, and APs which went down
+                          but did not come back, within the timeout
+    """
+
+    not_down = list(ap_macs)
+    offline = []
+    deadline = rebooted_at + timeout
+
+    with ThreadPoolExecutor(max_workers=max(1, apr.max_workers)) as executor:
+        while not_down or offline:
+            pending = not_down + offline
+            summaries = dict(zip(pending, executor.map(apr.ap_summary, pending)))
+            seconds = time.monotonic() - rebooted_at
+
+            # Seen down (or with a reset uptime) -- now it has to come back
+            went_down = [ap_mac for ap_mac in not_down
+                         if rebooted_since(summaries[ap_mac], seconds, online)]
+            not_down = [ap_mac for ap_mac in not_down if ap_mac not in went_down]
+            offline = [ap_mac for ap_mac in offline + went_down
+                       if summary_status(summaries[ap_mac]) != online]
+
+            if not (not_down or offline) or time.monotonic() + poll_interval > deadline:
+                break
+            time.sleep(poll_interval)
+
+    return not_down, offline
+
+
+def rolling_reboot(apr, ap_macs, wave_percent=10, wave_size=None,
+                   poll_interval=15, timeout=900, stop_on_failure=True):
+    """
+    Reboot APs in waves. Each wave is rebooted in parallel and polled until all
+    of its APs went down and are online again before the next wave starts.
+
+    Parameters:
+    apr - Ruckus object
+    ap_macs - list of APs MAC addresses
+    wave_percent - percent of the APs to reboot in each wave
+    wave_size - number of APs in each wave (overrides wave_percent)
+    poll_interval - seconds between two polls
+    timeout - seconds to wait for a wave to come back
+    stop_on_failure - do not start the next wave if APs of a wave failed to
+                      reboot, did not go down or did not come back
+
+    Returns:
+    report - list of dicts, one per wave: wave, aps, failed (reboot request
+             failed), not_down (never seen going down), offline (did not come
+             back), reboot_seconds, total_seconds
+    """
+
+    report = []
+    waves = split_waves(ap_macs, wave_percent, wave_size)
+
+    for number, wave in enumerate(waves, start=1):
+        print(f'\nWave {number}/{len(waves)}: rebooting {len(wave)} APs')
+        start = time.monotonic()
+
+        status_codes = apr.ap_reboot(wave)
+        rebooted = [ap_mac for ap_mac in wave if status_codes[ap_mac] in (200, 202, 204)]
+        failed = [ap_mac for ap_mac in wave if ap_mac not in rebooted]
+        reboot_seconds = time.monotonic() - start
+
+        # Wait for each AP to go down, then to come back online
+        not_down, offline = wait_rebooted(apr, rebooted, start, poll_interval,
+                                          timeout) if rebooted else ([], [])
+
+        report.append({'wave': number, 'aps': len(wave), 'failed': failed,
+                       'not_down': not_down, 'offline': offline,
+                       'reboot_seconds': round(reboot_seconds, 1),
+                       'total_seconds': round(time.monotonic() - start, 1)})
+        print(f'Wave {number}: {len(rebooted) - len(not_down) - len(offline)} back online, '
+              f'{len(failed)} failed to reboot, {len(not_down)} did not go down, '
+              f'{len(offline)} still offline ({report[-1]["total_seconds"]} seconds)')
+
+        if stop_on_failure and (failed or not_down or offline):
+            print('\nStopping the rolling reboot -- some APs of this wave are not back!')
+            break
+
+    return report
@@ -0,0 +1,274 @@
+"""
+Desired-state reconciliation of zones.
+
+The desired state says what the zones should look like (auth profile of each
+SSID, ChannelFly mode, AP login, radio settings, ...). The current state of the
+selected zones is read in one concurrent sweep, compared with the desired state,
+and only the zones which differ are changed -- one zone PATCH with the changed
+settings (see ruckus_changeset.py) plus one PATCH per WLAN whose auth profile
+differs. A run against zones which are already in the desired state sends no
+change at all.
+
+Desired state (JSON):
+    {
+        "zones": "ALL,!OFC",
+        "wlans": {"SFUSD": {"auth": "F5-VIP-ISE-Radius"}},
+        "zone": {
+            "autoChannelSelection24": {"channelSelectMode": "ChannelFly", "channelFlyMtbc": 480},
+            "autoChannelSelection50": {"channelSelectMode": "ChannelFly", "channelFlyMtbc": 480},
+            "login": {"apLoginName": "admin"},
+            "wifi24": {"txPower": "Full", "channelRange": [1, 6, 11]},
+            "dfsChannelEnabled": true
+        }
+    }
+
+"zones" is a zone group selection (see ruckus_selector.py), "zone" holds the
+fields of the zone PATCH and "wlans" the auth profile of each SSID.
+
+Write-only fields (apLoginPassword) are never sent back by the controller, so
+they cannot be compared: when the desired state has one, it is in the plan of
+every zone (marked as not verifiable, with the value hidden) and sent each run.
+
+Usage:
+    desired = load_desired('desired_state.json')
+    plan = plan_changes(apr, zones, desired)
+    print(format_plan(plan))
+    results = apply_plan(apr, plan)
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import json
+from ruckus_changeset import ZONE_SETTINGS
+
+
+# Fields the controller does not send back -- always part of the plan
+WRITE_ONLY_FIELDS = ('apLoginPassword',)
+
+
+def load_desired(filename):
+    """
+    Load the desired state from a JSON file
+
+    Parameters:
+    filename - JSON file (see the layout above)
+
+    Returns:
+    desired - dict with zones, zone and wlans
+    """
+
+    with open(filename) as desired_file:
+        desired = json.load(desired_file)
+
+    unknown = set(desired) - {'zones', 'zone', 'wlans'}
+    if unknown:
+        raise ValueError(f"Unknown key(s) in {filename}: {', '.join(sorted(unknown))}")
+
+    desired.setdefault('zones', 'ALL')
+    desired.setdefault('zone', {})
+    desired.setdefault('wlans', {})
+
+    # Zone settings and SSIDs are sets of fields -- anything else cannot be sent
+    if not isinstance(desired['zone'], dict) or not isinstance(desired['wlans'], dict):
+        raise ValueError(f'"zone" and "wlans" in {filename} must be objects')
+    for setting in ZONE_SETTINGS:
+        if setting in desired['zone'] and not isinstance(desired['zone'][setting], dict):
+            raise ValueError(f'zone {setting} in {filename} must be an object of fields')
+    for ssid, wanted in desired['wlans'].items():
+        if not isinstance(wanted, dict):
+            raise ValueError(f'wlans {ssid} in {filename} must be an object (e.g. {{"auth": ...}})')
+
+    return desired
+
+
+def diff(desired, current):
+    """
+    Fields of the desired state which differ from the current state. Nested
+    settings are compared field by field; fields which are not in the desired
+    state are left alone. Write-only fields the controller does not send back
+    always differ, and a nested setting with one is changed as a whole (e.g.
+    the AP login name goes with the password).
+
+    Parameters:
+    desired - dict of desired fields
+    current - dict of current fields (from the controller)
+
+    Returns:
+    changes - dict of the desired fields which differ (empty if none)
+    """
+
+    changes = {}
+    for key, value in desired.items():
+        if key not in current and key in WRITE_ONLY_FIELDS:
+            changes[key] = value
+        elif isinstance(value, dict) and isinstance(current.get(key), dict):
+            nested = diff(value, current[key])
+            if nested and any(field in WRITE_ONLY_FIELDS for field in nested):
+                changes[key] = value
+            elif nested:
+                changes[key] = nested
+        elif current.get(key) != value:
+            changes[key] = value
+
+    return changes
+
+
+def fetch_state(apr, zones, ssids):
+    """
+    Read the current state of zones in one concurrent sweep
+
+    Parameters:
+    apr - Ruckus object
+    zones - list of zones
+    ssids - SSIDs whose auth profile is compared
+
+    Returns:
+    results - list of (site, state) in zone order; state is a dict with zone
+              (configuration) and wlans (ssid -> {'id', 'auth'}), or the exception
+              raised while reading the zone
+    """
+
+    # One parallel sweep for the WLAN IDs of all zones
+    if ssids:
+        apr.build_wlan_index(zones)
+
+    def read_zone(site):
+        state = {'zone': apr.get_zones(site['id']), 'wlans': {}}
+        for ssid in ssids:
+            wlan = apr.find_wlan(site['id'], ssid)
+            if wlan is not None:
+                state['wlans'][ssid] = {'id': wlan['id'],
+                                        'auth': apr.get_wlan_auth(site['id'], wlan['id'])}
+        return state
+
+    return apr.run_zones(zones, read_zone)
+
+
+def plan_changes(apr, zones, desired):
+    """
+    Compare the selected zones with the desired state
+
+    Parameters:
+    apr - Ruckus object
+    zones - list of zones
+    desired - desired state (from load_desired)
+
+    Returns:
+    plan - list of dicts, one per zone: site, zone (changed zone fields), wlans
+           (ssid -> (wlan_id, current auth, desired auth)), missing (SSIDs the
+           zone does not have) and error (exception while reading the zone)
+    """
+
+    plan = []
+    for site, state in fetch_state(apr, zones, list(desired['wlans'])):
+        entry = {'site': site, 'zone': {}, 'wlans': {}, 'missing': [], 'error': None}
+        if isinstance(state, Exception):
+            entry['error'] = state
+            plan.append(entry)
+            continue
+
+        entry['zone'] = diff(desired['zone'], state['zone'])
+        for ssid, wanted in desired['wlans'].items():
+            wlan = state['wlans'].get(ssid)
+            if wlan is None:
+                entry['missing'].append(ssid)
+            elif 'auth' in wanted and wlan['auth'] != wanted['auth']:
+                entry['wlans'][ssid] = (wlan['id'], wlan['auth'], wanted['auth'])
+        plan.append(entry)
+
+    return plan
+
+
+def masked(value):
+    """
+    Copy of a planned value with the write-only fields hidden (for printing)
+    """
+    if not isinstance(value, dict):
+        return value
+    return {key: '********' if key in WRITE_ONLY_FIELDS else masked(item)
+            for key, item in value.items()}
+
+
+def unverifiable(field, value):
+    """
+    Whether a planned zone field is (or holds) a write-only field, which
+    cannot be compared with the controller
+    """
+    return field in WRITE_ONLY_FIELDS or (
+        isinstance(value, dict) and any(key in WRITE_ONLY_FIELDS for key in value))
+
+
+def needs_change(entry):
+    """
+    Whether a zone of the plan has anything to change
+    """
+    return bool(entry['zone'] or entry['wlans'])
+
+
+def format_plan(plan):
+    """
+    Text of the plan, one block per zone which differs
+
+    Parameters:
+    plan - list of dicts (from plan_changes)
+
+    Returns:
+    text - string
+    """
+
+    lines = []
+    for entry in plan:
+        name = entry['site']['name']
+        if entry['error'] is not None:
+            lines.append(f"{name} ... FAILED to read! {entry['error']}")
+            continue
+        if not needs_change(entry):
+            continue
+        lines.append(f"{name}:")
+        for field, value in entry['zone'].items():
+            note = ' (write-only, cannot be verified)' if unverifiable(field, value) else ''
+            lines.append(f"    zone {field} -> {json.dumps(masked({field: value})[field])}{note}")
+        for ssid, (_, current, wanted) in entry['wlans'].items():
+            lines.append(f"    WLAN {ssid} auth {current} -> {wanted}")
+
+    changed = sum(needs_change(entry) for entry in plan)
+    failed = sum(entry['error'] is not None for entry in plan)
+    lines.append(f"\n{changed} of {len(plan)} zones to change, "
+                 f"{len(plan) - changed - failed} already in the desired state, {failed} failed")
+    return '\n'.join(lines)
+
+
+def apply_plan(apr, plan):
+    """
+    Change only the zones of the plan which differ
+
+    Parameters:
+    apr - Ruckus object
+    plan - list of dicts (from plan_changes)
+
+    Returns:
+    results - list of (site, result) for the changed zones; result is a list of
+              (endpoint, status_code), or the exception raised
+    """
+
+    entries = {entry['site']['id']: entry for entry in plan if needs_change(entry)}
+
+    def apply_zone(site):
+        entry = entries[site['id']]
+        statuses = []
+        if entry['zone']:
+            changes = apr.zone_changes(site['id'])
+            for field, value in entry['zone'].items():
+                if field in ZONE_SETTINGS:
+                    changes.update(field, **value)
+                else:
+                    changes.set(**{field: value})
+            statuses.extend((endpoint, response.status_code)
+                            for endpoint, response in changes.flush())
+        for ssid, (wlan_id, _, wanted) in entry['wlans'].items():
+            statuses.append((f'wlan {ssid}', apr.modify_wlan_auth(site['id'], wlan_id, wanted)))
+        return statuses
+
+    return apr.run_zones([entry['site'] for entry in entries.values()], apply_zone)
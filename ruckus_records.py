@@ -0,0 +1,143 @@
+"""
+Compact record types for zones, WLANs, AP groups and APs.
+
+A record keeps the fields the scripts use as __slots__ attributes (no
+per-record dict) and, if asked to, the rest of the controller's payload as one
+compact JSON bytes object which is only decoded when .raw is used. Records also
+answer record['name'] and record.get('zoneId'), so they can stand in for the
+dicts returned by the Ruckus methods.
+
+Usage:
+    aps = list(apr.ap_records(zone_id))
+    macs = [ap.mac for ap in aps if ap.apgroup_id == apgroup_id]
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import json
+
+
+class Record:
+    """
+    Record base class -- subclasses list their fields in KEYS
+    """
+
+    # JSON key of the controller -> attribute of the record
+    KEYS = {}
+
+    __slots__ = ('_extra',)
+
+    @classmethod
+    def from_dict(cls, item, keep_raw=True):
+        """
+        Build a record from one item of a list response
+
+        Parameters:
+        item - dict from the controller
+        keep_raw - keep the keys which are not in KEYS (see .raw)
+
+        Returns:
+        record
+        """
+
+        record = cls.__new__(cls)
+        for key, attribute in cls.KEYS.items():
+            setattr(record, attribute, item.get(key))
+
+        extra = None
+        if keep_raw:
+            rest = {key: value for key, value in item.items() if key not in cls.KEYS}
+            if rest:
+                extra = json.dumps(rest, separators=(',', ':')).encode()
+        record._extra = extra
+        return record
+
+
+    @classmethod
+    def parse_list(cls, items, keep_raw=True):
+        """
+        Generator: build records from the items of a list response, one at a time
+        """
+        for item in items:
+            yield cls.from_dict(item, keep_raw)
+
+
+    @property
+    def raw(self):
+        """
+        The payload of the controller as a dict (decoded on every use)
+        """
+        data = {key: getattr(self, attribute) for key, attribute in self.KEYS.items()}
+        if self._extra is not None:
+            data.update(json.loads(self._extra))
+        return data
+
+
+    def __getitem__(self, key):
+        attribute = self.KEYS.get(key)
+        if attribute is not None:
+            return getattr(self, attribute)
+        return self.raw[key]
+
+
+    def get(self, key, default=None):
+        """
+        Same as dict.get, on the JSON keys of the controller
+        """
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+
+    def __contains__(self, key):
+        return key in self.KEYS or key in self.raw
+
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.raw == other.raw
+
+
+    def __hash__(self):
+        return hash((type(self), getattr(self, next(iter(self.KEYS.values())))))
+
+
+    def __repr__(self):
+        fields = ', '.join(f'{attribute}={getattr(self, attribute)!r}'
+                           for attribute in self.KEYS.values())
+        return f'{type(self).__name__}({fields})'
+
+
+class Zone(Record):
+    """
+    Zone record
+    """
+    KEYS = {'id': 'id', 'name': 'name'}
+    __slots__ = ('id', 'name')
+
+
+class Wlan(Record):
+    """
+    WLAN record
+    """
+    KEYS = {'id': 'id', 'name': 'name', 'ssid': 'ssid', 'zoneId': 'zone_id'}
+    __slots__ = ('id', 'name', 'ssid', 'zone_id')
+
+
+class ApGroup(Record):
+    """
+    AP group record
+    """
+    KEYS = {'id': 'id', 'name': 'name', 'zoneId': 'zone_id'}
+    __slots__ = ('id', 'name', 'zone_id')
+
+
+class Ap(Record):
+    """
+    AP record
+    """
+    KEYS = {'mac': 'mac', 'name': 'name', 'zoneId': 'zone_id', 'apGroupId': 'apgroup_id'}
+    __slots__ = ('mac', 'name', 'zone_id', 'apgroup_id')
@@ -0,0 +1,218 @@
+"""
+Zone selector: picks zone groups (CDC, ES, MS, HS, ...) out of the zone list.
+
+The group rules are compiled once into an index of zone positions per group, so
+each selection only touches the zones it returns. A rule can match on name
+prefixes, regular expressions and zone attributes, leave zones out, and be the
+union of other groups:
+
+    groups = {
+        'ES': {'prefix': 'ES-'},
+        'SECONDARY': {'groups': ['MS', 'HS']},
+        'LAB': {'regex': r'-LAB\\d*$', 'exclude': {'prefix': '00'}},
+        'CLOSED': {'attributes': {'description': 'Closed'}},
+    }
+
+A selection is one or more group names separated by commas; a name with a
+leading '!' is left out, e.g. 'ES,MS', 'ALL,!OFC', 'SECONDARY,!HS'.
+
+Usage:
+    selector = ZoneSelector(all_zones)
+    zones = selector.select('ES,MS')
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import json
+import re
+
+
+# The zone groups of SFUSD (see the menu of the mm_ scripts)
+DEFAULT_GROUPS = {
+    'CDC': {'prefix': 'CDC-'},
+    'ES': {'prefix': 'ES-'},
+    'MS': {'prefix': 'MS-'},
+    'HS': {'prefix': 'HS-'},
+    'OFC': {'prefix': 'OFC-'},
+    'TEST': {'prefix': '00'},
+}
+
+# Rule keys that are understood
+_RULE_KEYS = ('prefix', 'regex', 'attributes', 'exclude', 'groups')
+
+
+def load_groups(filename):
+    """
+    Load group rules from a JSON file (same layout as DEFAULT_GROUPS)
+
+    Parameters:
+    filename - JSON file
+
+    Returns:
+    groups - dict of group name -> rule
+    """
+    with open(filename) as groups_file:
+        return json.load(groups_file)
+
+
+def _as_tuple(value):
+    return (value,) if isinstance(value, str) else tuple(value)
+
+
+class ZoneSelector:
+    """
+    ZoneSelector class to compile group rules into an index over a zone list
+    """
+
+    def __init__(self, zones, groups=None):
+        """
+        Parameters:
+        zones - list of zones (from get_zones or the inventory)
+        groups - dict of group name -> rule (default DEFAULT_GROUPS)
+        """
+
+        self.zones = list(zones)
+        self.rules = {name.upper(): rule for name, rule in
+                      (DEFAULT_GROUPS if groups is None else groups).items()}
+
+        # Group name -> frozenset of zone positions, filled in by _compile
+        self._index = {'ALL': frozenset(range(len(self.zones)))}
+        for name in self.rules:
+            self._compile(name, ())
+
+
+    #-----------------------------------------------------------
+    # The METHODS below compile the rules!
+    #-----------------------------------------------------------
+
+    def _compile(self, name, parents):
+        """
+        Index the zone positions of one group (and of the groups it uses)
+
+        Parameters:
+        name - group name (upper case)
+        parents - groups being compiled above this one, to catch loops
+
+        Returns:
+        positions - frozenset of zone positions
+        """
+
+        if name in self._index:
+            return self._index[name]
+        if name in parents:
+            raise ValueError(f"Zone group {name} is defined in terms of itself")
+        if name not in self.rules:
+            raise KeyError(f"Unknown zone group {name}")
+
+        positions = self._match(self.rules[name], parents + (name,))
+        self._index[name] = positions
+        return positions
+
+
+    def _match(self, rule, parents):
+        """
+        Zone positions matching one rule
+
+        Parameters:
+        rule - dict with any of prefix, regex, attributes, exclude, groups
+        parents - groups being compiled, to catch loops
+
+        Returns:
+        positions - frozenset of zone positions
+        """
+
+        unknown = set(rule) - set(_RULE_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown zone rule key(s): {', '.join(sorted(unknown))}")
+
+        # Union of other groups (already indexed, or compiled now)
+        positions = set()
+        for group in _as_tuple(rule.get('groups', ())):
+            positions |= self._compile(group.upper(), parents)
+
+        # Tests of the zone itself -- a zone matches when it passes any of them
+        prefixes = _as_tuple(rule.get('prefix', ()))
+        regexes = [re.compile(pattern) for pattern in _as_tuple(rule.get('regex', ()))]
+        attributes = {key: tuple(value) if isinstance(value, (list, tuple)) else (value,)
+                      for key, value in rule.get('attributes', {}).items()}
+
+        if prefixes or regexes or attributes:
+            for position, site in enumerate(self.zones):
+                zone_name = site.get('name', '')
+                if (prefixes and zone_name.startswith(prefixes)) \
+                        or any(regex.search(zone_name) for regex in regexes) \
+                        or (attributes and all(site.get(key) in values
+                                               for key, values in attributes.items())):
+                    positions.add(position)
+
+        # Zones left out -- a group name, a list of group names or a rule
+        exclude = rule.get('exclude')
+        if isinstance(exclude, dict):
+            positions -= self._match(exclude, parents)
+        elif exclude:
+            for group in _as_tuple(exclude):
+                positions -= self._compile(group.upper(), parents)
+
+        return frozenset(positions)
+
+
+    #-----------------------------------------------------------
+    # The METHODS below answer selections!
+    #-----------------------------------------------------------
+
+    @property
+    def groups(self):
+        """
+        Names of the groups which can be selected
+        """
+        return list(self._index)
+
+
+    def positions(self, selection):
+        """
+        Zone positions of a selection
+
+        Parameters:
+        selection - group names separated by commas, '!' in front to leave out
+
+        Returns:
+        positions - set of zone positions
+        """
+
+        included = set()
+        excluded = set()
+        for term in selection.split(','):
+            term = term.strip().upper()
+            if not term:
+                continue
+            if term.startswith('!'):
+                excluded |= self._index_of(term[1:].strip())
+            else:
+                included |= self._index_of(term)
+
+        # Only exclusions (e.g. '!OFC') means all zones but those
+        if excluded and not included:
+            included = set(self._index['ALL'])
+        return included - excluded
+
+
+    def _index_of(self, name):
+        try:
+            return self._index[name]
+        except KeyError:
+            raise KeyError(f"Unknown zone group {name}") from None
+
+
+    def select(self, selection):
+        """
+        Zones of a selection, in the order of the zone list
+
+        Parameters:
+        selection - group names separated by commas, '!' in front to leave out
+
+        Returns:
+        zones - list of zones
+        """
+        return [self.zones[position] for position in sorted(self.positions(selection))]
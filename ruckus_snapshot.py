@@ -0,0 +1,291 @@
+"""
+Incremental, compressed snapshots of the zone configuration.
+
+The full configuration of every zone (zone, WLANs, AP groups) is read
+concurrently and stored content-addressed: each zone is written once as
+gzip-compressed JSON named after the SHA-256 of its content, and a snapshot is a
+small manifest of zone -> hash. A zone which did not change since the last
+snapshot has the same hash, so nothing new is written for it -- a nightly
+snapshot of hundreds of unchanged zones adds only its manifest.
+
+Layout of the store:
+    <store>/objects/ab/abcdef....json.gz            one per distinct zone config
+    <store>/snapshots/<controller>/<time>.json      manifest of one snapshot
+                                                    (<time>_<n>.json for the same time)
+
+Usage:
+    store = SnapshotStore('ruckus_snapshots')
+    manifest = take_snapshot(apr, store, zones)
+    config = store.zone_config(manifest, zone_id)
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+from datetime import datetime
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+
+
+class SnapshotStore:
+    """
+    SnapshotStore class to keep deduplicated, compressed zone configurations
+    """
+
+    def __init__(self, root):
+        """
+        Parameters:
+        root - folder of the store
+        """
+
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.snapshots_dir = os.path.join(root, 'snapshots')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f'{digest}.json.gz')
+
+
+    def put(self, config):
+        """
+        Store one zone configuration (unless the same content is already stored)
+
+        Parameters:
+        config - JSON-serialisable dict
+
+        Returns:
+        digest - SHA-256 of the content
+        written - True if the content was new
+        """
+
+        # Canonical JSON, so the same configuration always has the same hash
+        data = json.dumps(config, sort_keys=True, separators=(',', ':')).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        if os.path.exists(path):
+            return digest, False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename, so a crash never leaves half an object
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with gzip.open(temp_path, 'wb', compresslevel=9) as out_file:
+            out_file.write(data)
+        os.replace(temp_path, path)
+        return digest, True
+
+
+    def get(self, digest):
+        """
+        Load one stored zone configuration
+
+        Parameters:
+        digest - SHA-256 of the content
+
+        Returns:
+        config - dict
+        """
+        with gzip.open(self._object_path(digest), 'rb') as in_file:
+            return json.loads(in_file.read())
+
+
+    #-----------------------------------------------------------
+    # The METHODS below are for the snapshot manifests!
+    #-----------------------------------------------------------
+
+    def _controller_dir(self, controller):
+        return os.path.join(self.snapshots_dir, re.sub(r'[^\w.-]+', '_', controller))
+
+
+    def save_manifest(self, manifest):
+        """
+        Write the manifest of a snapshot
+
+        Parameters:
+        manifest - dict with controller, time and zones (zone_id -> {'name', 'hash'})
+
+        Returns:
+        filename - manifest file (<time>.json, or <time>_<n>.json when a
+                   manifest with the same time is already there -- an existing
+                   manifest is never overwritten)
+        """
+
+        folder = self._controller_dir(manifest['controller'])
+        os.makedirs(folder, exist_ok=True)
+        stem = manifest['time'].replace(':', '')
+
+        count = 0
+        while True:
+            name = f'{stem}_{count}.json' if count else f'{stem}.json'
+            filename = os.path.join(folder, name)
+            try:
+                # 'x' fails instead of overwriting a manifest of the same time
+                with open(filename, 'x') as out_file:
+                    json.dump(manifest, out_file, indent=1, sort_keys=True)
+                return filename
+            except FileExistsError:
+                count += 1
+
+
+    def snapshots(self, controller=None):
+        """
+        Manifest files of the store, oldest first
+
+        Parameters:
+        controller - only the snapshots of this controller (default all)
+
+        Returns:
+        filenames - list of manifest files
+        """
+
+        folders = [self._controller_dir(controller)] if controller else \
+            [os.path.join(self.snapshots_dir, name) for name in os.listdir(self.snapshots_dir)]
+
+        filenames = []
+        for folder in folders:
+            if os.path.isdir(folder):
+                filenames.extend(os.path.join(folder, name) for name in os.listdir(folder)
+                                 if name.endswith('.json'))
+        return sorted(filenames, key=_snapshot_order)
+
+
+    @staticmethod
+    def load_manifest(filename):
+        """
+        Load the manifest of a snapshot
+        """
+        with open(filename) as in_file:
+            return json.load(in_file)
+
+
+    def zone_config(self, manifest, zone):
+        """
+        Configuration of one zone in a snapshot
+
+        Parameters:
+        manifest - manifest of the snapshot
+        zone - zone ID or zone name
+
+        Returns:
+        config - dict with zone, wlans, apgroups (None if the zone is not in the snapshot)
+        """
+
+        for zone_id, entry in manifest['zones'].items():
+            if zone in (zone_id, entry['name']):
+                return self.get(entry['hash'])
+        return None
+
+
+def _snapshot_order(filename):
+    """
+    Sort key of a manifest file: time, then the _<n> suffix of manifests of the
+    same time, then the path (so equal times of two controllers always come in
+    the same order)
+    """
+    stem = os.path.basename(filename)[:-len('.json')]
+    snapshot_time, _, count = stem.partition('_')
+    return snapshot_time, int(count or 0), filename
+
+
+def _get_json(apr, url):
+    """
+    GET one configuration object -- an error answer raises, so it is never
+    stored as the configuration
+    """
+    response = apr.session.get(url)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_zone_config(apr, site):
+    """
+    Read the full configuration of one zone
+
+    Parameters:
+    apr - Ruckus object
+    site - zone info (from get_zones)
+
+    Returns:
+    config - dict with zone (configuration), wlans and apgroups (full details,
+             sorted by ID); requests.exceptions.HTTPError is raised when any
+             part cannot be read
+    """
+
+    zone_uri = f"{apr.scg200_uri}/v5_0/rkszones/{site['id']}"
+    wlans = [_get_json(apr, f"{zone_uri}/wlans/{wlan['id']}")
+             for wlan in apr.iter_wlans(site['id'], fields=('id',))]
+    apgroups = [_get_json(apr, f"{zone_uri}/apgroups/{group['id']}")
+                for group in apr.iter_apgroups(site['id'], fields=('id',))]
+
+    return {'zone': _get_json(apr, zone_uri),
+            'wlans': sorted(wlans, key=lambda wlan: str(wlan.get('id'))),
+            'apgroups': sorted(apgroups, key=lambda group: str(group.get('id')))}
+
+
+def take_snapshot(apr, store, zones, previous=None):
+    """
+    Snapshot the configuration of zones, writing only the zones which changed
+
+    Parameters:
+    apr - Ruckus object
+    store - SnapshotStore
+    zones - list of zones
+    previous - manifest of the last snapshot, to report what changed (optional)
+
+    Returns:
+    manifest - dict with controller, time, zones (zone_id -> {'name', 'hash'}),
+               failed (zone name -> error), written (new objects) and changed
+               (zones whose hash differs from the previous snapshot)
+    """
+
+    results = apr.run_zones(zones, lambda site: store.put(fetch_zone_config(apr, site)))
+
+    manifest = {'controller': apr.controller_ip,
+                'time': datetime.now().isoformat(timespec='microseconds'),
+                'zones': {}, 'failed': {}, 'written': 0, 'changed': []}
+    old_zones = previous['zones'] if previous else {}
+
+    for site, result in results:
+        if isinstance(result, Exception):
+            manifest['failed'][site['name']] = str(result)
+            # Keep the last good configuration of the zone in the snapshot
+            if site['id'] in old_zones:
+                manifest['zones'][site['id']] = old_zones[site['id']]
+            continue
+        digest, written = result
+        manifest['zones'][site['id']] = {'name': site['name'], 'hash': digest}
+        manifest['written'] += written
+        if old_zones.get(site['id'], {}).get('hash') != digest:
+            manifest['changed'].append(site['name'])
+
+    return manifest
+
+
+def diff_snapshots(old, new):
+    """
+    Zones added, removed and changed between two snapshots
+
+    Parameters:
+    old - manifest of the older snapshot
+    new - manifest of the newer snapshot
+
+    Returns:
+    added, removed, changed - lists of zone names
+    """
+
+    added = [entry['name'] for zone_id, entry in new['zones'].items()
+             if zone_id not in old['zones']]
+    removed = [entry['name'] for zone_id, entry in old['zones'].items()
+               if zone_id not in new['zones']]
+    changed = [entry['name'] for zone_id, entry in new['zones'].items()
+               if zone_id in old['zones'] and old['zones'][zone_id]['hash'] != entry['hash']]
+    return added, removed, changed
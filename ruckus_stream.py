@@ -0,0 +1,209 @@
+"""
+Streaming decode of the list responses of the controller.
+
+StreamedList reads a response like {"totalCount": .., "hasMore": .., "list": [..]}
+from the socket in chunks and yields the items of "list" one at a time, so the
+whole document is never held in memory. With a field projection, only the keys
+in use (e.g. id, name, mac, status) are kept of each item.
+
+Usage:
+    response = session.get(url, stream=True)
+    items = StreamedList(response, fields=('mac', 'name', 'zoneId'))
+    for ap in items:
+        ...
+    has_more = items.meta.get('hasMore')
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import codecs
+import json
+
+
+class StreamedList:
+    """
+    StreamedList class to iterate over the items of a streamed JSON list response
+    """
+
+    # The decoder is asked for more text when a value runs into the end of the buffer
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, response, list_key='list', fields=None, chunk_size=64 * 1024):
+        """
+        Parameters:
+        response - requests Response opened with stream=True
+        list_key - key of the list in the top-level object
+        fields - keys to keep of each item (default all keys)
+        chunk_size - bytes to read from the socket at a time
+        """
+
+        self.response = response
+        self.list_key = list_key
+        self.fields = tuple(fields) if fields is not None else None
+        # Top-level keys other than the list (hasMore, totalCount, ...)
+        self.meta = {}
+
+        self._chunks = response.iter_content(chunk_size=chunk_size)
+        self._text = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._items = None
+
+
+    #-----------------------------------------------------------
+    # The METHODS below read the buffer!
+    #-----------------------------------------------------------
+
+    def _read_more(self):
+        """
+        Add the next chunk of the body to the buffer
+
+        Returns:
+        False at the end of the body
+        """
+
+        # Drop what was already parsed, so the buffer stays about one item long
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer += self._text.decode(chunk)
+                return True
+
+        self._buffer += self._text.decode(b'', final=True)
+        self._eof = True
+        return False
+
+
+    def _peek(self):
+        """
+        Skip whitespace and return the next character ('' at the end of the body)
+        """
+
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+
+
+    def _expect(self, chars):
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(f'Unexpected {char!r} in the list response, expected {chars!r}')
+        self._pos += 1
+        return char
+
+
+    def _value(self):
+        """
+        Decode the next JSON value, reading more of the body until it is complete
+        """
+
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise
+            # A number at the end of the buffer may go on in the next chunk
+            if end == len(self._buffer) and not self._eof and self._read_more():
+                continue
+            self._pos = end
+            return value
+
+
+    #-----------------------------------------------------------
+    # The METHODS below walk the document!
+    #-----------------------------------------------------------
+
+    def start(self):
+        """
+        Read the document up to the first item of the list. The top-level keys
+        which come before the list (usually hasMore and totalCount) are in meta
+        afterwards.
+
+        Returns:
+        meta - dict
+        """
+
+        if self._items is None:
+            self._items = self._walk()
+            # Run the generator up to the start of the list
+            next(self._items)
+        return self.meta
+
+
+    def __iter__(self):
+        self.start()
+        try:
+            yield from self._items
+        finally:
+            self.response.close()
+
+
+    def _walk(self):
+        """
+        Generator: yields None once at the start of the list, then the items
+        """
+
+        # Empty body (e.g. an error without a message) -- nothing to yield
+        if self._peek() == '':
+            yield None
+            return
+
+        if self._expect('{[') == '[':
+            # The body is a bare list
+            yield None
+            yield from self._list_items()
+            return
+
+        list_started = False
+        if self._peek() == '}':
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                self._expect(':')
+
+                if key == self.list_key:
+                    self._expect('[')
+                    list_started = True
+                    yield None
+                    yield from self._list_items()
+                else:
+                    self.meta[key] = self._value()
+
+                if self._expect(',}') == '}':
+                    break
+
+        # No list in the document (e.g. an error message) -- nothing to yield
+        if not list_started:
+            yield None
+
+
+    def _list_items(self):
+        """
+        Generator: yields the items of a list whose '[' was just read
+        """
+
+        if self._peek() == ']':
+            self._pos += 1
+            return
+
+        while True:
+            item = self._value()
+            if self.fields is not None and isinstance(item, dict):
+                item = {key: item[key] for key in self.fields if key in item}
+            yield item
+
+            if self._expect(',]') == ']':
+                return
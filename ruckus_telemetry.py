@@ -0,0 +1,504 @@
+"""
+AP status telemetry: a poller which samples the status of all APs in bulk
+(one AP query per page, not one request per AP) at a fixed interval, and keeps
+the samples in memory as fixed-size ring buffers.
+
+Each AP has one ring per metric (online, clients, channel24, channel50). A ring
+holds the first value and the differences between consecutive samples in an
+int array, so a steady AP costs 4 bytes per sample and metric, and the flushed
+file (gzip JSON) is mostly zeros. The sample times are kept the same way, once
+for all APs. Zone status is the sum over the APs of the zone.
+
+Usage:
+    store = TelemetryStore(capacity=1440)
+    with TelemetryPoller(apr, store, interval=60, flush_file='telemetry.json.gz'):
+        ...
+    store.zone_series(zone_id, 'online', since=time.time() - 3600)
+    store.changes('channel50', zone_id=zone_id)
+
+    store = TelemetryStore.load('telemetry.json.gz')
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+from array import array
+import gzip
+import json
+import os
+import re
+import threading
+import time
+
+
+# Metrics kept for every AP
+METRICS = ('online', 'clients', 'channel24', 'channel50')
+
+# Keys of the AP query used by the poller
+QUERY_FIELDS = ('apMac', 'deviceName', 'zoneId', 'status', 'numClients', 'channel24G',
+                'channel50G')
+
+
+def _channel(value):
+    # The query answers e.g. "36 (40MHz)" -- 0 when the radio is off or not reported
+    match = re.match(r'\s*(\d+)', str(value or ''))
+    return int(match.group(1)) if match else 0
+
+
+def sample_values(item):
+    """
+    Metrics of one item of the AP query
+
+    Parameters:
+    item - dict of the AP query (apMac, status, numClients, ...)
+
+    Returns:
+    values - tuple of the METRICS values
+    """
+    return (1 if item.get('status') == 'Online' else 0, int(item.get('numClients') or 0),
+            _channel(item.get('channel24G')), _channel(item.get('channel50G')))
+
+
+class DeltaRing:
+    """
+    DeltaRing class -- the last `capacity` values of an integer series, stored
+    as the oldest value plus the difference of each value to the one before
+    """
+
+    __slots__ = ('capacity', 'count', 'first', 'last', 'deltas')
+
+    def __init__(self, capacity):
+
+        # The oldest value is kept apart from the differences, so a ring needs
+        #   room for at least one difference
+        if capacity < 2:
+            raise ValueError(f'A ring needs a capacity of 2 or more, not {capacity}')
+        self.capacity = capacity
+        # Values appended so far (the ring holds the last min(count, capacity))
+        self.count = 0
+        self.first = 0
+        self.last = 0
+        self.deltas = array('i', bytes(4 * capacity))
+
+
+    def append(self, value):
+        """
+        Add a value, dropping the oldest one when the ring is full
+        """
+
+        if self.count == 0:
+            self.first = self.last = value
+            self.count = 1
+            return
+
+        if self.count >= self.capacity:
+            # The second oldest value becomes the oldest one, and its slot is reused
+            self.first += self.deltas[(self.count - self.capacity + 1) % self.capacity]
+
+        self.deltas[self.count % self.capacity] = value - self.last
+        self.last = value
+        self.count += 1
+
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+
+    def values(self):
+        """
+        Values in the ring, oldest first
+
+        Returns:
+        list of int
+        """
+
+        values = []
+        value = self.first
+        for number in range(self.count - len(self), self.count):
+            if values:
+                value += self.deltas[number % self.capacity]
+            values.append(value)
+        return values
+
+
+    def to_dict(self):
+        """
+        The ring as plain JSON data (oldest value and the differences in order)
+        """
+        start = self.count - len(self)
+        return {'first': self.first,
+                'deltas': [self.deltas[number % self.capacity]
+                           for number in range(start + 1, self.count)]}
+
+
+    @classmethod
+    def from_values(cls, capacity, values):
+        """
+        Build a ring from a list of values
+        """
+        ring = cls(capacity)
+        for value in values:
+            ring.append(value)
+        return ring
+
+
+class ApSeries:
+    """
+    ApSeries class -- the rings of one AP
+    """
+
+    __slots__ = ('name', 'zone_id', 'missing', 'rings')
+
+    def __init__(self, capacity, name=None, zone_id=None):
+
+        self.name = name
+        self.zone_id = zone_id
+        # Samples in a row in which the AP was not reported
+        self.missing = 0
+        self.rings = tuple(DeltaRing(capacity) for _ in METRICS)
+
+
+class TelemetryStore:
+    """
+    TelemetryStore class to keep AP status samples and answer queries on them
+    """
+
+    def __init__(self, capacity=1440):
+        """
+        Parameters:
+        capacity - samples kept per AP, 2 or more (e.g. 1440 = one day at a 60
+                   seconds interval)
+        """
+
+        self.capacity = capacity
+        self.times = DeltaRing(capacity)
+        # AP MAC -> ApSeries
+        self.aps = {}
+        # The poller thread writes while the caller queries
+        self.lock = threading.Lock()
+
+
+    def record(self, timestamp, items):
+        """
+        Add one sample of all APs
+
+        An AP which is not reported is counted as offline with no clients (its
+        channels are kept). An AP not reported for a whole ring is dropped.
+
+        Parameters:
+        timestamp - time of the sample (seconds)
+        items - AP query items (see QUERY_FIELDS)
+
+        Returns:
+        count - number of APs reported in the sample
+        """
+
+        reported = {}
+        for item in items:
+            reported[item['apMac'].upper()] = item
+
+        with self.lock:
+            self.times.append(int(timestamp))
+
+            for mac, item in reported.items():
+                series = self.aps.get(mac)
+                if series is None:
+                    series = self.aps[mac] = ApSeries(self.capacity)
+                series.name = item.get('deviceName')
+                series.zone_id = item.get('zoneId')
+                series.missing = 0
+                for ring, value in zip(series.rings, sample_values(item)):
+                    ring.append(value)
+
+            for mac in [mac for mac in self.aps if mac not in reported]:
+                series = self.aps[mac]
+                series.missing += 1
+                if series.missing >= self.capacity:
+                    del self.aps[mac]
+                    continue
+                online, clients, channel24, channel50 = series.rings
+                online.append(0)
+                clients.append(0)
+                channel24.append(channel24.last)
+                channel50.append(channel50.last)
+
+        return len(reported)
+
+
+    #-----------------------------------------------------------
+    # The METHODS below answer queries!
+    #-----------------------------------------------------------
+
+    def _window(self, ring, since, until, times=None):
+        # The last len(ring) sample times belong to the ring's values
+        if times is None:
+            times = self.times.values()
+        times = times[-len(ring):] if len(ring) else []
+        return [(when, value) for when, value in zip(times, ring.values())
+                if (since is None or when >= since) and (until is None or when <= until)]
+
+
+    def ap_series(self, ap_mac, metric='online', since=None, until=None):
+        """
+        Samples of one AP
+
+        Parameters:
+        ap_mac - MAC address of the AP
+        metric - online, clients, channel24 or channel50
+        since, until - time window (seconds, default all samples)
+
+        Returns:
+        list of (time, value)
+        """
+
+        with self.lock:
+            series = self.aps.get(ap_mac.upper())
+            if series is None:
+                return []
+            return self._window(series.rings[METRICS.index(metric)], since, until)
+
+
+    def zone_aps(self, zone_id):
+        """
+        MAC addresses of the APs of a zone (as of their last sample)
+        """
+        with self.lock:
+            return [mac for mac, series in self.aps.items() if series.zone_id == zone_id]
+
+
+    def zone_series(self, zone_id, metric='online', since=None, until=None):
+        """
+        Sum of a metric over the APs of a zone at each sample (e.g. APs online,
+        clients connected)
+
+        Parameters:
+        zone_id - zone ID value
+        metric - online or clients
+        since, until - time window (seconds, default all samples)
+
+        Returns:
+        list of (time, value)
+        """
+
+        totals = {}
+        with self.lock:
+            times = self.times.values()
+            for series in self.aps.values():
+                if series.zone_id != zone_id:
+                    continue
+                for when, value in self._window(series.rings[METRICS.index(metric)],
+                                                since, until, times):
+                    totals[when] = totals.get(when, 0) + value
+        return sorted(totals.items())
+
+
+    def zone_status(self):
+        """
+        Latest status of every zone
+
+        Returns:
+        dict of zone_id -> dict with aps, online and clients
+        """
+
+        zones = {}
+        with self.lock:
+            for series in self.aps.values():
+                zone = zones.setdefault(series.zone_id, {'aps': 0, 'online': 0, 'clients': 0})
+                zone['aps'] += 1
+                zone['online'] += series.rings[0].last
+                zone['clients'] += series.rings[1].last
+        return zones
+
+
+    def changes(self, metric='channel24', zone_id=None, since=None, until=None):
+        """
+        Every change of a metric (e.g. channel changes after ChannelFly, APs
+        going down and up)
+
+        Parameters:
+        metric - online, clients, channel24 or channel50
+        zone_id - only the APs of this zone (default all APs)
+        since, until - time window (seconds, default all samples)
+
+        Returns:
+        list of (time, AP MAC, old value, new value) in time order
+        """
+
+        found = []
+        with self.lock:
+            times = self.times.values()
+            for mac, series in self.aps.items():
+                if zone_id is not None and series.zone_id != zone_id:
+                    continue
+                samples = self._window(series.rings[METRICS.index(metric)], None, until,
+                                       times)
+                for (_, old), (when, new) in zip(samples, samples[1:]):
+                    if old != new and (since is None or when >= since):
+                        found.append((when, mac, old, new))
+        return sorted(found)
+
+
+    #-----------------------------------------------------------
+    # The METHODS below write and read the store!
+    #-----------------------------------------------------------
+
+    def to_dict(self):
+        """
+        The store as plain JSON data
+        """
+        with self.lock:
+            return {'capacity': self.capacity, 'metrics': list(METRICS),
+                    'times': self.times.to_dict(),
+                    'aps': {mac: {'name': series.name, 'zone_id': series.zone_id,
+                                  'missing': series.missing,
+                                  'series': [ring.to_dict() for ring in series.rings]}
+                            for mac, series in self.aps.items()}}
+
+
+    def flush(self, filename):
+        """
+        Write the store to a gzip JSON file (written to a temporary file first,
+        so a crash never leaves a torn file behind)
+
+        Parameters:
+        filename - file to write
+
+        Returns:
+        size - bytes written
+        """
+
+        data = json.dumps(self.to_dict(), separators=(',', ':')).encode()
+        temp = f'{filename}.tmp'
+        with gzip.open(temp, 'wb', compresslevel=6) as out_file:
+            out_file.write(data)
+        os.replace(temp, filename)
+        return os.path.getsize(filename)
+
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read a store written by flush
+
+        Parameters:
+        filename - gzip JSON file
+
+        Returns:
+        store - TelemetryStore
+        """
+
+        with gzip.open(filename, 'rb') as in_file:
+            data = json.load(in_file)
+
+        def values(ring):
+            result = [ring['first']]
+            for delta in ring['deltas']:
+                result.append(result[-1] + delta)
+            return result
+
+        store = cls(data['capacity'])
+        store.times = DeltaRing.from_values(store.capacity, values(data['times']))
+        for mac, item in data['aps'].items():
+            series = ApSeries(store.capacity, item['name'], item['zone_id'])
+            series.missing = item['missing']
+            series.rings = tuple(DeltaRing.from_values(store.capacity, values(ring))
+                                 for ring in item['series'])
+            store.aps[mac] = series
+        return store
+
+
+class TelemetryPoller:
+    """
+    TelemetryPoller class to sample the AP status in a background thread
+    """
+
+    def __init__(self, apr, store=None, interval=60, zone_ids=None, flush_file=None,
+                 flush_every=10):
+        """
+        Parameters:
+        apr - Ruckus object
+        store - TelemetryStore (default a new one of 1440 samples)
+        interval - seconds between samples
+        zone_ids - only the APs of these zones (default all APs, in one query)
+        flush_file - gzip JSON file the store is written to (default not written)
+        flush_every - write the store every this many samples (and when stopped)
+        """
+
+        self.apr = apr
+        self.store = store if store is not None else TelemetryStore()
+        self.interval = interval
+        self.zone_ids = list(zone_ids) if zone_ids is not None else None
+        self.flush_file = flush_file
+        self.flush_every = max(1, flush_every)
+
+        self.samples = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+
+    def poll_once(self):
+        """
+        Take one sample of all APs. The whole sample is read before it is
+        recorded: a failed page raises and nothing is recorded, so a controller
+        error never shows up as all APs offline.
+
+        Returns:
+        count - number of APs reported
+        """
+
+        timestamp = time.time()
+        if self.zone_ids is None:
+            items = list(self.apr.iter_ap_status(fields=QUERY_FIELDS))
+        else:
+            items = [item for zone_id in self.zone_ids
+                     for item in self.apr.iter_ap_status(zone_id, fields=QUERY_FIELDS)]
+
+        count = self.store.record(timestamp, items)
+        self.samples += 1
+        if self.flush_file and self.samples % self.flush_every == 0:
+            self.store.flush(self.flush_file)
+        return count
+
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll_once()
+            except Exception as err:      # pylint: disable=broad-except
+                # A failed sample is skipped -- the next one is tried on time
+                self.errors += 1
+                print(f'Telemetry sample of {self.apr.controller_ip} ... FAILED! {err}')
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+
+    def start(self):
+        """
+        Start sampling in a background thread
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+
+    def stop(self):
+        """
+        Stop sampling and write the store a last time
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.flush_file and self.samples:
+            self.store.flush(self.flush_file)
+
+
+    def __enter__(self):
+        return self.start()
+
+
+    def __exit__(self, *exc_info):
+        self.stop()
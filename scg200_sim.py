@@ -0,0 +1,536 @@
+#!/usr/bin/env python
+
+"""
+Local stand-in for the Ruckus SCG200 public API, to measure and regression-test
+the Ruckus client and the mm_ scripts without a real controller.
+
+It keeps zones, WLANs, AP groups and APs in memory (PATCHes are reflected in
+later GETs) and serves sessions, rkszones, wlans, apgroups, autoChannelSelection
+24/50, wifi24/50, login, aps and query/ap over plain HTTP, with an ETag on every GET.
+Per-request latency, random errors (503) and throttling (429 above a number of
+requests in flight) can be injected.
+
+Usage:
+    python scg200_sim.py --zones 100 --aps-per-zone 20 --port 8080
+    then use http://127.0.0.1:8080 as the Controller IP
+
+    or from Python:
+    with SCG200Simulator(zones=100) as sim:
+        apr = Ruckus(sim.url, 'admin', 'admin')
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+API = '/wsg/api/public/v5_0'
+
+
+class SCG200Simulator:
+    """
+    SCG200Simulator class to run a stand-in controller in a background thread
+    """
+
+    def __init__(self, zones=10, aps_per_zone=10, apgroups_per_zone=2, port=0, latency=0.0,
+                 error_rate=0.0, throttle_above=None, session_ttl=None, seed=0,
+                 max_list_size=None):
+        """
+        Parameters:
+        zones - number of zones
+        aps_per_zone - number of APs in each zone
+        apgroups_per_zone - number of AP groups in each zone
+        port - TCP port to listen on (0 picks a free port)
+        latency - seconds added to every request, or (min, max) for a random latency
+        error_rate - fraction of requests answered with 503
+        throttle_above - answer 429 when more requests than this are in flight
+        session_ttl - seconds after which a session expires (401)
+        seed - seed of the random generator
+        max_list_size - largest page the controller answers, whatever listSize asks for
+        """
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_above = throttle_above
+        self.session_ttl = session_ttl
+        self.max_list_size = max_list_size
+        self.random = random.Random(seed)
+
+        self.request_count = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.sessions = {}
+        self.domain_id = str(uuid.UUID(int=self.random.getrandbits(128)))
+        self.lock = threading.Lock()
+        # Bytes of each AP support log
+        self.support_log_size = 64 * 1024
+        # A rebooted AP stays Online for reboot_down_after seconds, then is
+        #   Offline for reboot_seconds
+        self.reboot_down_after = 0.0
+        self.reboot_seconds = 2.0
+        self.started_at = time.monotonic()
+
+        self._build(zones, aps_per_zone, apgroups_per_zone)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), _Handler)
+        self.server.daemon_threads = True
+        self.server.simulator = self
+        self.thread = None
+
+
+    def _build(self, zones, aps_per_zone, apgroups_per_zone):
+        """
+        Create the zones, WLANs, AP groups and APs
+        """
+
+        groups = ['CDC', 'ES', 'MS', 'HS', 'OFC', '00']
+        self.zones = {}
+        self.wlans = {}
+        self.apgroups = {}
+        self.aps = {}
+
+        for number in range(zones):
+            zone_id = str(uuid.UUID(int=self.random.getrandbits(128)))
+            prefix = groups[number % len(groups)]
+            name = f'{prefix}{"" if prefix == "00" else "-"}Zone{number:04d}'
+            self.zones[zone_id] = {
+                'id': zone_id, 'name': name, 'description': '', 'countryCode': 'US',
+                'dfsChannelEnabled': False,
+                'login': {'apLoginName': 'admin', 'apLoginPassword': 'password'},
+                'wifi24': {'txPower': 'Full', 'channelRange': [1, 6, 11]},
+                'wifi50': {'txPower': 'Full', 'indoorChannelRange': [36, 44, 149, 157],
+                           'outdoorChannelRange': [36, 44, 149, 157]},
+                'autoChannelSelection24': {'channelSelectMode': 'ChannelFly',
+                                           'channelFlyMtbc': 480},
+                'autoChannelSelection50': {'channelSelectMode': 'ChannelFly',
+                                           'channelFlyMtbc': 480}}
+
+            self.wlans[zone_id] = {}
+            for wlan_number, ssid in enumerate(('SFUSD', 'SFUSD-Guest'), start=1):
+                self.wlans[zone_id][str(wlan_number)] = {
+                    'id': str(wlan_number), 'name': ssid, 'ssid': ssid, 'zoneId': zone_id,
+                    'authServiceOrProfile': {'name': 'NPS-Radius-Proxy'}}
+
+            self.apgroups[zone_id] = {}
+            for group_number in range(apgroups_per_zone):
+                group_id = str(uuid.UUID(int=self.random.getrandbits(128)))
+                self.apgroups[zone_id][group_id] = {
+                    'id': group_id, 'name': f'{name}-G{group_number}', 'zoneId': zone_id}
+            group_ids = list(self.apgroups[zone_id]) or [None]
+
+            for ap_number in range(aps_per_zone):
+                mac = ':'.join(f'{b:02X}' for b in
+                               (0x2C, 0xC5, number >> 8, number & 0xFF,
+                                ap_number >> 8, ap_number & 0xFF))
+                self.aps[mac] = {
+                    'mac': mac, 'name': f'{name}-AP{ap_number:03d}', 'zoneId': zone_id,
+                    'apGroupId': group_ids[ap_number % len(group_ids)], 'model': 'R710',
+                    'status': 'Online', 'clientCount': 0, 'channel24': 6, 'channel50': 36,
+                    'rebootedAt': None}
+
+
+    @property
+    def url(self):
+        """
+        Base URL to use as the Controller IP
+        """
+        return f'http://127.0.0.1:{self.server.server_port}'
+
+
+    def start(self):
+        """
+        Start serving in a background thread
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+
+    def stop(self):
+        """
+        Stop serving
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+
+    def __enter__(self):
+        return self.start()
+
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+    def ap_status(self, ap):
+        """
+        Status of an AP -- a rebooted AP is offline for a few seconds
+        """
+        if ap['rebootedAt'] is not None:
+            since = time.monotonic() - ap['rebootedAt']
+            if self.reboot_down_after <= since < self.reboot_down_after + self.reboot_seconds:
+                return 'Offline'
+        return ap['status']
+
+
+    def ap_uptime(self, ap):
+        """
+        Seconds since an AP booted (a day before the simulator started, or the
+        end of its last reboot)
+        """
+        booted = self.started_at - 86400
+        if ap['rebootedAt'] is not None:
+            back_up = ap['rebootedAt'] + self.reboot_down_after + self.reboot_seconds
+            if time.monotonic() >= back_up:
+                booted = back_up
+        return int(time.monotonic() - booted)
+
+
+
+def _page(items, query, max_list_size=None):
+    """
+    Page a list the way the controller does (index, listSize, hasMore), with
+    listSize capped at max_list_size
+    """
+    index = int(query.get('index', ['0'])[0])
+    list_size = int(query.get('listSize', ['100'])[0])
+    if max_list_size is not None:
+        list_size = min(list_size, max_list_size)
+    page = items[index:index + list_size]
+    return {'totalCount': len(items), 'hasMore': index + len(page) < len(items),
+            'firstIndex': index, 'list': page}
+
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Request handler of the simulator
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Send each response in one write without Nagle delays (like a real controller)
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+
+    # (method, path regex, handler method name)
+    ROUTES = [
+        ('POST', r'/session', 'login'),
+        ('GET', r'/session', 'session_info'),
+        ('DELETE', r'/session', 'logout'),
+        ('GET', r'/controller', 'controller'),
+        ('GET', r'/system/apmodels', 'apmodels'),
+        ('GET', r'/aps/totalCount', 'ap_count'),
+        ('GET', r'/rkszones', 'list_zones'),
+        ('POST', r'/rkszones', 'create_zone'),
+        ('GET', r'/rkszones/([^/]+)', 'get_zone'),
+        ('PATCH', r'/rkszones/([^/]+)', 'patch_zone'),
+        ('DELETE', r'/rkszones/([^/]+)', 'delete_zone'),
+        ('PATCH', r'/rkszones/([^/]+)/(autoChannelSelection24|autoChannelSelection50|'
+                  r'wifi24|wifi50|login)', 'patch_zone_part'),
+        ('GET', r'/rkszones/([^/]+)/wlans', 'list_wlans'),
+        ('GET', r'/rkszones/([^/]+)/wlans/([^/]+)', 'get_wlan'),
+        ('PATCH', r'/rkszones/([^/]+)/wlans/([^/]+)/authServiceOrProfile', 'patch_wlan_auth'),
+        ('GET', r'/rkszones/([^/]+)/apgroups', 'list_apgroups'),
+        ('GET', r'/rkszones/([^/]+)/apgroups/([^/]+)', 'get_apgroup'),
+        ('GET', r'/aps', 'list_aps'),
+        ('GET', r'/aps/([^/]+)', 'get_ap'),
+        ('GET', r'/aps/([^/]+)/operational/summary', 'ap_summary'),
+        ('PUT', r'/aps/([^/]+)/reboot', 'reboot_ap'),
+        ('GET', r'/aps/([^/]+)/supportLog', 'support_log'),
+        ('POST', r'/aps/([^/]+)/operational/blinkLed', 'blink_led'),
+        ('POST', r'/query/ap', 'query_aps'),
+    ]
+
+    def log_message(self, *args):
+        pass
+
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+    def _dispatch(self, method):
+        sim = self.server.simulator
+        url = urlsplit(self.path)
+        self.query = parse_qs(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = json.loads(self.rfile.read(length) or b'null') if length else None
+
+        with sim.lock:
+            sim.request_count += 1
+            sim.in_flight += 1
+            sim.peak_in_flight = max(sim.peak_in_flight, sim.in_flight)
+            in_flight = sim.in_flight
+
+        try:
+            latency = sim.latency
+            if isinstance(latency, (tuple, list)):
+                latency = sim.random.uniform(*latency)
+            if latency:
+                time.sleep(latency)
+
+            if sim.throttle_above is not None and in_flight > sim.throttle_above:
+                self._send(429, {'message': 'Too many requests'}, {'Retry-After': '1'})
+                return
+            if sim.error_rate and sim.random.random() < sim.error_rate:
+                self._send(503, {'message': 'Service unavailable'})
+                return
+
+            path = url.path[len(API):] if url.path.startswith(API) else None
+            for route_method, pattern, name in self.ROUTES:
+                match = re.fullmatch(pattern, path or '')
+                if route_method == method and match:
+                    if name != 'login' and not self._logged_in():
+                        self._send(401, {'message': 'Session expired'})
+                        return
+                    getattr(self, name)(sim, *match.groups())
+                    return
+
+            self._send(404, {'message': f'No route for {method} {url.path}'})
+        finally:
+            with sim.lock:
+                sim.in_flight -= 1
+
+
+    def _logged_in(self):
+        sim = self.server.simulator
+        match = re.search(r'JSESSIONID=([^;]+)', self.headers.get('Cookie', ''))
+        if not match or match.group(1) not in sim.sessions:
+            return False
+        started = sim.sessions[match.group(1)]
+        return sim.session_ttl is None or time.monotonic() - started < sim.session_ttl
+
+
+    def _send(self, status, body=None, headers=None):
+        data = b'' if body is None else json.dumps(body).encode()
+
+        # GETs carry an ETag and answer 304 when the client already has the body
+        if self.command == 'GET' and status == 200:
+            etag = f'"{hashlib.sha1(data).hexdigest()}"'
+            headers = dict(headers or {}, ETag=etag)
+            if self.headers.get('If-None-Match') == etag:
+                status, data = 304, b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+    #----------------------------------------------------------------------
+    #  Handlers of the routes
+    #----------------------------------------------------------------------
+
+    def login(self, sim):
+        session_id = uuid.uuid4().hex
+        with sim.lock:
+            sim.sessions[session_id] = time.monotonic()
+        self._send(200, {'controllerVersion': '3.5.1.0.1026'},
+                   {'Set-Cookie': f'JSESSIONID={session_id}; Path=/'})
+
+    def session_info(self, sim):
+        self._send(200, {'domainId': sim.domain_id, 'apiVersions': ['5_0']})
+
+    def logout(self, sim):
+        match = re.search(r'JSESSIONID=([^;]+)', self.headers.get('Cookie', ''))
+        with sim.lock:
+            sim.sessions.pop(match.group(1), None)
+        self._send(200)
+
+    def controller(self, sim):
+        self._send(200, {'totalCount': 1, 'list': [{'model': 'SCG200', 'version': '3.5.1'}]})
+
+    def apmodels(self, sim):
+        self._send(200, ['R510', 'R710', 'T310d'])
+
+    def ap_count(self, sim):
+        self._send(200, len(sim.aps))
+
+    def list_zones(self, sim):
+        zones = [{'id': zone['id'], 'name': zone['name']} for zone in sim.zones.values()]
+        self._send(200, _page(zones, self.query, sim.max_list_size))
+
+    def create_zone(self, sim):
+        zone_id = str(uuid.uuid4())
+        with sim.lock:
+            sim.zones[zone_id] = dict(self.body, id=zone_id)
+            sim.wlans[zone_id] = {}
+            sim.apgroups[zone_id] = {}
+        self._send(201, {'id': zone_id})
+
+    def get_zone(self, sim, zone_id):
+        if zone_id not in sim.zones:
+            self._send(404, {'message': 'Zone not found'})
+            return
+        self._send(200, sim.zones[zone_id])
+
+    def patch_zone(self, sim, zone_id):
+        if zone_id not in sim.zones:
+            self._send(404, {'message': 'Zone not found'})
+            return
+        with sim.lock:
+            for key, value in (self.body or {}).items():
+                if isinstance(value, dict) and isinstance(sim.zones[zone_id].get(key), dict):
+                    sim.zones[zone_id][key].update(value)
+                else:
+                    sim.zones[zone_id][key] = value
+        self._send(204)
+
+    def delete_zone(self, sim, zone_id):
+        with sim.lock:
+            found = sim.zones.pop(zone_id, None)
+        self._send(200 if found else 404)
+
+    def patch_zone_part(self, sim, zone_id, part):
+        if zone_id not in sim.zones:
+            self._send(404, {'message': 'Zone not found'})
+            return
+        with sim.lock:
+            sim.zones[zone_id].setdefault(part, {}).update(self.body or {})
+        self._send(204)
+
+    def list_wlans(self, sim, zone_id):
+        wlans = [{'id': wlan['id'], 'name': wlan['name'], 'ssid': wlan['ssid'],
+                  'zoneId': zone_id} for wlan in sim.wlans.get(zone_id, {}).values()]
+        self._send(200, _page(wlans, self.query, sim.max_list_size))
+
+    def get_wlan(self, sim, zone_id, wlan_id):
+        wlan = sim.wlans.get(zone_id, {}).get(wlan_id)
+        self._send(200, wlan) if wlan else self._send(404, {'message': 'WLAN not found'})
+
+    def patch_wlan_auth(self, sim, zone_id, wlan_id):
+        wlan = sim.wlans.get(zone_id, {}).get(wlan_id)
+        if wlan is None:
+            self._send(404, {'message': 'WLAN not found'})
+            return
+        wlan['authServiceOrProfile'] = {'name': self.body['name']}
+        self._send(204)
+
+    def list_apgroups(self, sim, zone_id):
+        apgroups = [{'id': group['id'], 'name': group['name']}
+                    for group in sim.apgroups.get(zone_id, {}).values()]
+        self._send(200, _page(apgroups, self.query, sim.max_list_size))
+
+    def get_apgroup(self, sim, zone_id, apgroup_id):
+        group = sim.apgroups.get(zone_id, {}).get(apgroup_id)
+        self._send(200, group) if group else self._send(404, {'message': 'AP group not found'})
+
+    def list_aps(self, sim):
+        zone_id = self.query.get('zoneId', [None])[0]
+        aps = [{'mac': ap['mac'], 'zoneId': ap['zoneId'], 'apGroupId': ap['apGroupId'],
+                'name': ap['name'], 'model': ap['model']}
+               for ap in sim.aps.values() if zone_id is None or ap['zoneId'] == zone_id]
+        self._send(200, _page(aps, self.query, sim.max_list_size))
+
+    def get_ap(self, sim, ap_mac):
+        ap = sim.aps.get(ap_mac.upper())
+        self._send(200, ap) if ap else self._send(404, {'message': 'AP not found'})
+
+    def ap_summary(self, sim, ap_mac):
+        ap = sim.aps.get(ap_mac.upper())
+        if ap is None:
+            self._send(404, {'message': 'AP not found'})
+            return
+        self._send(200, {'mac': ap['mac'], 'status': sim.ap_status(ap),
+                         'uptime': sim.ap_uptime(ap),
+                         'clientCount': ap['clientCount'], 'channel24': ap['channel24'],
+                         'channel50': ap['channel50']})
+
+    def reboot_ap(self, sim, ap_mac):
+        ap = sim.aps.get(ap_mac.upper())
+        if ap is None:
+            self._send(404, {'message': 'AP not found'})
+            return
+        ap['rebootedAt'] = time.monotonic()
+        self._send(204)
+
+    def support_log(self, sim, ap_mac):
+        if ap_mac.upper() not in sim.aps:
+            self._send(404, {'message': 'AP not found'})
+            return
+        # Sent in pieces, like a large file from a real controller
+        line = f'support log of {ap_mac}\n'.encode()
+        lines = max(1, sim.support_log_size // len(line))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(line) * lines))
+        self.end_headers()
+        for start in range(0, lines, 1000):
+            self.wfile.write(line * min(1000, lines - start))
+
+    def blink_led(self, sim, ap_mac):
+        self._send(204 if ap_mac.upper() in sim.aps else 404)
+
+    def query_aps(self, sim):
+        body = self.body or {}
+        zone_ids = {item['value'] for item in body.get('filters') or ()
+                    if item.get('type') == 'ZONE'}
+        aps = [{'apMac': ap['mac'], 'deviceName': ap['name'], 'zoneId': ap['zoneId'],
+                'apGroupId': ap['apGroupId'], 'model': ap['model'],
+                'status': sim.ap_status(ap), 'numClients': ap['clientCount'],
+                'channel24G': f"{ap['channel24']} (20MHz)",
+                'channel50G': f"{ap['channel50']} (40MHz)"}
+               for ap in sim.aps.values() if not zone_ids or ap['zoneId'] in zone_ids]
+        limit = int(body.get('limit', 100))
+        if sim.max_list_size is not None:
+            limit = min(limit, sim.max_list_size)
+        index = (int(body.get('page', 1)) - 1) * limit
+        self._send(200, _page(aps, {'index': [index], 'listSize': [limit]}))
+
+
+
+def main():
+    """
+    Run the simulator until Ctrl+C
+    """
+    parser = argparse.ArgumentParser(description='Local stand-in for the SCG200 public API')
+    parser.add_argument('--zones', type=int, default=100)
+    parser.add_argument('--aps-per-zone', type=int, default=10)
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds per request')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-above', type=int, default=None)
+    parser.add_argument('--max-list-size', type=int, default=None,
+                        help='largest page answered, whatever listSize asks for')
+    args = parser.parse_args()
+
+    sim = SCG200Simulator(zones=args.zones, aps_per_zone=args.aps_per_zone, port=args.port,
+                          latency=args.latency, error_rate=args.error_rate,
+                          throttle_above=args.throttle_above,
+                          max_list_size=args.max_list_size)
+    print(f'SCG200 simulator with {args.zones} zones listening on {sim.url} (Ctrl+C to stop)')
+    try:
+        sim.server.serve_forever()
+    except KeyboardInterrupt:
+        sim.server.server_close()
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,100 @@
+"""
+Tests of Ruckus against the local SCG200 stand-in (scg200_sim.py).
+
+Usage:
+    python -m unittest test_ruckus
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import unittest
+from ruckus import Ruckus
+from scg200_sim import SCG200Simulator, _Handler
+
+
+class PageCapTest(unittest.TestCase):
+    """
+    Ruckus against a controller which answers at most 100 items per page,
+    whatever listSize asks for
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sim = SCG200Simulator(zones=450, aps_per_zone=1, max_list_size=100).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sim.stop()
+
+    def setUp(self):
+        self.apr = Ruckus(self.sim.url, 'admin', 'admin')
+
+    def tearDown(self):
+        self.apr.log_out()
+
+
+    def test_get_zones_reads_every_zone(self):
+        zones = self.apr.get_zones()
+        self.assertEqual(zones['totalCount'], 450)
+        self.assertEqual({site['id'] for site in zones['list']}, set(self.sim.zones))
+
+    def test_iter_zones_with_a_page_smaller_than_the_cap(self):
+        zone_ids = [site['id'] for site in self.apr.iter_zones(list_size=40, fields=('id',))]
+        self.assertEqual(len(zone_ids), 450)
+        self.assertEqual(set(zone_ids), set(self.sim.zones))
+
+    def test_query_reads_every_ap(self):
+        aps = list(self.apr.iter_ap_status(list_size=1000))
+        self.assertEqual({ap['apMac'] for ap in aps}, set(self.sim.aps))
+
+
+class RuckusTest(unittest.TestCase):
+    """
+    Ruckus against a small simulator
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sim = SCG200Simulator(zones=10, aps_per_zone=2).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sim.stop()
+
+    def setUp(self):
+        self.apr = Ruckus(self.sim.url, 'admin', 'admin')
+
+    def tearDown(self):
+        self.apr.log_out()
+
+
+    def test_unknown_zone_is_not_changed(self):
+        self.apr.zone_index()
+        count = self.sim.request_count
+        self.apr.modify_zone('NoSuchZone')
+        self.apr.delete_zone('NoSuchZone')
+        self.assertEqual(self.apr.update_radio('NoSuchZone'), [])
+        # No PATCH or DELETE of /rkszones/None
+        self.assertEqual(self.sim.request_count, count)
+
+    def test_apgroup_error_is_not_a_record(self):
+        site = next(iter(self.sim.zones.values()))
+        original = _Handler.get_apgroup
+        _Handler.get_apgroup = lambda handler, sim, *args: handler._send(404, {'message': 'Gone'})
+        try:
+            self.assertEqual(self.apr.apgroup_info(site['name']), [])
+        finally:
+            _Handler.get_apgroup = original
+        self.assertEqual(len(self.apr.apgroup_info(site['name'])), 2)
+
+    def test_failing_collector_does_not_fail_requests(self):
+        self.apr.metrics.add_collector(lambda event: 1 / 0)
+        self.assertEqual(len(self.apr.get_zones()['list']), 10)
+        self.assertGreater(self.apr.metrics.collector_errors, 0)
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Tests of AsyncRuckus against the local SCG200 stand-in (scg200_sim.py).
+
+Usage:
+    python -m unittest test_ruckus_async
+
+Author:     Meheretab Mengistu
+Version:    1.0
+"""
+
+# Import required modules
+import gzip
+import os
+import tempfile
+import unittest
+from scg200_sim import SCG200Simulator, _Handler
+
+try:
+    import aiohttp
+    from ruckus_async import AsyncRuckus
+except ImportError:
+    aiohttp = None
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class AsyncRuckusTest(unittest.IsolatedAsyncioTestCase):
+    """
+    AsyncRuckus against a simulator with more zones than fit in one page
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sim = SCG200Simulator(zones=250, aps_per_zone=3).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sim.stop()
+
+    async def asyncSetUp(self):
+        self.apr = AsyncRuckus(self.sim.url, 'admin', 'admin')
+        await self.apr.log_in()
+
+    async def asyncTearDown(self):
+        await self.apr.log_out()
+
+    def zone_named(self, name):
+        return next(zone for zone in self.sim.zones.values() if zone['name'] == name)
+
+
+    async def test_get_zones_reads_every_page(self):
+        zones = await self.apr.get_zones()
+        self.assertEqual(zones['totalCount'], 250)
+        self.assertFalse(zones['hasMore'])
+        self.assertEqual(len({site['id'] for site in zones['list']}), 250)
+
+    async def test_get_zone_id_past_the_first_page(self):
+        zone_id = await self.apr.get_zone_id('00Zone0203')
+        self.assertEqual(zone_id, self.zone_named('00Zone0203')['id'])
+        # A zone_id is returned as is, an unknown zone is None
+        self.assertEqual(await self.apr.get_zone_id(zone_id), zone_id)
+        self.assertIsNone(await self.apr.get_zone_id('NoSuchZone'))
+
+    async def test_zone_index_is_reused(self):
+        await self.apr.get_zone_id('ES-Zone0001')
+        count = self.sim.request_count
+        await self.apr.get_zone_id('ES-Zone0247')
+        self.assertEqual(self.sim.request_count, count)
+
+    async def test_unknown_zone_is_not_changed(self):
+        count = self.sim.request_count
+        await self.apr.modify_zone('NoSuchZone')
+        await self.apr.delete_zone('NoSuchZone')
+        # Only the zone list was read (two pages), no PATCH or DELETE of /rkszones/None
+        self.assertEqual(self.sim.request_count - count, 2)
+
+    async def test_modify_zone_past_the_first_page(self):
+        zone = self.zone_named('HS-Zone0225')
+        zone['dfsChannelEnabled'] = False
+        await self.apr.modify_zone('HS-Zone0225')
+        self.assertTrue(zone['dfsChannelEnabled'])
+
+    async def test_channelfly_both_in_one_request(self):
+        zone = self.zone_named('MS-Zone0212')
+        count = self.sim.request_count
+        response = await self.apr.channelfly(zone['id'], 'Y', 'both')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.sim.request_count - count, 1)
+        self.assertEqual(zone['autoChannelSelection24']['channelSelectMode'], 'None')
+        self.assertEqual(zone['autoChannelSelection50']['channelSelectMode'], 'None')
+
+    async def test_update_ap_login(self):
+        zone = self.zone_named('CDC-Zone0240')
+        status = await self.apr.update_ap_login(
+            zone['id'], {'apLoginName': 'admin', 'apLoginPassword': 'n3w-Passw0rd'})
+        self.assertEqual(status, 204)
+        self.assertEqual(zone['login']['apLoginPassword'], 'n3w-Passw0rd')
+
+    async def test_wlan_auth(self):
+        zone_id = self.zone_named('OFC-Zone0004')['id']
+        wlan_id = await self.apr.get_wlan_id(zone_id)
+        self.assertEqual(wlan_id, '1')
+        await self.apr.modify_wlan_auth(zone_id, wlan_id, 'F5-VIP-ISE-Radius')
+        self.assertEqual(await self.apr.get_wlan_auth(zone_id, wlan_id), 'F5-VIP-ISE-Radius')
+
+    async def test_run_zones_keeps_zone_order(self):
+        zones = (await self.apr.get_zones())['list'][:50]
+        results = await self.apr.run_zones(
+            zones, lambda site: self.apr.get_wlan_id(site['id']), max_workers=10)
+        self.assertEqual([site['id'] for site, _ in results], [site['id'] for site in zones])
+        self.assertEqual({wlan_id for _, wlan_id in results}, {'1'})
+
+    async def test_failed_page_raises(self):
+        original = _Handler.list_zones
+        _Handler.list_zones = lambda handler, sim: handler._send(403, {'message': 'Forbidden'})
+        try:
+            with self.assertRaises(aiohttp.ClientResponseError):
+                await self.apr.get_zones()
+        finally:
+            _Handler.list_zones = original
+
+    async def test_collect_support_logs_of_a_zone(self):
+        zone = self.zone_named('ES-Zone0007')
+        with tempfile.TemporaryDirectory() as folder:
+            reports = await self.apr.collect_support_logs(zone_id=zone['id'], folder=folder)
+            self.assertEqual(len(reports), 3)
+            for report in reports:
+                self.assertIsNone(report['error'])
+                with gzip.open(report['file']) as log_file:
+                    self.assertEqual(len(log_file.read()), report['bytes'])
+            self.assertEqual(len(os.listdir(folder)), 3)
+
+
+if __name__ == "__main__":
+
+    unittest.main()